@@ -0,0 +1,91 @@
+"""
+Court calendar for the mitra bookings page.
+
+A venue's calendar for a date range is returned as a columnar grid instead of
+one object per booking: the courts and sessions are listed once, and
+``status`` holds one small integer per (session, date) cell in row-major
+order. A month for 10 courts with a dozen sessions each is a few thousand
+integers. Bookings are read with a single ``values_list`` query for the
+range; sessions and schedule exceptions take one query each.
+"""
+from datetime import timedelta
+
+from app.bookings.models import Booking
+from app.courts.models import CourtScheduleException, CourtSession
+from app.courts.schedule import day_bit, exception_blocks, index_exceptions
+
+
+MAX_CALENDAR_DAYS = 62
+
+# Cell codes of the status grid; cancelled bookings free their slot again
+CLOSED, FREE, PENDING, CONFIRMED, COMPLETED = range(5)
+STATUS_CODES = ['closed', 'free', 'pending', 'confirmed', 'completed']
+BOOKING_CODES = {'pending': PENDING, 'confirmed': CONFIRMED, 'completed': COMPLETED}
+
+
+def court_calendar(venue, date_from, date_to):
+    """Columnar calendar of ``venue``'s active sessions between date_from and date_to (inclusive)"""
+    days = (date_to - date_from).days + 1
+    dates = [date_from + timedelta(days=offset) for offset in range(days)]
+
+    sessions = list(
+        CourtSession.objects.filter(court__venue=venue, court__is_active=True, is_active=True)
+        .order_by('court__name', 'court_id', 'start_time')
+        .values_list('id', 'court_id', 'court__name', 'start_time', 'end_time', 'days_mask')
+    )
+    court_index = {}
+    for row in sessions:
+        court_index.setdefault(row[1], (len(court_index), row[2]))
+    row_of = {row[0]: index for index, row in enumerate(sessions)}
+
+    exceptions = index_exceptions(CourtScheduleException.objects.filter(
+        court_id__in=court_index, date__range=(date_from, date_to)
+    ).only('court', 'date', 'start_time', 'end_time'))
+
+    # Closed unless the session runs that weekday and no exception blocks it
+    status = []
+    for session_id, court_id, _, start_time, end_time, days_mask in sessions:
+        slot = CourtSession(start_time=start_time, end_time=end_time)
+        for day in dates:
+            open_ = bool(days_mask & day_bit(day)) and not any(
+                exception.court_id == court_id and exception_blocks(exception, slot)
+                for exception in exceptions.get(day, ())
+            )
+            status.append(FREE if open_ else CLOSED)
+
+    booking_ids = []
+    booking_cells = []
+    for booking_id, session_id, booking_date, booking_status in Booking.objects.filter(
+        court__venue=venue,
+        booking_date__range=(date_from, date_to),
+        booking_status__in=BOOKING_CODES,
+    ).values_list('id', 'session_id', 'booking_date', 'booking_status'):
+        row = row_of.get(session_id)
+        if row is None:
+            continue  # Session deleted or deactivated since the booking
+        cell = row * days + (booking_date - date_from).days
+        status[cell] = BOOKING_CODES[booking_status]
+        booking_ids.append(str(booking_id))
+        booking_cells.append(cell)
+
+    courts = list(court_index.items())  # In row order
+    return {
+        'venue_id': str(venue.id),
+        'dates': [day.isoformat() for day in dates],
+        'status_codes': STATUS_CODES,
+        'courts': {
+            'id': [court_id for court_id, _ in courts],
+            'name': [name for _, (_, name) in courts],
+        },
+        'sessions': {
+            'id': [row[0] for row in sessions],
+            'court': [court_index[row[1]][0] for row in sessions],
+            'start_time': [row[3].strftime('%H:%M') for row in sessions],
+            'end_time': [row[4].strftime('%H:%M') for row in sessions],
+        },
+        'status': status,
+        'bookings': {
+            'id': booking_ids,
+            'cell': booking_cells,
+        },
+    }
@@ -0,0 +1,278 @@
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from app.bookings.models import Booking
+from app.courts import schedule
+from app.courts.models import CourtSession
+from app.users.models import User
+from app.venues.models import Venue
+
+
+DEFAULT_MIX = 'list=35,detail=25,availability=30,book=10'
+SCENARIOS = ('list', 'detail', 'availability', 'book')
+
+
+def parse_mix(value):
+    """Parse "list=35,detail=25,..." into a {scenario: weight} dict"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise CommandError(f'Unknown scenario "{name}", expected one of: {", ".join(SCENARIOS)}')
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise CommandError(f'Invalid weight for scenario "{name}": {weight!r}')
+    if not any(weight > 0 for weight in mix.values()):
+        raise CommandError('At least one scenario needs a positive weight')
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class InProcessTransport:
+    """Sends requests through the Django test client, logged in as ``user``"""
+
+    def __init__(self, user):
+        self.client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+        self.client.force_login(user)
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.content
+
+    def post_json(self, path, payload):
+        response = self.client.post(path, data=json.dumps(payload), content_type='application/json')
+        return response.status_code, response.content
+
+
+class HttpTransport:
+    """Sends requests to a running server, logged in through /api/login/"""
+
+    def __init__(self, base_url, user, password, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+        status, _ = self.post_json('/api/login/', {'username': user.username, 'password': password})
+        if status != 200:
+            raise CommandError(f'Could not log in as {user.username} (HTTP {status})')
+
+    def _send(self, request):
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+        except (urllib.error.URLError, OSError):
+            return 0, b''
+
+    def get(self, path):
+        return self._send(urllib.request.Request(self.base_url + path))
+
+    def post_json(self, path, payload):
+        return self._send(urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        ))
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic browsing and booking traffic against the real URL routes and report latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: in-process test client)')
+        parser.add_argument('--workers', type=int, default=8, help='Parallel worker threads (default: 8)')
+        parser.add_argument('--requests', type=int, default=500, help='Total requests to send (default: 500)')
+        parser.add_argument('--duration', type=float, default=0, help='Stop after this many seconds instead of --requests')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Scenario weights (default: {DEFAULT_MIX})')
+        parser.add_argument('--hot-slots', type=int, default=10,
+                            help='Number of shared (court, session, date) slots bookings compete for (default: 10)')
+        parser.add_argument('--days', type=int, default=7, help='Book and check availability up to N days ahead (default: 7)')
+        parser.add_argument('--password', default='user123', help='Password of the seeded users for --url mode')
+        parser.add_argument('--timeout', type=float, default=30, help='HTTP timeout in seconds for --url mode')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible request sequence')
+        parser.add_argument('--keep-bookings', action='store_true', help='Do not delete the bookings created by the run')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        mix = parse_mix(options['mix'])
+        workers = max(options['workers'], 1)
+
+        users = list(User.objects.filter(role='user', is_active=True)[:max(workers, 1) * 4])
+        venue_ids = [str(pk) for pk in Venue.objects.filter(verification_status='approved').values_list('id', flat=True)]
+        sessions = list(
+            CourtSession.objects.filter(is_active=True, court__is_active=True, court__venue__verification_status='approved')
+            .values_list('court_id', 'id', 'days_mask')
+        )
+        if not users or not venue_ids or not sessions:
+            raise CommandError('Need approved venues with active sessions and at least one user; run seed_from_json first')
+
+        dates = [date.today() + timedelta(days=offset) for offset in range(1, max(options['days'], 1) + 1)]
+        # Only dates the session runs on, or create_booking would reject the slot outright
+        bookable = [
+            (court_id, session_id, [day for day in dates if schedule.day_bit(day) & days_mask])
+            for court_id, session_id, days_mask in sessions
+        ]
+        bookable = [slot for slot in bookable if slot[2]]
+        if not bookable:
+            raise CommandError(f'No active session runs in the next {len(dates)} days; raise --days')
+        hot_slots = [
+            (court_id, session_id, rng.choice(session_dates))
+            for court_id, session_id, session_dates in rng.sample(bookable, min(options['hot_slots'], len(bookable)))
+        ]
+        court_ids = sorted({court_id for court_id, _, _ in sessions})
+
+        self.lock = threading.Lock()
+        self.results = {name: [] for name in SCENARIOS}
+        self.created_booking_ids = []
+        self.remaining = options['requests']
+        self.deadline = time.monotonic() + options['duration'] if options['duration'] > 0 else None
+
+        scenario_names = list(mix)
+        scenario_weights = [mix[name] for name in scenario_names]
+        plans = []
+        for index in range(workers):
+            plans.append({
+                'user': users[index % len(users)],
+                'rng': random.Random(rng.random()),
+            })
+
+        def run_worker(plan):
+            try:
+                if options['url']:
+                    transport = HttpTransport(options['url'], plan['user'], options['password'], options['timeout'])
+                else:
+                    transport = InProcessTransport(plan['user'])
+                worker_rng = plan['rng']
+                while self.take_ticket():
+                    scenario = worker_rng.choices(scenario_names, scenario_weights)[0]
+                    if scenario == 'list':
+                        path = f'/api/public/venues/?page={worker_rng.randint(1, 5)}'
+                        self.timed(scenario, transport.get, path)
+                    elif scenario == 'detail':
+                        self.timed(scenario, transport.get, f'/api/public/venues/{worker_rng.choice(venue_ids)}/')
+                    elif scenario == 'availability':
+                        court_id = worker_rng.choice(court_ids)
+                        path = f'/api/courts/{court_id}/sessions/?date={worker_rng.choice(dates).isoformat()}'
+                        self.timed(scenario, transport.get, path)
+                    else:
+                        court_id, session_id, booking_date = worker_rng.choice(hot_slots)
+                        self.timed(scenario, transport.post_json, '/bookings/create/', {
+                            'court_id': court_id,
+                            'session_ids': [session_id],
+                            'booking_date': booking_date.isoformat(),
+                            'payment_method': 'bank_transfer',
+                            'notes': 'loadtest',
+                        })
+            finally:
+                if workers > 1:
+                    connection.close()
+
+        amount = f'{options["duration"]:g}s of' if self.deadline is not None else options['requests']
+        target = options['url'] or 'the in-process test client'
+        self.stdout.write(f'Running {amount} requests with {workers} worker(s) against {target}...')
+        started = time.monotonic()
+        if workers == 1:
+            run_worker(plans[0])
+        else:
+            threads = [threading.Thread(target=run_worker, args=(plan,), daemon=True) for plan in plans]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.monotonic() - started
+
+        violations = self.count_double_bookings(hot_slots)
+        self.report(elapsed, violations)
+
+        if self.created_booking_ids and not options['keep_bookings']:
+            Booking.objects.filter(id__in=self.created_booking_ids).delete()
+            self.stdout.write(f'Deleted {len(self.created_booking_ids)} bookings created by the run')
+
+    def take_ticket(self):
+        """Claim the next request slot, returning False once the run is over"""
+        with self.lock:
+            if self.deadline is not None:
+                return time.monotonic() < self.deadline
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def timed(self, scenario, send, *args):
+        started = time.perf_counter()
+        status, body = send(*args)
+        latency = time.perf_counter() - started
+        with self.lock:
+            self.results[scenario].append((latency, status))
+            if scenario == 'book' and status in (200, 201):
+                try:
+                    bookings = json.loads(body)['data']['bookings']
+                    self.created_booking_ids.extend(b['id'] for b in bookings)
+                except (ValueError, KeyError, TypeError):
+                    pass
+
+    def count_double_bookings(self, hot_slots):
+        """Slots holding more than one pending/confirmed booking"""
+        violations = 0
+        for court_id, session_id, booking_date in set(hot_slots):
+            active = Booking.objects.filter(
+                court_id=court_id,
+                session_id=session_id,
+                booking_date=booking_date,
+                booking_status__in=['pending', 'confirmed'],
+            ).count()
+            if active > 1:
+                violations += 1
+        return violations
+
+    def report(self, elapsed, violations):
+        total = sum(len(samples) for samples in self.results.values())
+        self.stdout.write('')
+        self.stdout.write(f'{"scenario":<14}{"count":>7}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"max ms":>10}{"409":>7}{"errors":>8}')
+        for scenario in SCENARIOS:
+            samples = self.results[scenario]
+            if not samples:
+                continue
+            latencies = sorted(latency * 1000 for latency, _ in samples)
+            conflicts = sum(1 for _, status in samples if status == 409)
+            errors = sum(1 for _, status in samples if status != 409 and not 200 <= status < 300)
+            self.stdout.write(
+                f'{scenario:<14}{len(samples):>7}'
+                f'{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}'
+                f'{percentile(latencies, 99):>10.1f}{latencies[-1]:>10.1f}{conflicts:>7}{errors:>8}'
+            )
+
+        all_samples = [sample for samples in self.results.values() for sample in samples]
+        conflicts = sum(1 for _, status in all_samples if status == 409)
+        errors = sum(1 for _, status in all_samples if status != 409 and not 200 <= status < 300)
+        self.stdout.write('')
+        self.stdout.write(f'Requests:     {total} in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f} req/s)')
+        self.stdout.write(f'409 rate:     {conflicts / total * 100 if total else 0:.1f}%')
+        self.stdout.write(f'Error rate:   {errors / total * 100 if total else 0:.1f}%')
+        self.stdout.write(f'Bookings:     {len(self.created_booking_ids)} created')
+        if violations:
+            self.stdout.write(self.style.ERROR(f'Double bookings: {violations} slot(s) booked more than once'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Double bookings: none'))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_initial'),
+        ('courts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='booking',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('booking_status__in', ['pending', 'confirmed'])), fields=('court', 'session', 'booking_date'), name='unique_active_booking_per_slot'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_unique_active_slot'),
+        ('courts', '0002_session_days_mask_schedule_exceptions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['court', 'booking_date'], name='booking_court_date_idx'),
+        ),
+    ]
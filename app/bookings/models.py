@@ -45,7 +45,19 @@ class Booking(models.Model):
         return f"{self.user.username} - {self.court.venue.name} ({self.booking_date})"
     
     class Meta:
-        unique_together = ('court', 'booking_date', 'start_time')
+        constraints = [
+            # A slot can only be held by one active booking; cancelled and
+            # completed bookings do not block re-booking it.
+            models.UniqueConstraint(
+                fields=['court', 'session', 'booking_date'],
+                condition=models.Q(booking_status__in=['pending', 'confirmed']),
+                name='unique_active_booking_per_slot',
+            ),
+        ]
+        indexes = [
+            # Venue calendar and occupancy lookups by court and date range
+            models.Index(fields=['court', 'booking_date'], name='booking_court_date_idx'),
+        ]
 
 # Payment Model
 class Payment(models.Model):
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import date, time, timedelta
 from decimal import Decimal
@@ -86,11 +87,12 @@ class BookingModelTestCase(TestCase):
         expected = f"testuser - Test Venue ({date.today()})"
         self.assertEqual(str(booking), expected)
     
-    def test_booking_unique_together(self):
-        """Test booking unique constraint"""
+    def test_booking_unique_active_slot(self):
+        """Test a slot can only hold one active booking"""
         Booking.objects.create(
             user=self.user,
             court=self.court,
+            session=self.session,
             booking_date=date.today(),
             start_time=time(8, 0),
             end_time=time(10, 0),
@@ -99,16 +101,44 @@ class BookingModelTestCase(TestCase):
         )
         
         # Trying to create duplicate booking should fail
-        with self.assertRaises(Exception):
-            Booking.objects.create(
-                user=self.user,
-                court=self.court,
-                booking_date=date.today(),
-                start_time=time(8, 0),
-                end_time=time(10, 0),
-                duration_hours=2,
-                total_price=200000
-            )
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Booking.objects.create(
+                    user=self.user,
+                    court=self.court,
+                    session=self.session,
+                    booking_date=date.today(),
+                    start_time=time(8, 0),
+                    end_time=time(10, 0),
+                    duration_hours=2,
+                    total_price=200000
+                )
+    
+    def test_cancelled_slot_can_be_rebooked(self):
+        """Test cancelled bookings do not block the slot"""
+        Booking.objects.create(
+            user=self.user,
+            court=self.court,
+            session=self.session,
+            booking_date=date.today(),
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+            duration_hours=2,
+            total_price=200000,
+            booking_status='cancelled'
+        )
+        
+        booking = Booking.objects.create(
+            user=self.user,
+            court=self.court,
+            session=self.session,
+            booking_date=date.today(),
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+            duration_hours=2,
+            total_price=200000
+        )
+        self.assertEqual(booking.booking_status, 'pending')
 
 
 class PaymentModelTestCase(TestCase):
@@ -181,3 +211,497 @@ class PaymentModelTestCase(TestCase):
         expected = f"Payment for {self.booking}"
         self.assertEqual(str(payment), expected)
 
+
+
+class LoadTestCommandTestCase(TestCase):
+    """Test cases for the loadtest management command"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='user@test.com',
+            role='user'
+        )
+        
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(
+            name='FUTSAL'
+        )
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        self.session = CourtSession.objects.create(
+            court=self.court,
+            session_name='Morning',
+            start_time=time(8, 0),
+            end_time=time(10, 0)
+        )
+    
+    def test_contended_slot_is_booked_once(self):
+        """Test every booking request competes for one slot and the report shows no double booking"""
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command(
+            'loadtest', workers=1, requests=20, mix='availability=1,book=3',
+            hot_slots=1, days=1, seed=1, stdout=out,
+        )
+        output = out.getvalue()
+        
+        self.assertIn('Requests:     20', output)
+        self.assertIn('Bookings:     1 created', output)
+        self.assertIn('Double bookings: none', output)
+        # Bookings created by the run are cleaned up afterwards
+        self.assertFalse(Booking.objects.exists())
+
+    def test_hot_slots_fall_on_the_session_days(self):
+        """Test contended slots are only picked on weekdays the session runs"""
+        from datetime import date, timedelta
+        from io import StringIO
+        from django.core.management import call_command
+        from app.courts import schedule
+
+        self.session.days_mask = schedule.day_bit(date.today() + timedelta(days=3))
+        self.session.save()
+
+        out = StringIO()
+        call_command(
+            'loadtest', workers=1, requests=20, mix='book=1',
+            hot_slots=1, days=7, seed=2, stdout=out,
+        )
+
+        self.assertIn('Bookings:     1 created', out.getvalue())
+
+
+class CreateBookingConflictTestCase(TestCase):
+    """Test cases for double-booking protection in create_booking"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='user@test.com',
+            role='user'
+        )
+        
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(
+            name='FUTSAL'
+        )
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        self.session = CourtSession.objects.create(
+            court=self.court,
+            session_name='Morning',
+            start_time=time(8, 0),
+            end_time=time(10, 0)
+        )
+        
+        self.other_session = CourtSession.objects.create(
+            court=self.court,
+            session_name='Evening',
+            start_time=time(18, 0),
+            end_time=time(20, 0)
+        )
+        
+        self.client.force_login(self.user)
+        self.booking_date = (date.today() + timedelta(days=1)).isoformat()
+    
+    def book(self, session_ids):
+        return self.client.post('/bookings/create/', data={
+            'court_id': self.court.id,
+            'session_ids': session_ids,
+            'booking_date': self.booking_date,
+            'payment_method': 'bank_transfer',
+        }, content_type='application/json')
+    
+    def test_booked_slot_returns_conflict(self):
+        """Test booking an already booked slot returns 409"""
+        self.assertEqual(self.book([self.session.id]).status_code, 200)
+        
+        response = self.book([self.session.id])
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Booking.objects.count(), 1)
+    
+    def test_integrity_error_returns_conflict_without_partial_booking(self):
+        """Test a constraint violation from a concurrent request rolls back every session of the request"""
+        from unittest.mock import patch
+        
+        original_create = Booking.objects.create
+        
+        def racing_create(**kwargs):
+            # Simulate another worker winning the race for the second session
+            if kwargs['session'] == self.other_session:
+                raise IntegrityError('UNIQUE constraint failed')
+            return original_create(**kwargs)
+        
+        with patch.object(Booking.objects, 'create', side_effect=racing_create):
+            response = self.book([self.session.id, self.other_session.id])
+        
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(Payment.objects.exists())
+
+
+class BookingHistoryAPITestCase(TestCase):
+    """Test cases for the user booking history API"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='user@test.com',
+            role='user'
+        )
+        
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(
+            name='FUTSAL'
+        )
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        self.session = CourtSession.objects.create(
+            court=self.court,
+            session_name='Morning',
+            start_time=time(8, 0),
+            end_time=time(10, 0)
+        )
+        
+        statuses = ['pending', 'confirmed', 'completed', 'cancelled', 'completed']
+        for offset, status in enumerate(statuses):
+            Booking.objects.create(
+                user=self.user,
+                court=self.court,
+                session=self.session,
+                booking_date=date.today() + timedelta(days=offset),
+                start_time=time(8, 0),
+                end_time=time(10, 0),
+                duration_hours=2,
+                total_price=200000,
+                booking_status=status
+            )
+        
+        self.client.force_login(self.user)
+    
+    def test_cursor_pagination_walks_all_bookings(self):
+        """Test following next_cursor returns every booking exactly once"""
+        seen = []
+        cursor = None
+        while True:
+            params = {'page_size': 2, 'sort': 'booking_date'}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get('/bookings/history/', params).json()['data']
+            seen.extend(b['booking_date'] for b in data['bookings'])
+            cursor = data['pagination']['next_cursor']
+            if not cursor:
+                break
+        
+        expected = [(date.today() + timedelta(days=offset)).isoformat() for offset in range(5)]
+        self.assertEqual(seen, expected)
+    
+    def test_statistics_cover_all_bookings(self):
+        """Test statistics are computed over every booking, not just the page"""
+        data = self.client.get('/bookings/history/', {'page_size': 1}).json()['data']
+        
+        self.assertEqual(len(data['bookings']), 1)
+        self.assertEqual(data['statistics'], {
+            'total': 5, 'pending': 1, 'confirmed': 1, 'completed': 2, 'cancelled': 1
+        })
+    
+    def test_status_and_date_filters(self):
+        """Test status list and booking date range filters"""
+        response = self.client.get('/bookings/history/', {
+            'status': 'completed,cancelled',
+            'date_from': (date.today() + timedelta(days=3)).isoformat(),
+        })
+        statuses = sorted(b['booking_status'] for b in response.json()['data']['bookings'])
+        
+        self.assertEqual(statuses, ['cancelled', 'completed'])
+    
+    def test_fields_projection(self):
+        """Test fields= limits the keys of each booking"""
+        response = self.client.get('/bookings/history/', {'fields': 'id,booking_status'})
+        
+        for booking in response.json()['data']['bookings']:
+            self.assertEqual(set(booking), {'id', 'booking_status'})
+        
+        response = self.client.get('/bookings/history/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get('/bookings/history/', {'fields': 'id', 'include': 'payment'})
+        for booking in response.json()['data']['bookings']:
+            self.assertEqual(set(booking), {'id', 'payment'})
+    
+    def test_columnar_format_matches_rows(self):
+        """Test format=columnar carries the same values as the row format"""
+        rows = self.client.get('/bookings/history/').json()['data']['bookings']
+        response = self.client.get('/bookings/history/', {'format': 'columnar'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        table = response.json()['data']['bookings']
+        
+        self.assertEqual(table['count'], len(rows))
+        self.assertEqual(table['fields'], list(rows[0]))
+        columns = [table['columns'][field] for field in table['fields']]
+        self.assertEqual([dict(zip(table['fields'], values)) for values in zip(*columns)], rows)
+    
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is rejected"""
+        response = self.client.get('/bookings/history/', {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, 400)
+
+
+class BookingBatchStatusTestCase(TestCase):
+    """Test cases for the mitra batch booking status endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from app.revenue.models import Pendapatan
+        self.user = User.objects.create_user(username='batchuser', password='testpass123', role='user')
+        self.mitra = User.objects.create_user(username='batchmitra', password='testpass123', role='mitra')
+        self.other_mitra = User.objects.create_user(username='othermitra', password='testpass123', role='mitra')
+        category = SportsCategory.objects.create(name='FUTSAL')
+        venue = Venue.objects.create(name='Batch Venue', owner=self.mitra, address='Jakarta', number_of_courts=1)
+        self.court = Court.objects.create(venue=venue, name='Court 1', category=category, price_per_hour=100000)
+        
+        self.bookings = []
+        for hour in range(8, 13):
+            session = CourtSession.objects.create(
+                court=self.court, session_name=f'{hour}:00', start_time=time(hour, 0), end_time=time(hour + 1, 0)
+            )
+            booking = Booking.objects.create(
+                user=self.user, court=self.court, session=session,
+                booking_date=date.today() + timedelta(days=1),
+                start_time=session.start_time, end_time=session.end_time,
+                duration_hours=Decimal('1.0'), total_price=Decimal('100000.00'),
+            )
+            Payment.objects.create(booking=booking, amount=booking.total_price, payment_method='cash')
+            Pendapatan.objects.create(mitra=self.mitra, booking=booking, amount=booking.total_price)
+            self.bookings.append(booking)
+        
+        self.client.force_login(self.mitra)
+    
+    def post(self, booking_ids, booking_status, **extra):
+        import json
+        payload = {'booking_ids': [str(i) for i in booking_ids], 'booking_status': booking_status, **extra}
+        return self.client.post('/api/bookings/batch-status/', data=json.dumps(payload), content_type='application/json')
+    
+    def test_confirm_marks_payment_received(self):
+        """Test confirming bookings also marks Payment and Pendapatan as paid"""
+        from app.revenue.models import ActivityLog, Pendapatan
+        ids = [b.id for b in self.bookings]
+        
+        response = self.post(ids, 'confirmed')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['updated'], 5)
+        
+        self.assertEqual(Booking.objects.filter(id__in=ids, booking_status='confirmed', payment_status='paid').count(), 5)
+        self.assertEqual(Payment.objects.filter(booking_id__in=ids, paid_at__isnull=False, verified_by=self.mitra).count(), 5)
+        self.assertEqual(Pendapatan.objects.filter(booking_id__in=ids, payment_status='paid').count(), 5)
+        self.assertEqual(ActivityLog.objects.filter(user=self.mitra).count(), 1)
+    
+    def test_query_count_does_not_grow_with_batch(self):
+        """Test a batch runs a fixed number of queries however many bookings it holds"""
+        def count_queries(ids):
+            from django.db import connection
+            from django.test.utils import CaptureQueriesContext
+            with CaptureQueriesContext(connection) as context:
+                self.post(ids, 'confirmed')
+            return len(context.captured_queries)
+        
+        few = count_queries([self.bookings[0].id])
+        many = count_queries([b.id for b in self.bookings[1:]])
+        self.assertEqual(few, many)
+    
+    def test_invalid_transitions_and_foreign_bookings_are_skipped(self):
+        """Test disallowed transitions and other mitras' bookings are reported, not applied"""
+        self.post([self.bookings[0].id], 'cancelled', cancellation_reason='Hujan')
+        
+        response = self.post([self.bookings[0].id, self.bookings[1].id], 'completed')
+        results = {r['id']: r for r in response.json()['data']['results']}
+        self.assertEqual(results[str(self.bookings[0].id)]['status'], 'skipped')
+        self.assertEqual(results[str(self.bookings[1].id)]['status'], 'skipped')
+        
+        self.client.force_login(self.other_mitra)
+        response = self.post([self.bookings[2].id], 'confirmed')
+        self.assertEqual(response.json()['data']['updated'], 0)
+        self.bookings[2].refresh_from_db()
+        self.assertEqual(self.bookings[2].booking_status, 'pending')
+        
+        self.bookings[0].refresh_from_db()
+        self.assertEqual(self.bookings[0].cancellation_reason, 'Hujan')
+    
+    def test_cancel_paid_booking_refunds(self):
+        """Test cancelling a confirmed, paid booking refunds its Pendapatan"""
+        from app.revenue.models import Pendapatan
+        booking = self.bookings[0]
+        self.post([booking.id], 'confirmed')
+        self.post([booking.id], 'cancelled')
+        booking.refresh_from_db()
+        self.assertEqual(booking.payment_status, 'refunded')
+        self.assertEqual(Pendapatan.objects.get(booking=booking).payment_status, 'refunded')
+    
+    def test_rejects_invalid_payload(self):
+        """Test unknown statuses and malformed ids are rejected"""
+        self.assertEqual(self.post([self.bookings[0].id], 'pending').status_code, 400)
+        self.assertEqual(self.post(['not-a-uuid'], 'confirmed').status_code, 400)
+        self.assertEqual(self.post([], 'confirmed').status_code, 400)
+
+
+    def test_booking_list_fieldset(self):
+        """Test the mitra booking list drops the customer and payment joins when not requested"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        bookings = self.client.get('/api/bookings/').json()['data']['bookings']
+        self.assertEqual(bookings[0]['customer_name'], 'batchuser')
+        self.assertEqual(bookings[0]['payment']['method'], 'cash')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/bookings/', {'fields': 'id,booking_status,court_name'})
+        bookings = response.json()['data']['bookings']
+        self.assertEqual(len(bookings), 5)
+        self.assertEqual(list(bookings[0]), ['id', 'court_name', 'booking_status'])
+        listing = next(q['sql'] for q in queries if 'LIMIT 100' in q['sql'])
+        self.assertNotIn('"bookings_payment"', listing)
+        self.assertNotIn('"users_user"."email"', listing)
+        
+        response = self.client.get('/api/bookings/', {'fields': 'id,user'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CourtCalendarTestCase(TestCase):
+    """Test cases for the mitra court calendar endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        from app.courts.models import CourtScheduleException
+        self.user = User.objects.create_user(username='caluser', password='testpass123', role='user')
+        self.mitra = User.objects.create_user(username='calmitra', password='testpass123', role='mitra')
+        self.venue = Venue.objects.create(name='Calendar Venue', owner=self.mitra, address='Bandung', number_of_courts=2)
+        self.courts = [
+            Court.objects.create(venue=self.venue, name=f'Court {i}', price_per_hour=100000) for i in (1, 2)
+        ]
+        self.morning = CourtSession.objects.create(
+            court=self.courts[0], session_name='Pagi', start_time=time(8, 0), end_time=time(10, 0)
+        )
+        self.evening = CourtSession.objects.create(
+            court=self.courts[1], session_name='Malam', start_time=time(19, 0), end_time=time(21, 0)
+        )
+        self.start = date.today() + timedelta(days=1)
+        CourtScheduleException.objects.create(court=self.courts[1], date=self.start + timedelta(days=1))
+        self.booking = Booking.objects.create(
+            user=self.user, court=self.courts[0], session=self.morning, booking_date=self.start,
+            start_time=time(8, 0), end_time=time(10, 0), duration_hours=Decimal('2.0'),
+            total_price=Decimal('200000.00'), booking_status='confirmed'
+        )
+        Booking.objects.create(
+            user=self.user, court=self.courts[1], session=self.evening, booking_date=self.start,
+            start_time=time(19, 0), end_time=time(21, 0), duration_hours=Decimal('2.0'),
+            total_price=Decimal('200000.00'), booking_status='cancelled'
+        )
+        self.client.force_login(self.mitra)
+    
+    def get(self, **params):
+        return self.client.get('/api/bookings/calendar/', {'venue_id': str(self.venue.id), **params})
+    
+    def test_calendar_grid(self):
+        """Test the status grid marks bookings, free slots and closed days"""
+        from app.bookings.calendar import CLOSED, CONFIRMED, FREE
+        response = self.get(date_from=self.start.isoformat(), date_to=(self.start + timedelta(days=2)).isoformat())
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        
+        self.assertEqual(len(data['dates']), 3)
+        self.assertEqual(data['courts']['id'], [c.id for c in self.courts])
+        self.assertEqual(data['sessions']['id'], [self.morning.id, self.evening.id])
+        self.assertEqual(data['sessions']['court'], [0, 1])
+        # Morning: booked, free, free / evening: cancelled booking is free, then closed, free
+        self.assertEqual(data['status'], [CONFIRMED, FREE, FREE, FREE, CLOSED, FREE])
+        self.assertEqual(data['bookings'], {'id': [str(self.booking.id)], 'cell': [0]})
+    
+    def test_query_count_is_constant(self):
+        """Test the calendar runs the same queries for a week or a month"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as week:
+            self.get()
+        with CaptureQueriesContext(connection) as month:
+            self.get(date_to=(date.today() + timedelta(days=30)).isoformat())
+        self.assertEqual(len(week.captured_queries), len(month.captured_queries))
+    
+    def test_calendar_validation(self):
+        """Test other mitras' venues, bad dates and oversized ranges are rejected"""
+        other = User.objects.create_user(username='othercal', password='testpass123', role='mitra')
+        self.client.force_login(other)
+        self.assertEqual(self.get().status_code, 404)
+        self.client.force_login(self.mitra)
+        self.assertEqual(self.get(date_from='kemarin').status_code, 400)
+        self.assertEqual(self.get(date_to=(date.today() + timedelta(days=90)).isoformat()).status_code, 400)
+        self.assertEqual(self.client.get('/api/bookings/calendar/').status_code, 400)
@@ -0,0 +1,112 @@
+"""
+Booking status transitions applied by a mitra to many bookings at once.
+
+Only forward moves are allowed (pending -> confirmed -> completed, and
+cancelling an active booking); finished bookings stay as they are. Confirming
+or completing a booking records its payment as received, cancelling a paid
+one refunds it, and the matching Payment and Pendapatan rows follow. All rows
+are loaded with one query per model and written back with ``bulk_update``,
+so a batch costs the same number of queries whatever its size.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from app.bookings.models import Booking, Payment
+from app.revenue.models import Pendapatan
+
+
+MAX_BATCH_BOOKINGS = 200
+
+ALLOWED_TRANSITIONS = {
+    'pending': {'confirmed', 'cancelled'},
+    'confirmed': {'completed', 'cancelled'},
+    'cancelled': set(),
+    'completed': set(),
+}
+
+
+def transition_bookings(owner, booking_ids, new_status, cancellation_reason=''):
+    """Move the bookings of ``owner``'s venues with ids ``booking_ids`` to ``new_status``.
+
+    Returns ``(results, updated)``: a result dict per requested id and the
+    list of bookings that changed. Bookings that do not exist, belong to
+    another mitra or cannot make the transition are skipped, not errors.
+    """
+    now = timezone.now()
+    results = []
+    updated = []
+    with transaction.atomic():
+        bookings = Booking.objects.select_for_update().filter(
+            id__in=booking_ids, court__venue__owner=owner
+        ).only('id', 'booking_status', 'payment_status', 'cancellation_reason')
+        found = {booking.id: booking for booking in bookings}
+
+        for booking_id in booking_ids:
+            booking = found.get(booking_id)
+            if booking is None:
+                results.append({'id': str(booking_id), 'status': 'skipped', 'message': 'Booking tidak ditemukan'})
+                continue
+            if new_status not in ALLOWED_TRANSITIONS[booking.booking_status]:
+                results.append({
+                    'id': str(booking.id),
+                    'status': 'skipped',
+                    'booking_status': booking.booking_status,
+                    'message': f'Tidak dapat mengubah status {booking.booking_status} menjadi {new_status}',
+                })
+                continue
+
+            booking.booking_status = new_status
+            if new_status == 'cancelled':
+                booking.cancellation_reason = cancellation_reason or booking.cancellation_reason
+                if booking.payment_status == 'paid':
+                    booking.payment_status = 'refunded'
+            elif booking.payment_status == 'unpaid':
+                booking.payment_status = 'paid'
+            booking.updated_at = now  # bulk_update does not apply auto_now
+            updated.append(booking)
+            results.append({
+                'id': str(booking.id),
+                'status': 'updated',
+                'booking_status': booking.booking_status,
+                'payment_status': booking.payment_status,
+            })
+
+        if updated:
+            Booking.objects.bulk_update(
+                updated, ['booking_status', 'payment_status', 'cancellation_reason', 'updated_at'], batch_size=200
+            )
+            _sync_payments(updated, owner, now)
+    return results, updated
+
+
+def _sync_payments(bookings, owner, now):
+    """Bring Payment and Pendapatan rows in line with the new booking payment status"""
+    payment_status = {booking.id: booking.payment_status for booking in bookings}
+
+    payments = []
+    for payment in Payment.objects.filter(booking_id__in=payment_status, paid_at__isnull=True).only(
+        'id', 'booking_id', 'paid_at', 'verified_by'
+    ):
+        if payment_status[payment.booking_id] == 'paid':
+            payment.paid_at = now
+            payment.verified_by = owner
+            payments.append(payment)
+    Payment.objects.bulk_update(payments, ['paid_at', 'verified_by'], batch_size=200)
+
+    pendapatan = []
+    for p in Pendapatan.objects.filter(booking_id__in=payment_status).only(
+        'id', 'booking_id', 'payment_status', 'paid_at'
+    ):
+        status = payment_status[p.booking_id]
+        if status == 'paid' and p.payment_status == 'pending':
+            p.payment_status = 'paid'
+            p.paid_at = p.paid_at or now
+        elif status == 'refunded' and p.payment_status == 'paid':
+            p.payment_status = 'refunded'
+        elif status == 'unpaid' and p.payment_status == 'pending':
+            p.payment_status = 'cancelled'
+        else:
+            continue
+        p.updated_at = now
+        pendapatan.append(p)
+    Pendapatan.objects.bulk_update(pendapatan, ['payment_status', 'paid_at', 'updated_at'], batch_size=200)
@@ -8,6 +8,8 @@ urlpatterns = [
     path('', views.api_bookings, name='api_bookings'),
     path('create/', views.create_booking, name='create_booking'),
     path('history/', views.api_user_booking_history, name='user_booking_history'),
+    path('calendar/', views.api_booking_calendar, name='api_booking_calendar'),
+    path('batch-status/', views.api_booking_batch_status, name='api_booking_batch_status'),
     path('<uuid:booking_id>/', views.api_booking_detail, name='api_booking_detail'),
     
     # Booking Cancellation
@@ -3,18 +3,30 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
 from decimal import Decimal
 import json
 import traceback
-from datetime import date, datetime
+import uuid
+from datetime import date, datetime, timedelta
 
 # Import models
-from app.courts.models import Court, CourtSession
+from app.courts.models import Court, CourtSession, CourtImage, CourtScheduleException
+from app.courts import schedule
 from app.bookings.models import Booking, Payment
+from app.bookings.calendar import MAX_CALENDAR_DAYS, court_calendar
+from app.bookings.transitions import ALLOWED_TRANSITIONS, MAX_BATCH_BOOKINGS, transition_bookings
 from app.revenue.models import Pendapatan, ActivityLog
+from app.venues.models import Venue, VenueImage
 
 # Import decorators
 from app.users.decorators import login_required, role_required
+from lapangin import metrics
+from lapangin.columnar import FastJsonResponse, as_str, convert_rows, hhmm, iso, to_columns, wants_columnar
+from lapangin.fieldsets import parse_fieldset
+from lapangin.pagination import InvalidCursor, paginate_by_cursor, parse_page_size
 
 
 def get_client_ip(request):
@@ -27,14 +39,46 @@ def get_client_ip(request):
     return ip
 
 
+# Formatting of the raw booking list values, applied per row or per column (?format=columnar)
+BOOKING_LIST_CONVERTERS = {
+    'id': as_str,
+    'venue_id': as_str,
+    'booking_date': iso,
+    'start_time': hhmm,
+    'end_time': hhmm,
+    'duration_hours': as_str,
+    'total_price': as_str,
+    'created_at': iso,
+}
+
+BOOKING_LIST_FIELDS = (
+    'id', 'user_name', 'user_email', 'user_phone', 'customer_name', 'customer_email', 'customer_phone',
+    'venue_name', 'venue_id', 'court_name', 'court_id', 'session_name', 'session_id', 'booking_date',
+    'start_time', 'end_time', 'duration_hours', 'total_price', 'booking_status', 'payment_status', 'notes',
+    'cancellation_reason', 'created_at',
+)
+BOOKING_LIST_RELATIONS = ('payment',)
+BOOKING_USER_FIELDS = ('user_name', 'user_email', 'user_phone', 'customer_name', 'customer_email', 'customer_phone')
+
+
 # Booking Management APIs for Mitra
 @login_required
 @role_required('mitra')
 def api_bookings(request):
-    """Get all bookings for mitra's venues"""
+    """Get all bookings for mitra's venues
+
+    ``format=columnar`` returns column arrays and ``fields``/``include``
+    (lapangin.fieldsets) trim each booking; the customer, session and
+    payment joins are skipped when none of their fields is requested.
+    """
     if request.method != 'GET':
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=405)
     
+    try:
+        fieldset = parse_fieldset(request.GET, BOOKING_LIST_FIELDS, BOOKING_LIST_RELATIONS)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    
     try:
         # Get filter parameters
         status_filter = request.GET.get('status', 'all')
@@ -46,8 +90,15 @@ def api_bookings(request):
         
         # Get all bookings for mitra's courts
         bookings_qs = Booking.objects.filter(
-            court__venue__owner=request.user
-        ).select_related('user', 'court', 'court__venue', 'payment', 'session').order_by('-created_at')
+            court__venue__owner_id=request.principal.id
+        ).select_related('court', 'court__venue').order_by('-created_at')
+        with_user = fieldset.wants(*BOOKING_USER_FIELDS)
+        if with_user:
+            bookings_qs = bookings_qs.select_related('user')
+        if fieldset.wants('session_name'):
+            bookings_qs = bookings_qs.select_related('session')
+        if fieldset.includes('payment'):
+            bookings_qs = bookings_qs.select_related('payment')
         
         # Apply filters
         if status_filter != 'all':
@@ -76,13 +127,13 @@ def api_bookings(request):
         completed_count = bookings_qs.filter(booking_status='completed').count()
         cancelled_count = bookings_qs.filter(booking_status='cancelled').count()
         
-        # Prepare booking list
+        # Prepare booking list (raw values; BOOKING_LIST_CONVERTERS formats them)
         bookings_list = []
         for booking in bookings_qs[:100]:  # Limit to 100 most recent
             # Get payment info
             payment_info = None
             try:
-                if hasattr(booking, 'payment'):
+                if fieldset.includes('payment') and hasattr(booking, 'payment'):
                     payment_info = {
                         'method': booking.payment.payment_method,
                         'transaction_id': booking.payment.transaction_id,
@@ -93,44 +144,60 @@ def api_bookings(request):
             except:
                 pass
             
-            bookings_list.append({
-                'id': str(booking.id),
-                'user_name': booking.user.get_full_name() or booking.user.username,
-                'user_email': booking.user.email,
-                'user_phone': booking.user.phone_number,
-                'customer_name': booking.user.get_full_name() or booking.user.username,
-                'customer_email': booking.user.email,
-                'customer_phone': booking.user.phone_number,
+            user = booking.user if with_user else None
+            user_name = (user.get_full_name() or user.username) if user else None
+            bookings_list.append(fieldset.filter({
+                'id': booking.id,
+                'user_name': user_name,
+                'user_email': user.email if user else None,
+                'user_phone': user.phone_number if user else None,
+                'customer_name': user_name,
+                'customer_email': user.email if user else None,
+                'customer_phone': user.phone_number if user else None,
                 'venue_name': booking.court.venue.name,
-                'venue_id': booking.court.venue.id,
+                'venue_id': booking.court.venue_id,
                 'court_name': booking.court.name,
                 'court_id': booking.court.id,
-                'session_name': booking.session.session_name if booking.session else None,
-                'session_id': booking.session.id if booking.session else None,
-                'booking_date': booking.booking_date.isoformat(),
-                'start_time': booking.start_time.strftime('%H:%M'),
-                'end_time': booking.end_time.strftime('%H:%M'),
-                'duration_hours': str(booking.duration_hours),
-                'total_price': str(booking.total_price),
+                'session_name': booking.session.session_name if fieldset.wants('session_name') and booking.session else None,
+                'session_id': booking.session_id,
+                'booking_date': booking.booking_date,
+                'start_time': booking.start_time,
+                'end_time': booking.end_time,
+                'duration_hours': booking.duration_hours,
+                'total_price': booking.total_price,
                 'booking_status': booking.booking_status,
                 'payment_status': booking.payment_status,
                 'notes': booking.notes,
                 'cancellation_reason': booking.cancellation_reason,
-                'created_at': booking.created_at.isoformat(),
+                'created_at': booking.created_at,
                 'payment': payment_info
+            }))
+        
+        statistics = {
+            'total': total_bookings,
+            'pending': pending_count,
+            'confirmed': confirmed_count,
+            'completed': completed_count,
+            'cancelled': cancelled_count
+        }
+        
+        if wants_columnar(request):
+            return FastJsonResponse({
+                'success': True,
+                'data': {
+                    'bookings': to_columns(
+                        bookings_list, BOOKING_LIST_CONVERTERS,
+                        fields=[field for field in BOOKING_LIST_FIELDS + BOOKING_LIST_RELATIONS if field in fieldset]
+                    ),
+                    'statistics': statistics
+                }
             })
         
         return JsonResponse({
             'success': True,
             'data': {
-                'bookings': bookings_list,
-                'statistics': {
-                    'total': total_bookings,
-                    'pending': pending_count,
-                    'confirmed': confirmed_count,
-                    'completed': completed_count,
-                    'cancelled': cancelled_count
-                }
+                'bookings': convert_rows(bookings_list, BOOKING_LIST_CONVERTERS),
+                'statistics': statistics
             }
         })
         
@@ -149,7 +216,7 @@ def api_booking_detail(request, booking_id):
     try:
         booking = Booking.objects.select_related(
             'user', 'court', 'court__venue', 'payment'
-        ).get(id=booking_id, court__venue__owner=request.user)
+        ).get(id=booking_id, court__venue__owner_id=request.principal.id)
     except Booking.DoesNotExist:
         return JsonResponse({
             'success': False,
@@ -216,11 +283,22 @@ def api_booking_detail(request, booking_id):
                     'message': 'Status booking tidak valid'
                 }, status=400)
             
+            previous_status = booking.booking_status
             booking.booking_status = new_status
             if new_status == 'cancelled' and cancellation_reason:
                 booking.cancellation_reason = cancellation_reason
             
-            booking.save()
+            try:
+                with transaction.atomic():
+                    booking.save()
+            except IntegrityError:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Sesi ini sudah dibooking oleh pengguna lain pada tanggal tersebut'
+                }, status=409)
+            
+            if new_status == 'cancelled' and previous_status != 'cancelled':
+                metrics.BOOKINGS_CANCELLED.inc(actor='mitra')
             
             # Log the activity
             ActivityLog.objects.create(
@@ -257,16 +335,134 @@ def api_booking_detail(request, booking_id):
     }, status=405)
 
 
+@login_required
+@role_required('mitra')
+@require_http_methods(["GET"])
+def api_booking_calendar(request):
+    """Week/month calendar of a venue's courts as a compact columnar grid
+
+    Query params:
+        venue_id: venue of the mitra (required)
+        date_from: first day, YYYY-MM-DD (default today)
+        date_to: last day, YYYY-MM-DD (default date_from + 6 days, at most 62 days)
+    See app.bookings.calendar for the payload layout.
+    """
+    venue_id = request.GET.get('venue_id')
+    if not venue_id:
+        return JsonResponse({
+            'success': False,
+            'message': 'venue_id wajib diisi'
+        }, status=400)
+    try:
+        venue = Venue.objects.only('id').get(id=venue_id, owner_id=request.principal.id)
+    except (Venue.DoesNotExist, ValueError, ValidationError):
+        return JsonResponse({
+            'success': False,
+            'message': 'Venue tidak ditemukan'
+        }, status=404)
+    
+    try:
+        date_from = datetime.strptime(request.GET['date_from'], '%Y-%m-%d').date() if request.GET.get('date_from') else date.today()
+        date_to = datetime.strptime(request.GET['date_to'], '%Y-%m-%d').date() if request.GET.get('date_to') else date_from + timedelta(days=6)
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Format tanggal tidak valid. Gunakan YYYY-MM-DD'
+        }, status=400)
+    if not 0 <= (date_to - date_from).days < MAX_CALENDAR_DAYS:
+        return JsonResponse({
+            'success': False,
+            'message': f'Rentang tanggal harus 1 sampai {MAX_CALENDAR_DAYS} hari'
+        }, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'data': court_calendar(venue, date_from, date_to)
+    })
+
+
+@csrf_exempt
+@login_required
+@role_required('mitra')
+@require_http_methods(["POST"])
+def api_booking_batch_status(request):
+    """Change the status of many bookings of the mitra's venues at once
+
+    Body: ``{"booking_ids": [...], "booking_status": "confirmed", "cancellation_reason": ""}``.
+    Confirming or completing marks the payment as received; cancelling a
+    paid booking refunds it. Returns a result per booking; bookings that are
+    not found or cannot make the transition are skipped.
+    """
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({
+            'success': False,
+            'message': 'Data tidak valid'
+        }, status=400)
+    
+    new_status = data.get('booking_status')
+    if new_status not in ALLOWED_TRANSITIONS or new_status == 'pending':
+        return JsonResponse({
+            'success': False,
+            'message': 'Status booking tidak valid'
+        }, status=400)
+    
+    booking_ids = data.get('booking_ids')
+    if not isinstance(booking_ids, list) or not booking_ids:
+        return JsonResponse({
+            'success': False,
+            'message': 'booking_ids wajib diisi'
+        }, status=400)
+    if len(booking_ids) > MAX_BATCH_BOOKINGS:
+        return JsonResponse({
+            'success': False,
+            'message': f'Maksimal {MAX_BATCH_BOOKINGS} booking per permintaan'
+        }, status=400)
+    try:
+        booking_ids = list(dict.fromkeys(uuid.UUID(str(booking_id)) for booking_id in booking_ids))
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'message': 'ID booking tidak valid'
+        }, status=400)
+    
+    results, updated = transition_bookings(
+        request.user, booking_ids, new_status, (data.get('cancellation_reason') or '').strip()
+    )
+    
+    if updated:
+        if new_status == 'cancelled':
+            metrics.BOOKINGS_CANCELLED.inc(len(updated), actor='mitra')
+        ActivityLog.objects.create(
+            user=request.user,
+            action_type='update',
+            description=f'Updated {len(updated)} booking(s) status to {new_status}',
+            ip_address=get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', '')
+        )
+    
+    return JsonResponse({
+        'success': True,
+        'message': f'{len(updated)} booking berhasil diubah menjadi {new_status}',
+        'data': {
+            'updated': len(updated),
+            'skipped': len(results) - len(updated),
+            'results': results,
+        }
+    })
+
+
 # Create Booking Endpoint
 @csrf_exempt
 @require_http_methods(["POST"])
 def create_booking(request):
     """Create a new booking with payment"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'success': False, 'message': 'Authentication required'}, status=401)
     
     # Only users can create bookings, not mitra or admin
-    if request.user.role == 'admin':
+    if request.principal.role == 'admin':
         return JsonResponse({
             'success': False,
             'message': 'Admins cannot create bookings'
@@ -298,8 +494,8 @@ def create_booking(request):
             }, status=404)
         
         # Get sessions
-        sessions = CourtSession.objects.filter(id__in=session_ids, court=court)
-        if sessions.count() != len(session_ids):
+        sessions = list(CourtSession.objects.filter(id__in=session_ids, court=court))
+        if len(sessions) != len(session_ids):
             return JsonResponse({
                 'success': False,
                 'message': 'One or more sessions not found'
@@ -321,79 +517,100 @@ def create_booking(request):
                 'message': 'Cannot book for past dates'
             }, status=400)
         
-        # Create bookings for each session
-        created_bookings = []
-        total_price = 0
-        
+        # Sessions must run on that weekday and not be closed by a schedule exception
+        exceptions = CourtScheduleException.objects.filter(court=court, date=booking_date_obj)
+        bookable_ids = {s.id for s in schedule.sessions_for_date(sessions, booking_date_obj, exceptions)}
         for session in sessions:
-            # Check if session is already booked
-            existing_booking = Booking.objects.filter(
-                court=court,
-                booking_date=booking_date_obj,
-                session=session,
-                booking_status__in=['pending', 'confirmed']
-            ).exists()
-            
-            if existing_booking:
+            if session.id not in bookable_ids:
                 return JsonResponse({
                     'success': False,
-                    'message': f'Session {session.session_name} is already booked for this date'
+                    'message': f'Session {session.session_name} is not available on this date'
                 }, status=400)
-            
-            # Calculate duration and price
-            start_time = session.start_time
-            end_time = session.end_time
-            
-            # Calculate duration in hours
-            start_datetime = datetime.combine(booking_date_obj, start_time)
-            end_datetime = datetime.combine(booking_date_obj, end_time)
-            duration = (end_datetime - start_datetime).total_seconds() / 3600
-            
-            price = Decimal(str(court.price_per_hour)) * Decimal(str(duration))
-            total_price += price
-            
-            # Create booking
-            booking = Booking.objects.create(
-                user=request.user,
-                court=court,
-                session=session,
-                booking_date=booking_date_obj,
-                start_time=start_time,
-                end_time=end_time,
-                duration_hours=Decimal(str(duration)),
-                total_price=price,
-                booking_status='confirmed' if auto_confirm else 'pending',
-                payment_status='paid' if auto_confirm else 'unpaid',
-                notes=notes
-            )
-            
-            # Create payment record
-            payment = Payment.objects.create(
-                booking=booking,
-                amount=price,
-                payment_method=payment_method,
-                transaction_id=f'TRX-{booking.id}-{datetime.now().strftime("%Y%m%d%H%M%S")}',
-                paid_at=datetime.now() if auto_confirm else None
-            )
-            
-            # Create Pendapatan record for mitra
-            mitra = court.venue.owner  # The venue owner (mitra)
-            Pendapatan.objects.create(
-                mitra=mitra,
-                booking=booking,
-                amount=price,
-                commission_rate=Decimal('10.00'),  # 10% platform commission
-                payment_status='paid' if auto_confirm else 'pending',
-                paid_at=datetime.now() if auto_confirm else None
-            )
-            
-            created_bookings.append({
-                'id': str(booking.id),
-                'session': session.session_name,
-                'start_time': str(start_time),
-                'end_time': str(end_time),
-                'price': float(price)
-            })
+        
+        # Fail fast if any requested session is already taken on this date
+        booked = Booking.objects.filter(
+            court=court,
+            booking_date=booking_date_obj,
+            session__in=sessions,
+            booking_status__in=['pending', 'confirmed']
+        ).select_related('session').first()
+        
+        if booked:
+            return JsonResponse({
+                'success': False,
+                'message': f'Session {booked.session.session_name} is already booked for this date'
+            }, status=409)
+        
+        # Create bookings for each session. The unique_active_booking_per_slot
+        # constraint is what actually prevents double bookings when two
+        # requests pass the check above at the same time.
+        created_bookings = []
+        total_price = 0
+        
+        try:
+            with transaction.atomic():
+                for session in sessions:
+                    # Calculate duration and price
+                    start_time = session.start_time
+                    end_time = session.end_time
+                    
+                    # Calculate duration in hours
+                    start_datetime = datetime.combine(booking_date_obj, start_time)
+                    end_datetime = datetime.combine(booking_date_obj, end_time)
+                    duration = (end_datetime - start_datetime).total_seconds() / 3600
+                    
+                    price = Decimal(str(court.price_per_hour)) * Decimal(str(duration))
+                    total_price += price
+                    
+                    # Create booking
+                    booking = Booking.objects.create(
+                        user=request.user,
+                        court=court,
+                        session=session,
+                        booking_date=booking_date_obj,
+                        start_time=start_time,
+                        end_time=end_time,
+                        duration_hours=Decimal(str(duration)),
+                        total_price=price,
+                        booking_status='confirmed' if auto_confirm else 'pending',
+                        payment_status='paid' if auto_confirm else 'unpaid',
+                        notes=notes
+                    )
+                    
+                    # Create payment record
+                    payment = Payment.objects.create(
+                        booking=booking,
+                        amount=price,
+                        payment_method=payment_method,
+                        transaction_id=f'TRX-{booking.id}-{datetime.now().strftime("%Y%m%d%H%M%S")}',
+                        paid_at=datetime.now() if auto_confirm else None
+                    )
+                    
+                    # Create Pendapatan record for mitra
+                    mitra = court.venue.owner  # The venue owner (mitra)
+                    Pendapatan.objects.create(
+                        mitra=mitra,
+                        booking=booking,
+                        amount=price,
+                        commission_rate=Decimal('10.00'),  # 10% platform commission
+                        payment_status='paid' if auto_confirm else 'pending',
+                        paid_at=datetime.now() if auto_confirm else None
+                    )
+                    
+                    created_bookings.append({
+                        'id': str(booking.id),
+                        'session': session.session_name,
+                        'start_time': str(start_time),
+                        'end_time': str(end_time),
+                        'price': float(price)
+                    })
+        except IntegrityError:
+            return JsonResponse({
+                'success': False,
+                'message': 'One or more sessions were just booked by someone else for this date'
+            }, status=409)
+        
+        metrics.BOOKINGS_CREATED.inc(len(created_bookings))
         
         # Log the activity
         ActivityLog.objects.create(
@@ -428,10 +645,33 @@ def create_booking(request):
 
 
 # User Booking History API
+BOOKING_HISTORY_FIELDS = (
+    'id', 'venue_name', 'venue_id', 'court_name', 'court_id', 'session_name', 'session_id',
+    'booking_date', 'start_time', 'end_time', 'duration_hours', 'total_price',
+    'booking_status', 'payment_status', 'notes', 'created_at', 'updated_at', 'payment',
+    'is_cancellable', 'court_image', 'venue_image',
+)
+BOOKING_HISTORY_RELATIONS = ('payment',)
+BOOKING_HISTORY_CONVERTERS = {
+    **BOOKING_LIST_CONVERTERS,
+    'updated_at': iso,
+}
+
+
 @require_http_methods(["GET"])
 def api_user_booking_history(request):
-    """API endpoint for getting user's booking history"""
-    if not request.user.is_authenticated:
+    """API endpoint for getting user's booking history
+
+    Query params:
+        status: all (default) or a comma-separated list of booking statuses
+        date_from / date_to: booking_date range, YYYY-MM-DD (inclusive)
+        sort: -created_at (default), created_at, booking_date, -booking_date, updated_at, -updated_at
+        page_size: bookings per page (default 20, max 100); ``limit`` is accepted as an alias
+        cursor: ``pagination.next_cursor`` of the previous page
+        fields / include: subset of BOOKING_HISTORY_FIELDS to return (lapangin.fieldsets)
+        format: ``columnar`` returns the bookings as column arrays (lapangin.columnar)
+    """
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
@@ -445,112 +685,161 @@ def api_user_booking_history(request):
     
     try:
         # Get filter parameters
-        status_filter = request.GET.get('status', 'all')  # all, pending, confirmed, completed, cancelled
-        sort_by = request.GET.get('sort', '-created_at')  # -created_at, booking_date, -booking_date
-        limit = request.GET.get('limit', None)  # Limit number of results
+        status_filter = request.GET.get('status', 'all')
+        sort_by = request.GET.get('sort', '-created_at')
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        page_size = parse_page_size(request.GET.get('page_size') or request.GET.get('limit'))
+        cursor = request.GET.get('cursor')
         
-        # Get all bookings for the user
-        bookings_qs = Booking.objects.filter(user=request.user).select_related(
-            'court', 'court__venue', 'session', 'payment'
-        ).prefetch_related('court__images', 'court__venue__images')
+        valid_sorts = ['-created_at', 'created_at', 'booking_date', '-booking_date', '-updated_at', 'updated_at']
+        if sort_by not in valid_sorts:
+            sort_by = '-created_at'
+        
+        try:
+            fields = parse_fieldset(
+                request.GET,
+                [field for field in BOOKING_HISTORY_FIELDS if field not in BOOKING_HISTORY_RELATIONS],
+                BOOKING_HISTORY_RELATIONS,
+            )
+        except ValueError as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
+        
+        bookings_qs = Booking.objects.filter(user_id=request.principal.id)
         
         # Apply status filter
         if status_filter != 'all':
-            bookings_qs = bookings_qs.filter(booking_status=status_filter)
+            statuses = [s.strip() for s in status_filter.split(',') if s.strip()]
+            valid_statuses = {choice for choice, _ in Booking.BOOKING_STATUS}
+            if not statuses or any(s not in valid_statuses for s in statuses):
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Invalid status filter'
+                }, status=400)
+            bookings_qs = bookings_qs.filter(booking_status__in=statuses)
         
-        # Apply sorting
-        valid_sorts = ['-created_at', 'created_at', 'booking_date', '-booking_date', '-updated_at', 'updated_at']
-        if sort_by in valid_sorts:
-            bookings_qs = bookings_qs.order_by(sort_by)
-        else:
-            bookings_qs = bookings_qs.order_by('-created_at')
+        # Apply booking date range
+        try:
+            if date_from:
+                bookings_qs = bookings_qs.filter(booking_date__gte=datetime.strptime(date_from, '%Y-%m-%d').date())
+            if date_to:
+                bookings_qs = bookings_qs.filter(booking_date__lte=datetime.strptime(date_to, '%Y-%m-%d').date())
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Invalid date format. Use YYYY-MM-DD'
+            }, status=400)
         
-        # Apply limit if provided
-        if limit:
-            try:
-                limit = int(limit)
-                bookings_qs = bookings_qs[:limit]
-            except (ValueError, TypeError):
-                pass
+        # Only join and annotate what the requested fields need
+        related = ['court', 'court__venue']
+        if 'session_name' in fields:
+            related.append('session')
+        if 'payment' in fields:
+            related.append('payment')
+        bookings_qs = bookings_qs.select_related(*related)
+        
+        # A single image URL per row (primary first, otherwise the oldest)
+        # instead of prefetching every court and venue image.
+        if 'court_image' in fields or 'venue_image' in fields:
+            bookings_qs = bookings_qs.annotate(
+                court_image_url=Subquery(
+                    CourtImage.objects.filter(court=OuterRef('court_id'))
+                    .order_by('-is_primary', 'id').values('image_url')[:1]
+                ),
+                venue_image_url=Subquery(
+                    VenueImage.objects.filter(venue=OuterRef('court__venue_id'))
+                    .order_by('-is_primary', 'id').values('image_url')[:1]
+                ),
+            )
+        
+        try:
+            bookings, next_cursor = paginate_by_cursor(bookings_qs, sort_by, cursor, page_size)
+        except InvalidCursor as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=400)
         
         # Prepare booking list
+        today = date.today()
         bookings_data = []
-        for booking in bookings_qs:
+        for booking in bookings:
             # Get payment info if exists
             payment_info = None
-            if hasattr(booking, 'payment'):
+            if 'payment' in fields and hasattr(booking, 'payment'):
                 payment_info = {
                     'method': booking.payment.payment_method,
                     'status': booking.payment_status,
                     'paid_at': booking.payment.paid_at.isoformat() if booking.payment.paid_at else None
                 }
             
-            # Get court/venue image
-            court_image = None
-            venue_image = None
+            # The venue image is only a fallback when the court has none
+            court_image = getattr(booking, 'court_image_url', None)
+            venue_image = None if court_image else getattr(booking, 'venue_image_url', None)
             
-            # Try to get primary court image first
-            if booking.court.images.exists():
-                primary_court_image = booking.court.images.filter(is_primary=True).first()
-                if primary_court_image:
-                    court_image = primary_court_image.image_url
-                else:
-                    # Get first image if no primary image
-                    court_image = booking.court.images.first().image_url
+            session_name = None
+            if 'session_name' in fields:
+                session_name = booking.session.session_name if booking.session_id else 'N/A'
             
-            # Try to get primary venue image as fallback
-            if not court_image and booking.court.venue.images.exists():
-                primary_venue_image = booking.court.venue.images.filter(is_primary=True).first()
-                if primary_venue_image:
-                    venue_image = primary_venue_image.image_url
-                else:
-                    # Get first image if no primary image
-                    venue_image = booking.court.venue.images.first().image_url
-            
-            bookings_data.append({
-                'id': str(booking.id),
+            booking_data = {
+                'id': booking.id,
                 'venue_name': booking.court.venue.name,
-                'venue_id': str(booking.court.venue.id),
+                'venue_id': booking.court.venue_id,
                 'court_name': booking.court.name,
                 'court_id': booking.court.id,
-                'session_name': booking.session.session_name if booking.session else 'N/A',
-                'session_id': booking.session.id if booking.session else None,
-                'booking_date': booking.booking_date.isoformat(),
-                'start_time': booking.start_time.strftime('%H:%M'),
-                'end_time': booking.end_time.strftime('%H:%M'),
-                'duration_hours': str(booking.duration_hours),
-                'total_price': str(booking.total_price),
+                'session_name': session_name,
+                'session_id': booking.session_id,
+                'booking_date': booking.booking_date,
+                'start_time': booking.start_time,
+                'end_time': booking.end_time,
+                'duration_hours': booking.duration_hours,
+                'total_price': booking.total_price,
                 'booking_status': booking.booking_status,
                 'payment_status': booking.payment_status,
                 'notes': booking.notes,
-                'created_at': booking.created_at.isoformat(),
-                'updated_at': booking.updated_at.isoformat(),
+                'created_at': booking.created_at,
+                'updated_at': booking.updated_at,
                 'payment': payment_info,
-                'is_cancellable': booking.booking_date > date.today() and booking.booking_status != 'cancelled',
+                'is_cancellable': booking.booking_date > today and booking.booking_status != 'cancelled',
                 'court_image': court_image,
                 'venue_image': venue_image
-            })
+            }
+            bookings_data.append(fields.filter(booking_data))
+        
+        # Get statistics in one conditional aggregate over all of the user's bookings
+        statistics = Booking.objects.filter(user_id=request.principal.id).aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(booking_status='pending')),
+            confirmed=Count('id', filter=Q(booking_status='confirmed')),
+            completed=Count('id', filter=Q(booking_status='completed')),
+            cancelled=Count('id', filter=Q(booking_status='cancelled')),
+        )
         
-        # Get statistics
-        total_bookings = Booking.objects.filter(user=request.user).count()
-        pending_count = Booking.objects.filter(user=request.user, booking_status='pending').count()
-        confirmed_count = Booking.objects.filter(user=request.user, booking_status='confirmed').count()
-        completed_count = Booking.objects.filter(user=request.user, booking_status='completed').count()
-        cancelled_count = Booking.objects.filter(user=request.user, booking_status='cancelled').count()
+        if wants_columnar(request):
+            response_class = FastJsonResponse
+            bookings_data = to_columns(
+                bookings_data, BOOKING_HISTORY_CONVERTERS,
+                fields=[field for field in BOOKING_HISTORY_FIELDS if field in fields]
+            )
+        else:
+            response_class = JsonResponse
+            bookings_data = convert_rows(bookings_data, BOOKING_HISTORY_CONVERTERS)
         
-        return JsonResponse({
+        return response_class({
             'success': True,
             'data': {
                 'bookings': bookings_data,
-                'statistics': {
-                    'total': total_bookings,
-                    'pending': pending_count,
-                    'confirmed': confirmed_count,
-                    'completed': completed_count,
-                    'cancelled': cancelled_count
-                },
+                'statistics': statistics,
                 'filter': status_filter,
-                'sort': sort_by
+                'sort': sort_by,
+                'pagination': {
+                    'page_size': page_size,
+                    'next_cursor': next_cursor,
+                    'has_next': next_cursor is not None
+                }
             }
         })
         
@@ -569,7 +858,7 @@ def cancel_booking(request, booking_id):
     Accepts both DELETE and POST methods for better compatibility
     """
     # Check authentication
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
@@ -629,6 +918,7 @@ def cancel_booking(request, booking_id):
         
         # Save the booking
         booking.save()
+        metrics.BOOKINGS_CANCELLED.inc(actor='user')
         
         # Log the cancellation activity
         try:
@@ -672,7 +962,7 @@ def get_booking_status(request, booking_id):
     """
     Get current status of a booking
     """
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Court, CourtSession, CourtImage
+from .models import Court, CourtSession, CourtImage, CourtScheduleException
 
 @admin.register(Court)
 class CourtAdmin(admin.ModelAdmin):
@@ -10,11 +10,18 @@ class CourtAdmin(admin.ModelAdmin):
 
 @admin.register(CourtSession)
 class CourtSessionAdmin(admin.ModelAdmin):
-    list_display = ('court', 'session_name', 'start_time', 'end_time', 'is_active')
+    list_display = ('court', 'session_name', 'start_time', 'end_time', 'days_mask', 'is_active')
     list_filter = ('is_active', 'court')
     search_fields = ('session_name', 'court__name')
 
 
+@admin.register(CourtScheduleException)
+class CourtScheduleExceptionAdmin(admin.ModelAdmin):
+    list_display = ('court', 'date', 'start_time', 'end_time', 'reason')
+    list_filter = ('date',)
+    search_fields = ('court__name', 'court__venue__name', 'reason')
+
+
 # Register other models
 admin.site.register(CourtImage)
 
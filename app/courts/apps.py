@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CourtsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.courts'
+
+    def ready(self):
+        # Register signal handlers
+        from app.courts import signals  # noqa: F401
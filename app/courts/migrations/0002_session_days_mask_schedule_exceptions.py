@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def days_mask_from_session_name(apps, schema_editor):
+    """Sessions named like "Monday 08:00" only ran on that weekday; keep that in days_mask"""
+    CourtSession = apps.get_model('courts', 'CourtSession')
+    for index, day_name in enumerate(DAY_NAMES):
+        CourtSession.objects.filter(session_name__startswith=f'{day_name} ').update(days_mask=1 << index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='courtsession',
+            name='days_mask',
+            field=models.PositiveSmallIntegerField(default=127),
+        ),
+        migrations.CreateModel(
+            name='CourtScheduleException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('end_time', models.TimeField(blank=True, null=True)),
+                ('reason', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('court', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_exceptions', to='courts.court')),
+            ],
+            options={
+                'ordering': ['date', 'start_time'],
+                'indexes': [models.Index(fields=['court', 'date'], name='courts_cour_court_i_449773_idx')],
+            },
+        ),
+        migrations.RunPython(days_mask_from_session_name, migrations.RunPython.noop),
+    ]
@@ -25,6 +25,8 @@ class CourtSession(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
     is_active = models.BooleanField(default=True)
+    # Weekdays the session runs on: bit 0 = Monday ... bit 6 = Sunday (see app.courts.schedule)
+    days_mask = models.PositiveSmallIntegerField(default=0b1111111)
     
     def __str__(self):
         return f"{self.court.name} - {self.session_name} ({self.start_time}-{self.end_time})"
@@ -33,6 +35,25 @@ class CourtSession(models.Model):
         unique_together = ('court', 'start_time')
         ordering = ['start_time']
 
+# Court Schedule Exceptions (holidays, maintenance)
+class CourtScheduleException(models.Model):
+    court = models.ForeignKey(Court, on_delete=models.CASCADE, related_name='schedule_exceptions')
+    date = models.DateField()
+    # Leave both times empty to close the court for the whole day
+    start_time = models.TimeField(blank=True, null=True)
+    end_time = models.TimeField(blank=True, null=True)
+    reason = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        if self.start_time and self.end_time:
+            return f"{self.court.name} - {self.date} ({self.start_time}-{self.end_time})"
+        return f"{self.court.name} - {self.date} (closed)"
+    
+    class Meta:
+        ordering = ['date', 'start_time']
+        indexes = [models.Index(fields=['court', 'date'])]
+
 # Court Images Model
 class CourtImage(models.Model):
     court = models.ForeignKey(Court, on_delete=models.CASCADE, related_name='images')
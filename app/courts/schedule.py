@@ -0,0 +1,109 @@
+"""
+Weekly schedule templates for courts.
+
+A CourtSession is a recurring time slot: ``days_mask`` holds one bit per
+weekday (bit 0 = Monday ... bit 6 = Sunday, the same numbering as
+``date.weekday()`` and OperationalHour.day_of_week), so "Mon-Fri 08:00" is a
+single row instead of five. Concrete slots for a date range are produced
+lazily by :func:`expand_slots`, skipping CourtScheduleException dates.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DAY_INDEX = {name: index for index, name in enumerate(DAY_NAMES)}
+ALL_DAYS = 0b1111111
+
+Slot = namedtuple('Slot', ['date', 'session'])
+
+
+def day_bit(day):
+    """Bit of ``day`` (a date) in a days mask"""
+    return 1 << day.weekday()
+
+
+def days_mask_from_names(names):
+    """Build a days mask from weekday names; raises ValueError on unknown names"""
+    mask = 0
+    for name in names:
+        try:
+            mask |= 1 << DAY_INDEX[name.strip().capitalize()]
+        except KeyError:
+            raise ValueError(f'Unknown day: {name}')
+    return mask
+
+
+def parse_days_mask(data):
+    """Read the weekdays of a session from request data.
+
+    Accepts ``days_mask`` (int), ``days`` (list of day names) or the legacy
+    single ``day_of_week`` name. Returns None when the days are not given.
+    """
+    if data.get('days_mask') not in (None, ''):
+        mask = int(data.get('days_mask'))
+        if not 0 < mask <= ALL_DAYS:
+            raise ValueError('days_mask must be between 1 and 127')
+        return mask
+    if data.get('days'):
+        return days_mask_from_names(data.get('days'))
+    if data.get('day_of_week') in DAY_INDEX:
+        return days_mask_from_names([data.get('day_of_week')])
+    # Any other legacy day_of_week value has always meant "every day"
+    return None
+
+
+def day_names_from_mask(mask):
+    return [name for index, name in enumerate(DAY_NAMES) if mask & (1 << index)]
+
+
+def session_name_for(mask, start_time):
+    """Display name of a session from its weekdays and start time ('HH:MM')"""
+    return f"{', '.join(day_names_from_mask(mask))} {start_time}"
+
+
+def runs_on(session, day):
+    return bool(session.days_mask & day_bit(day))
+
+
+def exception_blocks(exception, session):
+    """Whether an exception closes ``session``; exceptions without times close the whole day"""
+    if exception.start_time is None or exception.end_time is None:
+        return True
+    return session.start_time < exception.end_time and exception.start_time < session.end_time
+
+
+def index_exceptions(exceptions):
+    """Group exceptions by date for constant-time lookups while expanding"""
+    by_date = {}
+    for exception in exceptions:
+        by_date.setdefault(exception.date, []).append(exception)
+    return by_date
+
+
+def expand_slots(sessions, date_from, date_to, exceptions=()):
+    """Yield a Slot for every session occurrence between date_from and date_to (inclusive).
+
+    ``sessions`` should already be filtered to active sessions and ordered by
+    start time; ``exceptions`` are the CourtScheduleException rows of the same
+    court for the range. Nothing is materialised up front, so callers can stop
+    early or stream the result.
+    """
+    sessions = list(sessions)
+    exceptions_by_date = index_exceptions(exceptions)
+    day = date_from
+    while day <= date_to:
+        bit = day_bit(day)
+        day_exceptions = exceptions_by_date.get(day, ())
+        for session in sessions:
+            if not session.days_mask & bit:
+                continue
+            if any(exception_blocks(exception, session) for exception in day_exceptions):
+                continue
+            yield Slot(day, session)
+        day += timedelta(days=1)
+
+
+def sessions_for_date(sessions, day, exceptions=()):
+    """Sessions of ``sessions`` that are bookable on ``day``"""
+    return [slot.session for slot in expand_slots(sessions, day, day, exceptions)]
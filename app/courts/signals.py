@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.courts.models import Court
+from app.venues.facets import refresh_venue_summaries
+
+
+@receiver(post_save, sender=Court)
+@receiver(post_delete, sender=Court)
+def refresh_venue_summary(sender, instance, **kwargs):
+    """Keep the venue's price range and category mask in step with its courts"""
+    refresh_venue_summaries([instance.venue_id])
@@ -0,0 +1,48 @@
+"""
+Bulk sync of a court's sessions and images from the court editor payload.
+"""
+from app.courts import schedule
+from app.courts.models import CourtSession, CourtImage
+from lapangin.sync import sync_children, sync_image_urls
+
+
+def sync_court_images(court, image_urls):
+    """Make the court's images exactly ``image_urls``, keeping existing rows"""
+    return sync_image_urls(CourtImage, 'court', court, image_urls)
+
+
+def sync_court_sessions(court, sessions_data):
+    """Make the court's sessions match the editor payload.
+
+    Items with an ``id`` update that session, items without one are created
+    and sessions missing from the payload are deleted.
+    """
+    desired = []
+    for session_data in sessions_data:
+        item = {
+            'id': session_data.get('id'),
+            'session_name': session_data.get('session_name', ''),
+            'start_time': session_data.get('start_time'),
+            'end_time': session_data.get('end_time'),
+            'is_active': session_data.get('is_active', True),
+        }
+        days_mask = schedule.parse_days_mask(session_data)
+        if days_mask is not None:
+            item['days_mask'] = days_mask
+        desired.append(item)
+
+    return sync_children(
+        CourtSession,
+        court.sessions.all(),
+        desired,
+        key='id',
+        fields=['session_name', 'start_time', 'end_time', 'is_active', 'days_mask'],
+        build=lambda item: CourtSession(
+            court=court,
+            session_name=item['session_name'],
+            start_time=item['start_time'],
+            end_time=item['end_time'],
+            is_active=item['is_active'],
+            days_mask=item.get('days_mask', schedule.ALL_DAYS),
+        ),
+    )
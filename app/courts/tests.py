@@ -1,8 +1,10 @@
 from django.test import TestCase
-from datetime import time
+from datetime import date, time, timedelta
 from app.users.models import User
 from app.venues.models import Venue, SportsCategory
 from app.courts.models import Court, CourtSession, CourtImage
+from app.courts import schedule
+from app.venues import reference
 
 
 class CourtModelTestCase(TestCase):
@@ -201,3 +203,443 @@ class CourtImageModelTestCase(TestCase):
         expected = "Test Venue - Court 1 - Image"
         self.assertEqual(str(image), expected)
 
+
+
+class CourtDetailAPITestCase(TestCase):
+    """Test cases for the mitra court detail API"""
+
+    def setUp(self):
+        """Set up test data"""
+        from app.bookings.models import Booking
+        
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='user@test.com',
+            role='user'
+        )
+        
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(name='FUTSAL')
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        self.morning = CourtSession.objects.create(
+            court=self.court,
+            session_name='Morning',
+            start_time=time(8, 0),
+            end_time=time(9, 0)
+        )
+        
+        self.evening = CourtSession.objects.create(
+            court=self.court,
+            session_name='Evening',
+            start_time=time(18, 0),
+            end_time=time(19, 0)
+        )
+        
+        self.start = date(2025, 1, 1)
+        for offset, status in enumerate(['confirmed', 'completed', 'pending', 'cancelled']):
+            Booking.objects.create(
+                user=self.user,
+                court=self.court,
+                session=self.morning,
+                booking_date=self.start + timedelta(days=offset),
+                start_time=time(8, 0),
+                end_time=time(9, 0),
+                duration_hours=1,
+                total_price=100000,
+                booking_status=status
+            )
+        
+        self.client.force_login(self.mitra)
+    
+    def get_sessions(self, params=None):
+        response = self.client.get(f'/api/courts/{self.court.id}/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return {s['session_name']: s for s in response.json()['data']['sessions']}
+    
+    def test_total_bookings_per_session(self):
+        """Test cancelled bookings are not counted"""
+        sessions = self.get_sessions()
+        
+        self.assertEqual(sessions['Morning']['total_bookings'], 3)
+        self.assertEqual(sessions['Evening']['total_bookings'], 0)
+        self.assertNotIn('utilization', sessions['Morning'])
+    
+    def test_booking_window_and_utilization(self):
+        """Test date_from/date_to restrict the counts and add utilization"""
+        sessions = self.get_sessions({
+            'date_from': self.start.isoformat(),
+            'date_to': (self.start + timedelta(days=1)).isoformat(),
+        })
+        
+        self.assertEqual(sessions['Morning']['total_bookings'], 2)
+        self.assertEqual(sessions['Morning']['utilization'], 1.0)
+        self.assertEqual(sessions['Evening']['utilization'], 0.0)
+
+    def test_utilization_counts_only_bookable_days(self):
+        """Test utilization divides by the session's weekdays, minus closed days"""
+        from app.bookings.models import Booking
+        from app.courts.models import CourtScheduleException
+
+        saturday = CourtSession.objects.create(
+            court=self.court,
+            session_name='Saturday',
+            start_time=time(10, 0),
+            end_time=time(11, 0),
+            days_mask=schedule.days_mask_from_names(['Saturday'])
+        )
+        # The four Saturdays of the window; the third is closed for maintenance
+        saturdays = [date(2025, 1, 4) + timedelta(weeks=week) for week in range(4)]
+        CourtScheduleException.objects.create(court=self.court, date=saturdays[2])
+        for day in saturdays[:2] + saturdays[3:]:
+            Booking.objects.create(
+                user=self.user,
+                court=self.court,
+                session=saturday,
+                booking_date=day,
+                start_time=time(10, 0),
+                end_time=time(11, 0),
+                duration_hours=1,
+                total_price=100000,
+                booking_status='confirmed'
+            )
+
+        sessions = self.get_sessions({'date_from': '2025-01-01', 'date_to': '2025-01-28'})
+
+        self.assertEqual(sessions['Saturday']['bookable_days'], 3)
+        self.assertEqual(sessions['Saturday']['utilization'], 1.0)
+        self.assertEqual(sessions['Morning']['bookable_days'], 27)
+
+    def test_query_count_does_not_grow_with_sessions(self):
+        """Test booking counts come from a single grouped query"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as before:
+            self.get_sessions()
+        for hour in range(10, 16):
+            CourtSession.objects.create(
+                court=self.court,
+                session_name=f'Session {hour}',
+                start_time=time(hour, 0),
+                end_time=time(hour + 1, 0)
+            )
+        with CaptureQueriesContext(connection) as after:
+            self.get_sessions()
+        
+        self.assertEqual(len(before), len(after))
+    
+    def test_invalid_window(self):
+        """Test malformed or reversed date windows are rejected"""
+        response = self.client.get(f'/api/courts/{self.court.id}/', {'date_from': '2025-13-01'})
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.client.get(f'/api/courts/{self.court.id}/', {
+            'date_from': '2025-02-01', 'date_to': '2025-01-01'
+        })
+        self.assertEqual(response.status_code, 400)
+    
+    def test_court_list_fieldset(self):
+        """Test the court list joins and prefetches only what fields/include ask for"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        CourtImage.objects.create(court=self.court, image_url='https://example.com/court.jpg', is_primary=True)
+        Court.objects.create(venue=self.venue, name='Court 2', category=self.category, price_per_hour=80000)
+        
+        with CaptureQueriesContext(connection) as full:
+            courts = self.client.get('/api/courts/').json()['data']
+        self.assertEqual(courts[0]['venue_name'], 'Test Venue')
+        self.assertEqual(len([c for c in courts if c['images']]), 1)
+        
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get('/api/courts/', {'fields': 'id,name,price_per_hour'})
+        self.assertEqual(response.status_code, 200)
+        for court in response.json()['data']:
+            self.assertEqual(set(court), {'id', 'name', 'price_per_hour'})
+        self.assertEqual(len(full) - len(sparse), 1)  # The image prefetch
+        self.assertNotIn('"venues_venue"."name"', sparse[-1]['sql'])
+        
+        response = self.client.get('/api/courts/', {'fields': 'id,venue'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CourtScheduleTestCase(TestCase):
+    """Test cases for weekly session templates and schedule exceptions"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(name='FUTSAL')
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        # Weekdays only
+        self.morning = CourtSession.objects.create(
+            court=self.court,
+            session_name='Morning',
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            days_mask=schedule.days_mask_from_names(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
+        )
+        
+        # Every day (default mask)
+        self.evening = CourtSession.objects.create(
+            court=self.court,
+            session_name='Evening',
+            start_time=time(18, 0),
+            end_time=time(19, 0)
+        )
+        
+        today = date.today()
+        self.next_monday = today + timedelta(days=7 - today.weekday())
+    
+    def test_days_mask_helpers(self):
+        """Test conversion between day names and masks"""
+        self.assertEqual(self.evening.days_mask, schedule.ALL_DAYS)
+        self.assertEqual(schedule.day_names_from_mask(0b1000001), ['Monday', 'Sunday'])
+        with self.assertRaises(ValueError):
+            schedule.days_mask_from_names(['Funday'])
+    
+    def test_expand_slots_applies_mask_and_exceptions(self):
+        """Test lazy expansion skips days outside the mask and blocked slots"""
+        from app.courts.models import CourtScheduleException
+        
+        tuesday = self.next_monday + timedelta(days=1)
+        exceptions = [
+            CourtScheduleException(court=self.court, date=self.next_monday),
+            CourtScheduleException(court=self.court, date=tuesday, start_time=time(17, 30), end_time=time(18, 30)),
+        ]
+        sessions = [self.morning, self.evening]
+        slots = schedule.expand_slots(sessions, self.next_monday, self.next_monday + timedelta(days=6), exceptions)
+        
+        by_day = {}
+        for slot in slots:
+            by_day.setdefault(slot.date.weekday(), []).append(slot.session.session_name)
+        
+        self.assertNotIn(0, by_day)  # Monday closed all day
+        self.assertEqual(by_day[1], ['Morning'])  # Tuesday evening overlaps maintenance
+        self.assertEqual(by_day[2], ['Morning', 'Evening'])
+        self.assertEqual(by_day[5], ['Evening'])  # No morning session on Saturday
+    
+    def test_availability_range(self):
+        """Test api_court_sessions expands the template over a date range"""
+        saturday = self.next_monday + timedelta(days=5)
+        response = self.client.get(f'/api/courts/{self.court.id}/sessions/', {
+            'date_from': (saturday - timedelta(days=1)).isoformat(),
+            'date_to': saturday.isoformat(),
+        })
+        days = response.json()['data']['days']
+        
+        self.assertEqual([len(day['sessions']) for day in days], [2, 1])
+        
+        response = self.client.get(f'/api/courts/{self.court.id}/sessions/', {'date': saturday.isoformat()})
+        self.assertEqual([s['session_name'] for s in response.json()['data']['sessions']], ['Evening'])
+    
+    def test_schedule_exception_api(self):
+        """Test mitra can add a maintenance exception that hides the slot"""
+        self.client.force_login(self.mitra)
+        wednesday = self.next_monday + timedelta(days=2)
+        
+        response = self.client.post(f'/api/courts/{self.court.id}/exceptions/', data={
+            'date': wednesday.isoformat(),
+            'start_time': '08:00',
+            'end_time': '09:00',
+            'reason': 'Perawatan lantai',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        
+        response = self.client.get(f'/api/courts/{self.court.id}/sessions/', {'date': wednesday.isoformat()})
+        self.assertEqual([s['session_name'] for s in response.json()['data']['sessions']], ['Evening'])
+
+    def test_post_session_merges_weekdays(self):
+        """Test posting an existing start time for another weekday extends its days mask"""
+        self.client.force_login(self.mitra)
+        url = f'/api/courts/{self.court.id}/sessions/'
+
+        response = self.client.post(url, data={
+            'start_time': '0800', 'end_time': '0900', 'day_of_week': 'Saturday'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['id'], self.morning.id)
+        self.assertEqual(data['days'], ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'])
+        self.assertEqual(data['session_name'], 'Monday, Tuesday, Wednesday, Thursday, Friday, Saturday 08:00')
+        self.assertEqual(CourtSession.objects.filter(court=self.court).count(), 2)
+
+        # A different end time cannot be merged into the existing row
+        response = self.client.post(url, data={
+            'start_time': '08:00', 'end_time': '10:00', 'day_of_week': 'Sunday'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.morning.refresh_from_db()
+        self.assertFalse(self.morning.days_mask & (1 << schedule.DAY_INDEX['Sunday']))
+
+        # Nothing left to add
+        response = self.client.post(url, data={
+            'start_time': '08:00', 'end_time': '09:00', 'days': ['Monday']
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_put_day_of_week_keeps_multi_day_template(self):
+        """Test a lone legacy day_of_week cannot shrink a Mon-Fri session to one day"""
+        self.client.force_login(self.mitra)
+        url = f'/api/courts/{self.court.id}/sessions/{self.morning.id}/'
+        weekdays = self.morning.days_mask
+
+        response = self.client.post(url, data={
+            '_method': 'PUT', 'day_of_week': 'Saturday'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        # One of its own days (a client resending the form) only changes the time
+        response = self.client.post(url, data={
+            '_method': 'PUT', 'day_of_week': 'Monday', 'end_time': '0930'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.morning.refresh_from_db()
+        self.assertEqual(self.morning.days_mask, weekdays)
+        self.assertEqual(self.morning.end_time, time(9, 30))
+        self.assertNotEqual(self.morning.session_name, 'Monday 08:00')
+
+        response = self.client.post(url, data={
+            '_method': 'PUT', 'days': ['Saturday', 'Sunday']
+        }, content_type='application/json')
+        self.assertEqual(response.json()['data']['session_name'], 'Saturday, Sunday 08:00')
+
+
+class CourtSyncTestCase(TestCase):
+    """Test cases for the bulk sync of court sessions and images"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.category = SportsCategory.objects.create(name='FUTSAL')
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved'
+        )
+        
+        self.court = Court.objects.create(
+            venue=self.venue,
+            name='Court 1',
+            category=self.category,
+            price_per_hour=100000
+        )
+        
+        self.keep = CourtSession.objects.create(
+            court=self.court, session_name='Morning', start_time=time(8, 0), end_time=time(9, 0)
+        )
+        self.drop = CourtSession.objects.create(
+            court=self.court, session_name='Noon', start_time=time(12, 0), end_time=time(13, 0)
+        )
+        
+        CourtImage.objects.create(court=self.court, image_url='https://example.com/old.jpg', is_primary=True)
+        CourtImage.objects.create(court=self.court, image_url='https://example.com/keep.jpg')
+        
+        self.client.force_login(self.mitra)
+    
+    def update_court(self, sessions, image_urls):
+        import json
+        return self.client.post(f'/api/courts/{self.court.id}/', {
+            'name': self.court.name,
+            'venue': str(self.venue.id),
+            'category': str(self.category.id),
+            'price_per_hour': '100000',
+            'is_active': 'true',
+            'sessions': json.dumps(sessions),
+            'image_urls': json.dumps(image_urls),
+        })
+    
+    def test_update_syncs_sessions_and_images(self):
+        """Test sessions and images are updated, created and deleted in one save"""
+        response = self.update_court(
+            sessions=[
+                {'id': self.keep.id, 'session_name': 'Early Morning', 'start_time': '07:00', 'end_time': '08:00'},
+                {'session_name': 'Evening', 'start_time': '18:00', 'end_time': '19:00', 'days': ['Saturday', 'Sunday']},
+            ],
+            image_urls=['https://example.com/keep.jpg', 'https://example.com/new.jpg'],
+        )
+        self.assertEqual(response.status_code, 200)
+        
+        sessions = {s.session_name: s for s in self.court.sessions.all()}
+        self.assertEqual(set(sessions), {'Early Morning', 'Evening'})
+        self.assertEqual(sessions['Early Morning'].id, self.keep.id)
+        self.assertEqual(sessions['Early Morning'].start_time, time(7, 0))
+        self.assertEqual(sessions['Evening'].days_mask, 0b1100000)
+        
+        images = {img.image_url: img.is_primary for img in self.court.images.all()}
+        self.assertEqual(images, {'https://example.com/keep.jpg': True, 'https://example.com/new.jpg': False})
+    
+    def test_query_count_does_not_grow_with_schedule_size(self):
+        """Test saving a large schedule costs the same number of queries as a small one"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        def schedule_payload(hours):
+            return [
+                {'session_name': f'Session {h}', 'start_time': f'{h:02d}:00', 'end_time': f'{h + 1:02d}:00'}
+                for h in hours
+            ]
+        
+        reference.sports_categories()  # Loaded once per worker, not per request
+        with CaptureQueriesContext(connection) as small:
+            self.update_court(schedule_payload(range(6, 8)), ['https://example.com/a.jpg'])
+        with CaptureQueriesContext(connection) as large:
+            self.update_court(
+                schedule_payload(range(6, 23)),
+                [f'https://example.com/{i}.jpg' for i in range(10)],
+            )
+        
+        self.assertEqual(self.court.sessions.count(), 17)
+        self.assertEqual(len(small), len(large))
@@ -9,6 +9,8 @@ urlpatterns = [
     path('<int:court_id>/', views.api_court_detail, name='api_court_detail'),
     path('<int:court_id>/sessions/', views.api_court_sessions, name='api_court_sessions'),
     path('<int:court_id>/sessions/<int:session_id>/', views.api_court_session_detail, name='api_court_session_detail'),
+    path('<int:court_id>/exceptions/', views.api_court_schedule_exceptions, name='api_court_schedule_exceptions'),
+    path('<int:court_id>/exceptions/<int:exception_id>/', views.api_delete_court_schedule_exception, name='api_delete_court_schedule_exception'),
 
     # Image Management
     path('court-images/<int:image_id>/delete/', views.api_delete_court_image, name='api_delete_court_image'),
@@ -3,14 +3,31 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.db.models import Count
+from django.core.exceptions import ValidationError
 import json
-from datetime import datetime, date
+from collections import Counter
+from datetime import datetime, date, timedelta
 
-from app.courts.models import Court, CourtSession, CourtImage
+from app.courts.models import Court, CourtSession, CourtImage, CourtScheduleException
+from app.courts import schedule
+from app.courts.sync import sync_court_images, sync_court_sessions
 from app.bookings.models import Booking
+from app.venues import reference
 from app.users.decorators import login_required, role_required
 from app.users.forms import CourtForm
 from app.revenue.models import ActivityLog
+from lapangin.fieldsets import parse_fieldset
+
+# Longest date range api_court_sessions expands in one request
+MAX_AVAILABILITY_DAYS = 31
+
+# Fields of the mitra court list; images is an optional relation
+COURT_FIELDS = (
+    'id', 'name', 'venue_id', 'venue_name', 'category', 'category_id', 'price_per_hour', 'is_active',
+    'maintenance_notes', 'description',
+)
+COURT_RELATIONS = ('images',)
 
 def get_client_ip(request):
     """Helper function to get client IP address"""
@@ -21,17 +38,18 @@ def get_client_ip(request):
         ip = request.META.get('REMOTE_ADDR')
     return ip
 
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def api_courts(request):
     """API endpoint for listing and creating courts"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
@@ -40,37 +58,49 @@ def api_courts(request):
     if request.method == 'GET':
         # List all courts for the mitra's venues
         venue_id = request.GET.get('venue_id')
+        try:
+            fieldset = parse_fieldset(request.GET, COURT_FIELDS, COURT_RELATIONS)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
         
         if venue_id:
-            courts = Court.objects.filter(venue__owner=request.user, venue__id=venue_id).select_related('venue', 'category')
+            courts = Court.objects.filter(venue__owner_id=request.principal.id, venue__id=venue_id)
         else:
-            courts = Court.objects.filter(venue__owner=request.user).select_related('venue', 'category')
+            courts = Court.objects.filter(venue__owner_id=request.principal.id)
+        # Join or prefetch only what the requested fields read
+        if fieldset.wants('venue_name'):
+            courts = courts.select_related('venue')
+        if fieldset.wants('category'):
+            courts = courts.select_related('category')
+        if fieldset.includes('images'):
+            courts = courts.prefetch_related('images')
         
         courts_data = []
         for court in courts:
             # Get court images
             images = []
-            for img in court.images.all():
-                images.append({
-                    'id': img.id,
-                    'url': img.image_url,
-                    'is_primary': img.is_primary,
-                    'caption': img.caption
-                })
+            if fieldset.includes('images'):
+                for img in court.images.all():
+                    images.append({
+                        'id': img.id,
+                        'url': img.image_url,
+                        'is_primary': img.is_primary,
+                        'caption': img.caption
+                    })
             
-            courts_data.append({
+            courts_data.append(fieldset.filter({
                 'id': court.id,
                 'name': court.name,
-                'venue_id': str(court.venue.id),
-                'venue_name': court.venue.name,
-                'category': court.category.get_name_display() if court.category else None,
-                'category_id': court.category.id if court.category else None,
+                'venue_id': str(court.venue_id),
+                'venue_name': court.venue.name if fieldset.wants('venue_name') else None,
+                'category': court.category.get_name_display() if fieldset.wants('category') and court.category else None,
+                'category_id': court.category_id,
                 'price_per_hour': str(court.price_per_hour),
                 'is_active': court.is_active,
                 'maintenance_notes': court.maintenance_notes,
                 'description': court.description,
                 'images': images
-            })
+            }))
         
         return JsonResponse({
             'success': True,
@@ -86,45 +116,27 @@ def api_courts(request):
             
             # If category is a string name (like 'FUTSAL'), find the ID
             if category_value and not category_value.isdigit():
-                from app.venues.models import SportsCategory
-                try:
-                    category_obj = SportsCategory.objects.get(name=category_value)
+                category_obj = reference.sports_category_by_name(category_value)
+                if category_obj is not None:  # Otherwise form validation reports it
                     post_data['category'] = str(category_obj.id)
-                except SportsCategory.DoesNotExist:
-                    pass  # Let form validation handle the error
             
             form = CourtForm(post_data, user=request.user)
             
             if form.is_valid():
                 court = form.save()
                 
-                # Handle image URLs (JSON array of URLs)
+                # Handle image URLs (JSON array of URLs, first image is primary)
                 image_urls_str = request.POST.get('image_urls', '[]')
                 try:
-                    image_urls = json.loads(image_urls_str)
-                    for idx, url in enumerate(image_urls):
-                        if url and url.strip():
-                            CourtImage.objects.create(
-                                court=court,
-                                image_url=url.strip(),
-                                is_primary=(idx == 0)  # First image is primary
-                            )
-                except (json.JSONDecodeError, ValueError):
+                    sync_court_images(court, json.loads(image_urls_str))
+                except (json.JSONDecodeError, ValueError, TypeError):
                     pass  # Continue without images if parsing fails
                 
                 # Handle session slots
                 sessions_json = request.POST.get('sessions', '[]')
                 try:
-                    sessions = json.loads(sessions_json)
-                    for session_data in sessions:
-                        CourtSession.objects.create(
-                            court=court,
-                            session_name=session_data.get('session_name', ''),
-                            start_time=session_data.get('start_time'),
-                            end_time=session_data.get('end_time'),
-                            is_active=session_data.get('is_active', True)
-                        )
-                except (json.JSONDecodeError, ValueError) as e:
+                    sync_court_sessions(court, json.loads(sessions_json))
+                except (json.JSONDecodeError, ValueError, TypeError, ValidationError):
                     # If session parsing fails, continue without sessions
                     pass
                 
@@ -166,20 +178,20 @@ def api_courts(request):
 @require_http_methods(["GET", "POST", "PUT", "DELETE"])
 def api_court_detail(request, court_id):
     """API endpoint for getting, updating, and deleting a specific court"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
         }, status=403)
     
     try:
-        court = Court.objects.get(id=court_id, venue__owner=request.user)
+        court = Court.objects.select_related('venue', 'category').get(id=court_id, venue__owner_id=request.principal.id)
     except Court.DoesNotExist:
         return JsonResponse({
             'success': False,
@@ -187,6 +199,24 @@ def api_court_detail(request, court_id):
         }, status=404)
     
     if request.method == 'GET':
+        # Optional booking window (YYYY-MM-DD, inclusive) for the per-session counts
+        try:
+            date_from = request.GET.get('date_from')
+            date_to = request.GET.get('date_to')
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Format tanggal tidak valid. Gunakan YYYY-MM-DD'
+            }, status=400)
+        
+        if date_from and date_to and date_from > date_to:
+            return JsonResponse({
+                'success': False,
+                'message': 'date_from tidak boleh setelah date_to'
+            }, status=400)
+        
         # Get court details
         # Get court images
         images = []
@@ -198,24 +228,49 @@ def api_court_detail(request, court_id):
                 'caption': img.caption
             })
         
+        # Count bookings (pending, confirmed or completed) of every session in one grouped query
+        bookings_qs = Booking.objects.filter(
+            court=court,
+            booking_status__in=['pending', 'confirmed', 'completed']
+        )
+        if date_from:
+            bookings_qs = bookings_qs.filter(booking_date__gte=date_from)
+        if date_to:
+            bookings_qs = bookings_qs.filter(booking_date__lte=date_to)
+        booking_counts = dict(
+            bookings_qs.order_by().values('session').annotate(total=Count('id')).values_list('session', 'total')
+        )
+        
+        # Utilisation is the share of the session's bookable days in the window
+        # (weekdays in its days_mask not closed by a schedule exception) that were booked
+        window_days = (date_to - date_from).days + 1 if date_from and date_to else None
+        court_sessions = list(court.sessions.all())
+        bookable_days = Counter()
+        if window_days:
+            exceptions = CourtScheduleException.objects.filter(
+                court=court, date__gte=date_from, date__lte=date_to
+            )
+            for slot in schedule.expand_slots(court_sessions, date_from, date_to, exceptions):
+                bookable_days[slot.session.id] += 1
+        
         # Get court sessions
         sessions = []
-        for session in court.sessions.all():
-            # Count total bookings for this session (pending or confirmed)
-            total_bookings = Booking.objects.filter(
-                court=court,
-                session=session,
-                booking_status__in=['pending', 'confirmed','completed']
-            ).count()
-            
-            sessions.append({
+        for session in court_sessions:
+            total_bookings = booking_counts.get(session.id, 0)
+            session_data = {
                 'id': session.id,
                 'session_name': session.session_name,
                 'start_time': session.start_time.strftime('%H:%M'),
                 'end_time': session.end_time.strftime('%H:%M'),
                 'is_active': session.is_active,
+                'days_mask': session.days_mask,
                 'total_bookings': total_bookings
-            })
+            }
+            if window_days:
+                session_days = bookable_days[session.id]
+                session_data['bookable_days'] = session_days
+                session_data['utilization'] = round(total_bookings / session_days, 4) if session_days else 0.0
+            sessions.append(session_data)
         
         court_data = {
             'id': court.id,
@@ -230,7 +285,12 @@ def api_court_detail(request, court_id):
             'maintenance_notes': court.maintenance_notes,
             'description': court.description,
             'images': images,
-            'sessions': sessions
+            'sessions': sessions,
+            'booking_window': {
+                'date_from': date_from.isoformat() if date_from else None,
+                'date_to': date_to.isoformat() if date_to else None,
+                'days': window_days
+            }
         }
         
         return JsonResponse({
@@ -247,83 +307,31 @@ def api_court_detail(request, court_id):
             
             # If category is a string name (like 'FUTSAL'), find the ID
             if category_value and not category_value.isdigit():
-                from app.venues.models import SportsCategory
-                try:
-                    category_obj = SportsCategory.objects.get(name=category_value)
+                category_obj = reference.sports_category_by_name(category_value)
+                if category_obj is not None:  # Otherwise form validation reports it
                     post_data['category'] = str(category_obj.id)
-                except SportsCategory.DoesNotExist:
-                    pass  # Let form validation handle the error
             
             form = CourtForm(post_data, instance=court, user=request.user)
             
             if form.is_valid():
                 court = form.save()
                 
-                # Handle image URLs update
-                # Delete images not in the submitted list, add new ones
+                # Handle image URLs update: one diff against the current images
                 image_urls_str = request.POST.get('image_urls', '')
                 if image_urls_str:
                     try:
-                        image_urls = json.loads(image_urls_str)
-                        
-                        # Clean and normalize submitted URLs
-                        submitted_urls = [url.strip() for url in image_urls if url and url.strip()]
-                        
-                        # Delete images that are not in the submitted list
-                        court.images.exclude(image_url__in=submitted_urls).delete()
-                        
-                        # Get current image URLs after deletion
-                        existing_urls = set(court.images.values_list('image_url', flat=True))
-                        
-                        # Add new images that don't exist yet
-                        for idx, url in enumerate(submitted_urls):
-                            if url not in existing_urls:
-                                is_primary = (idx == 0 and not court.images.filter(is_primary=True).exists())
-                                CourtImage.objects.create(
-                                    court=court,
-                                    image_url=url,
-                                    is_primary=is_primary
-                                )
-                    except (json.JSONDecodeError, ValueError):
+                        sync_court_images(court, json.loads(image_urls_str))
+                    except (json.JSONDecodeError, ValueError, TypeError):
                         pass  # Continue without images if parsing fails
                 
-                # Handle session slots update
-                sessions_json = request.POST.get('sessions', '[]')
-                try:
-                    sessions = json.loads(sessions_json)
-                    
-                    # Get existing session IDs from the form data
-                    existing_session_ids = [s.get('id') for s in sessions if s.get('id')]
-                    
-                    # Delete sessions that are not in the updated list
-                    court.sessions.exclude(id__in=existing_session_ids).delete()
-                    
-                    # Create or update sessions
-                    for session_data in sessions:
-                        session_id = session_data.get('id')
-                        if session_id:
-                            # Update existing session
-                            try:
-                                session = CourtSession.objects.get(id=session_id, court=court)
-                                session.session_name = session_data.get('session_name', '')
-                                session.start_time = session_data.get('start_time')
-                                session.end_time = session_data.get('end_time')
-                                session.is_active = session_data.get('is_active', True)
-                                session.save()
-                            except CourtSession.DoesNotExist:
-                                pass
-                        else:
-                            # Create new session
-                            CourtSession.objects.create(
-                                court=court,
-                                session_name=session_data.get('session_name', ''),
-                                start_time=session_data.get('start_time'),
-                                end_time=session_data.get('end_time'),
-                                is_active=session_data.get('is_active', True)
-                            )
-                except (json.JSONDecodeError, ValueError) as e:
-                    # If session parsing fails, continue without updating sessions
-                    pass
+                # Handle session slots update: sessions with an id are updated,
+                # new ones created and the ones left out of the list deleted
+                if 'sessions' in request.POST:
+                    try:
+                        sync_court_sessions(court, json.loads(request.POST['sessions']))
+                    except (json.JSONDecodeError, ValueError, TypeError, ValidationError):
+                        # If session parsing fails, continue without updating sessions
+                        pass
                 
                 # Log the activity
                 ActivityLog.objects.create(
@@ -390,20 +398,20 @@ def api_court_sessions(request, court_id):
     
     # Handle POST - Create new session
     if request.method == 'POST':
-        if not request.user.is_authenticated:
+        if not request.principal.is_authenticated:
             return JsonResponse({
                 'success': False,
                 'message': 'Authentication required'
             }, status=401)
         
-        if request.user.role != 'mitra':
+        if request.principal.role != 'mitra':
             return JsonResponse({
                 'success': False,
                 'message': 'Access denied. Mitra role required.'
             }, status=403)
         
         try:
-            court = Court.objects.get(id=court_id, venue__owner=request.user)
+            court = Court.objects.get(id=court_id, venue__owner_id=request.principal.id)
             
             # Parse JSON data
             data = json.loads(request.body)
@@ -417,6 +425,8 @@ def api_court_sessions(request, court_id):
             start_time = format_time(data.get('start_time', ''))
             end_time = format_time(data.get('end_time', ''))
             day_of_week = data.get('day_of_week', '')
+            requested_mask = schedule.parse_days_mask(data)
+            days_mask = requested_mask if requested_mask is not None else schedule.ALL_DAYS
             
             # Check if session already exists
             existing_session = CourtSession.objects.filter(
@@ -425,22 +435,38 @@ def api_court_sessions(request, court_id):
             ).first()
             
             if existing_session:
-                return JsonResponse({
-                    'success': False,
-                    'message': f'Jadwal dengan jam mulai {start_time} sudah ada untuk lapangan ini'
-                }, status=400)
-            
-            # Generate session name from day and time
-            session_name = f"{day_of_week} {start_time}"
-            
-            # Create new session
-            session = CourtSession.objects.create(
-                court=court,
-                session_name=session_name,
-                start_time=start_time,
-                end_time=end_time,
-                is_active=True
-            )
+                # A slot posted for other weekdays joins the existing template row
+                if requested_mask is None or existing_session.days_mask | requested_mask == existing_session.days_mask:
+                    return JsonResponse({
+                        'success': False,
+                        'message': f'Jadwal dengan jam mulai {start_time} sudah ada untuk lapangan ini'
+                    }, status=400)
+                existing_end = existing_session.end_time.strftime('%H:%M')
+                if end_time and end_time[:5] != existing_end:
+                    return JsonResponse({
+                        'success': False,
+                        'message': f'Jadwal jam {start_time} sudah ada dengan jam selesai {existing_end}; '
+                                   f'ubah jadwal tersebut untuk mengganti jam selesai'
+                    }, status=400)
+                session = existing_session
+                session.days_mask |= requested_mask
+                session.session_name = schedule.session_name_for(session.days_mask, start_time[:5])
+                session.save(update_fields=['days_mask', 'session_name'])
+                message = 'Jadwal berhasil diperbarui'
+            else:
+                # Generate session name from day and time
+                session_name = f"{day_of_week} {start_time}"
+                
+                # Create new session
+                session = CourtSession.objects.create(
+                    court=court,
+                    session_name=session_name,
+                    start_time=start_time,
+                    end_time=end_time,
+                    is_active=True,
+                    days_mask=days_mask
+                )
+                message = 'Jadwal berhasil ditambahkan'
             
             # Update court price if provided
             if data.get('price'):
@@ -449,12 +475,14 @@ def api_court_sessions(request, court_id):
             
             return JsonResponse({
                 'success': True,
-                'message': 'Jadwal berhasil ditambahkan',
+                'message': message,
                 'data': {
                     'id': session.id,
                     'session_name': session.session_name,
                     'start_time': str(session.start_time) if hasattr(session.start_time, 'strftime') else session.start_time,
                     'end_time': str(session.end_time) if hasattr(session.end_time, 'strftime') else session.end_time,
+                    'days_mask': session.days_mask,
+                    'days': schedule.day_names_from_mask(session.days_mask),
                     'price': str(court.price_per_hour)
                 }
             })
@@ -475,13 +503,15 @@ def api_court_sessions(request, court_id):
     
     # Handle GET - List sessions
     try:
-        court = Court.objects.get(id=court_id)
+        court = Court.objects.select_related('venue').get(id=court_id)
         
         # Get date parameter (optional - for mitra management view)
         booking_date = request.GET.get('date')  # Format: YYYY-MM-DD
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
         
         # If no date provided, return simple list of sessions (for mitra management)
-        if not booking_date:
+        if not booking_date and not date_from:
             sessions = CourtSession.objects.filter(
                 court=court,
                 is_active=True
@@ -489,19 +519,17 @@ def api_court_sessions(request, court_id):
             
             sessions_data = []
             for session in sessions:
-                # Extract day_of_week from session_name (format: "Monday 08:00")
-                day_of_week = 'Monday'  # Default
-                if session.session_name and ' ' in session.session_name:
-                    day_of_week = session.session_name.split(' ')[0]
-                
+                days = schedule.day_names_from_mask(session.days_mask)
                 sessions_data.append({
                     'id': session.id,
                     'session_name': session.session_name,
-                    'day_of_week': day_of_week,
+                    'day_of_week': days[0] if days else None,
+                    'days': days,
+                    'days_mask': session.days_mask,
                     'start_time': str(session.start_time)[:5],  # HH:MM format
                     'end_time': str(session.end_time)[:5],
                     'is_active': session.is_active,
-                    'price': str(session.court.price_per_hour),  # Include court price
+                    'price': str(court.price_per_hour),  # Include court price
                 })
             
             return JsonResponse({
@@ -511,106 +539,115 @@ def api_court_sessions(request, court_id):
         
         # If date provided, check availability (for booking)
         
-        # Parse and validate date
+        # Parse and validate date (or date range)
         try:
-            date_obj = datetime.strptime(booking_date, '%Y-%m-%d').date()
-            
-            # Don't allow past dates (except today)
-            if date_obj < date.today():
-                return JsonResponse({
-                    'success': False,
-                    'message': 'Cannot check availability for past dates'
-                }, status=400)
+            if booking_date:
+                range_start = range_end = datetime.strptime(booking_date, '%Y-%m-%d').date()
+            else:
+                range_start = datetime.strptime(date_from, '%Y-%m-%d').date()
+                range_end = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else range_start
         except ValueError:
             return JsonResponse({
                 'success': False,
                 'message': 'Invalid date format. Use YYYY-MM-DD'
             }, status=400)
         
-        # Get all active sessions for this court
+        # Don't allow past dates (except today)
+        if range_start < date.today():
+            return JsonResponse({
+                'success': False,
+                'message': 'Cannot check availability for past dates'
+            }, status=400)
+        if range_end < range_start or (range_end - range_start).days >= MAX_AVAILABILITY_DAYS:
+            return JsonResponse({
+                'success': False,
+                'message': f'date_to must be within {MAX_AVAILABILITY_DAYS} days after date_from'
+            }, status=400)
+        
+        # One query each for the weekly template, the exceptions and the bookings in the range
         sessions_qs = CourtSession.objects.filter(
             court=court,
             is_active=True
         ).order_by('start_time')
-
-        target_day = date_obj.strftime('%A')  # e.g. Monday
+        exceptions = CourtScheduleException.objects.filter(
+            court=court,
+            date__range=(range_start, range_end)
+        )
+        bookings = Booking.objects.filter(
+            court=court,
+            booking_date__range=(range_start, range_end),
+            booking_status__in=['pending', 'confirmed']
+        ).select_related('user')
+        booked = {(booking.booking_date, booking.session_id): booking for booking in bookings}
+        
         today = timezone.localdate()
         now_time = timezone.localtime(timezone.now()).time()
-
-        def extract_day_of_week(session_name):
-            if not session_name:
-                return None
-            parts = session_name.split(' ')
-            return parts[0] if parts else None
-
-        valid_days = {
-            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
-        }
-
-        sessions = []
-        for s in sessions_qs:
-            session_day = extract_day_of_week(getattr(s, 'session_name', None))
-
-            # If session_name encodes a weekday (e.g. "Monday 08:00"), filter by requested date's weekday.
-            # Otherwise, assume the session applies to any day.
-            if session_day in valid_days and session_day != target_day:
-                continue
-
+        
+        days_data = {}
+        for slot in schedule.expand_slots(sessions_qs, range_start, range_end, exceptions):
+            session = slot.session
+            
             # If checking availability for today, only include sessions strictly after the current time.
-            if date_obj == today and s.start_time <= now_time:
+            if slot.date == today and session.start_time <= now_time:
                 continue
-
-            sessions.append(s)
-        
-        sessions_data = []
-        for session in sessions:
-            # Calculate session duration in minutes
-            start_time = session.start_time
-            end_time = session.end_time
             
-            # Calculate duration
-            start_datetime = datetime.combine(date_obj, start_time)
-            end_datetime = datetime.combine(date_obj, end_time)
+            # Calculate session duration in minutes
+            start_datetime = datetime.combine(slot.date, session.start_time)
+            end_datetime = datetime.combine(slot.date, session.end_time)
             duration_minutes = int((end_datetime - start_datetime).total_seconds() / 60)
             
             # Check if this session is booked on the specified date
-            booking = Booking.objects.filter(
-                court=court,
-                session=session,
-                booking_date=date_obj,
-                booking_status__in=['pending', 'confirmed']
-            ).first()
-            
-            is_available = not bool(booking)
+            booking = booked.get((slot.date, session.id))
             
-            session_info = {
+            days_data.setdefault(slot.date, []).append({
                 'id': session.id,
                 'session_name': session.session_name,
                 'start_time': session.start_time.strftime('%H:%M'),
                 'end_time': session.end_time.strftime('%H:%M'),
                 'duration': duration_minutes,
                 'is_active': session.is_active,
-                'is_available': is_available,
+                'is_available': not booking,
                 'is_booked': bool(booking),
                 'booking_id': str(booking.id) if booking else None,
                 'booking_user': booking.user.get_full_name() if booking else None
-            }
-            
-            sessions_data.append(session_info)
+            })
+        
+        court_info = {
+            'court_id': court.id,
+            'court_name': court.name,
+            'venue_name': court.venue.name,
+            'venue_id': str(court.venue.id),
+            'price_per_hour': float(court.price_per_hour),
+        }
+        
+        if booking_date:
+            sessions_data = days_data.get(range_start, [])
+            return JsonResponse({
+                'success': True,
+                'status': 'ok',
+                'data': {
+                    **court_info,
+                    'sessions': sessions_data,
+                    'date': booking_date,
+                    'total_sessions': len(sessions_data),
+                    'available_sessions': len([s for s in sessions_data if s['is_available']])
+                }
+            })
         
         return JsonResponse({
             'success': True,
             'status': 'ok',
             'data': {
-                'court_id': court.id,
-                'court_name': court.name,
-                'venue_name': court.venue.name,
-                'venue_id': str(court.venue.id),
-                'price_per_hour': float(court.price_per_hour),
-                'sessions': sessions_data,
-                'date': booking_date,
-                'total_sessions': len(sessions_data),
-                'available_sessions': len([s for s in sessions_data if s['is_available']])
+                **court_info,
+                'date_from': range_start.isoformat(),
+                'date_to': range_end.isoformat(),
+                'days': [
+                    {
+                        'date': (range_start + timedelta(days=offset)).isoformat(),
+                        'sessions': days_data.get(range_start + timedelta(days=offset), []),
+                    }
+                    for offset in range((range_end - range_start).days + 1)
+                ]
             }
         })
         
@@ -632,13 +669,13 @@ def api_court_sessions(request, court_id):
 def api_court_session_detail(request, court_id, session_id):
     """API endpoint for updating or deleting a specific court session"""
     
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
@@ -655,7 +692,7 @@ def api_court_session_detail(request, court_id, session_id):
                 session = CourtSession.objects.get(
                     id=session_id,
                     court_id=court_id,
-                    court__venue__owner=request.user
+                    court__venue__owner_id=request.principal.id
                 )
                 session.delete()
                 
@@ -669,7 +706,7 @@ def api_court_session_detail(request, court_id, session_id):
                 session = CourtSession.objects.get(
                     id=session_id,
                     court_id=court_id,
-                    court__venue__owner=request.user
+                    court__venue__owner_id=request.principal.id
                 )
                 
                 # Convert time format if needed
@@ -684,14 +721,31 @@ def api_court_session_detail(request, court_id, session_id):
                 start_time = format_time(data.get('start_time'))
                 end_time = format_time(data.get('end_time'))
                 day_of_week = data.get('day_of_week')
+                days_mask = schedule.parse_days_mask(data)
+                legacy_day_only = data.get('days_mask') in (None, '') and not data.get('days')
+                single_day = session.days_mask & (session.days_mask - 1) == 0
+                if legacy_day_only and days_mask is not None and not single_day:
+                    # A lone day_of_week must not shrink a multi-day template to one day
+                    if days_mask & session.days_mask:
+                        days_mask = None  # Already one of its days, nothing to change
+                    else:
+                        return JsonResponse({
+                            'success': False,
+                            'message': 'Jadwal ini berlaku di beberapa hari; gunakan days atau days_mask untuk mengubah harinya'
+                        }, status=400)
                 
                 if start_time:
                     session.start_time = start_time
                 if end_time:
                     session.end_time = end_time
-                if day_of_week:
-                    # Update session name with new day and time
+                if days_mask is not None:
+                    session.days_mask = days_mask
+                if start_time or days_mask is not None:
+                    # Update session name with the new days and time
                     current_time = start_time if start_time else str(session.start_time)[:5]
+                    session.session_name = schedule.session_name_for(session.days_mask, current_time)
+                elif day_of_week and single_day:
+                    current_time = str(session.start_time)[:5]
                     session.session_name = f"{day_of_week} {current_time}"
                 
                 session.save()
@@ -717,6 +771,8 @@ def api_court_session_detail(request, court_id, session_id):
                         'session_name': session.session_name,
                         'start_time': str(session.start_time)[:5],
                         'end_time': str(session.end_time)[:5],
+                        'days_mask': session.days_mask,
+                        'days': schedule.day_names_from_mask(session.days_mask),
                         'price': str(session.court.price_per_hour),
                     }
                 })
@@ -749,20 +805,20 @@ def api_court_session_detail(request, court_id, session_id):
 @require_http_methods(["DELETE"])
 def api_delete_court_image(request, image_id):
     """API endpoint for deleting a court image"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
         }, status=403)
     
     try:
-        image = CourtImage.objects.get(id=image_id, court__venue__owner=request.user)
+        image = CourtImage.objects.get(id=image_id, court__venue__owner_id=request.principal.id)
         image.delete()
         
         return JsonResponse({
@@ -779,3 +835,123 @@ def api_delete_court_image(request, image_id):
             'success': False,
             'message': f'Terjadi kesalahan: {str(e)}'
         }, status=500)
+
+
+def serialize_schedule_exception(exception):
+    return {
+        'id': exception.id,
+        'date': exception.date.isoformat(),
+        'start_time': exception.start_time.strftime('%H:%M') if exception.start_time else None,
+        'end_time': exception.end_time.strftime('%H:%M') if exception.end_time else None,
+        'reason': exception.reason,
+    }
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def api_court_schedule_exceptions(request, court_id):
+    """API endpoint for listing and adding schedule exceptions (holidays, maintenance) of a court"""
+    if not request.principal.is_authenticated:
+        return JsonResponse({
+            'success': False,
+            'message': 'Authentication required'
+        }, status=401)
+    
+    if request.principal.role != 'mitra':
+        return JsonResponse({
+            'success': False,
+            'message': 'Access denied. Mitra role required.'
+        }, status=403)
+    
+    try:
+        court = Court.objects.get(id=court_id, venue__owner_id=request.principal.id)
+    except Court.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'message': 'Lapangan tidak ditemukan'
+        }, status=404)
+    
+    if request.method == 'GET':
+        exceptions = court.schedule_exceptions.all()
+        if request.GET.get('upcoming', 'true') == 'true':
+            exceptions = exceptions.filter(date__gte=date.today())
+        
+        return JsonResponse({
+            'success': True,
+            'data': [serialize_schedule_exception(e) for e in exceptions]
+        })
+    
+    try:
+        data = json.loads(request.body)
+        exception_date = datetime.strptime(data.get('date', ''), '%Y-%m-%d').date()
+        start_time = data.get('start_time') or None
+        end_time = data.get('end_time') or None
+        start_time = datetime.strptime(start_time, '%H:%M').time() if start_time else None
+        end_time = datetime.strptime(end_time, '%H:%M').time() if end_time else None
+    except (json.JSONDecodeError, ValueError):
+        return JsonResponse({
+            'success': False,
+            'message': 'Data tidak valid. Gunakan tanggal YYYY-MM-DD dan jam HH:MM'
+        }, status=400)
+    
+    if (start_time is None) != (end_time is None) or (start_time and start_time >= end_time):
+        return JsonResponse({
+            'success': False,
+            'message': 'Isi jam mulai dan jam selesai, atau kosongkan keduanya untuk menutup seharian'
+        }, status=400)
+    
+    exception = CourtScheduleException.objects.create(
+        court=court,
+        date=exception_date,
+        start_time=start_time,
+        end_time=end_time,
+        reason=data.get('reason', '')
+    )
+    
+    # Log the activity
+    ActivityLog.objects.create(
+        user=request.user,
+        action_type='update',
+        description=f'Added schedule exception on {exception_date} for court: {court.name} at {court.venue.name}',
+        ip_address=get_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')
+    )
+    
+    return JsonResponse({
+        'success': True,
+        'message': 'Pengecualian jadwal berhasil ditambahkan',
+        'data': serialize_schedule_exception(exception)
+    }, status=201)
+
+
+@csrf_exempt
+@require_http_methods(["DELETE"])
+def api_delete_court_schedule_exception(request, court_id, exception_id):
+    """API endpoint for deleting a schedule exception"""
+    if not request.principal.is_authenticated:
+        return JsonResponse({
+            'success': False,
+            'message': 'Authentication required'
+        }, status=401)
+    
+    if request.principal.role != 'mitra':
+        return JsonResponse({
+            'success': False,
+            'message': 'Access denied. Mitra role required.'
+        }, status=403)
+    
+    deleted, _ = CourtScheduleException.objects.filter(
+        id=exception_id,
+        court_id=court_id,
+        court__venue__owner_id=request.principal.id
+    ).delete()
+    if not deleted:
+        return JsonResponse({
+            'success': False,
+            'message': 'Pengecualian jadwal tidak ditemukan'
+        }, status=404)
+    
+    return JsonResponse({
+        'success': True,
+        'message': 'Pengecualian jadwal berhasil dihapus'
+    })
@@ -0,0 +1,100 @@
+import json
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+VARIANTS = ('.gz', '.br', '.webp')
+
+
+def human_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+
+def file_report(root, hashed):
+    """Sizes of a collected file and of its precompressed/WebP variants"""
+    path = os.path.join(root, hashed)
+    if not os.path.exists(path):
+        return None
+    sizes = {'original': os.path.getsize(path)}
+    for suffix in VARIANTS:
+        variant = path + suffix
+        if os.path.exists(variant):
+            sizes[suffix] = os.path.getsize(variant)
+    # Bytes a client that supports every encoding actually downloads
+    sizes['served'] = min(sizes.values())
+    return sizes
+
+
+class Command(BaseCommand):
+    help = 'Report the byte savings of the fingerprinted, precompressed static build (run collectstatic first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help='List the N files with the largest savings')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        root = str(settings.STATIC_ROOT)
+        manifest_path = os.path.join(root, 'staticfiles.json')
+        if not os.path.exists(manifest_path):
+            raise CommandError(
+                f'No manifest at {manifest_path}. Run collectstatic with PRODUCTION=True '
+                '(the fingerprinting storage) first.'
+            )
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            paths = json.load(manifest_file).get('paths', {})
+
+        groups = defaultdict(lambda: defaultdict(int))
+        files = []
+        for original, hashed in paths.items():
+            sizes = file_report(root, hashed)
+            if sizes is None:
+                continue
+            group = groups[original.split('/', 1)[0] if '/' in original else '.']
+            group['files'] += 1
+            group['original'] += sizes['original']
+            group['served'] += sizes['served']
+            for suffix in VARIANTS:
+                if suffix in sizes:
+                    group[suffix] += 1
+            files.append((original, sizes))
+
+        totals = defaultdict(int)
+        for group in groups.values():
+            for key, value in group.items():
+                totals[key] += value
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'groups': {name: dict(group) for name, group in sorted(groups.items())},
+                'total': dict(totals),
+            }, indent=2))
+            return
+
+        header = f'{"group":<12} {"files":>6} {"gzip":>5} {"br":>5} {"webp":>5} {"original":>10} {"served":>10} {"saved":>7}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, group in sorted(groups.items()) + [('TOTAL', totals)]:
+            saved = 1 - group['served'] / group['original'] if group['original'] else 0
+            self.stdout.write(
+                f'{name:<12} {group["files"]:>6} {group[".gz"]:>5} {group[".br"]:>5} {group[".webp"]:>5} '
+                f'{human_bytes(group["original"]):>10} {human_bytes(group["served"]):>10} {saved:>7.1%}'
+            )
+
+        if options['top'] > 0 and files:
+            self.stdout.write('')
+            self.stdout.write(f'Largest savings (top {options["top"]}):')
+            files.sort(key=lambda item: item[1]['original'] - item[1]['served'], reverse=True)
+            for original, sizes in files[:options['top']]:
+                saved = sizes['original'] - sizes['served']
+                if saved <= 0:
+                    break
+                self.stdout.write(
+                    f'  {original}: {human_bytes(sizes["original"])} -> {human_bytes(sizes["served"])} '
+                    f'(-{human_bytes(saved)})'
+                )
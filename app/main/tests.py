@@ -182,6 +182,88 @@ class MainViewsTestCase(TestCase):
         response = self.client.get(reverse('main:venue_detail', args=[fake_id]))
         self.assertEqual(response.status_code, 404)
     
+    def test_venue_detail_availability_for_date(self):
+        """Test the date parameter renders occupancy of that day"""
+        from datetime import timedelta
+        booked_day = date.today() + timedelta(days=7)
+        Booking.objects.create(
+            user=self.user,
+            court=self.court,
+            session=self.session,
+            booking_date=booked_day,
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+            duration_hours=2,
+            total_price=200000,
+            booking_status='confirmed'
+        )
+        url = reverse('main:venue_detail', args=[self.venue.id])
+        
+        def availability(day):
+            response = self.client.get(url, {'date': day})
+            return response.context['selected_date'], response.context['courts'][0]['sessions'][0]['is_available']
+        
+        self.assertEqual(availability(booked_day.isoformat()), (booked_day.isoformat(), False))
+        next_day = booked_day + timedelta(days=1)
+        self.assertEqual(availability(next_day.isoformat()), (next_day.isoformat(), True))
+        
+        # Malformed and past dates fall back to today
+        for value in ['not-a-date', (date.today() - timedelta(days=3)).isoformat()]:
+            response = self.client.get(url, {'date': value})
+            self.assertEqual(response.context['selected_date'], date.today().isoformat())
+    
+    def test_venue_detail_fragments_cached_until_venue_changes(self):
+        """Test static venue fragments are served from cache and expire on venue edits"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse('main:venue_detail', args=[self.venue.id])
+        
+        def render():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            return response.content.decode(), len(queries)
+        
+        _, cold_queries = render()
+        content, warm_queries = render()
+        self.assertLess(warm_queries, cold_queries)
+        self.assertIn('Parking', content)
+        
+        self.venue.description = 'Freshly renovated'
+        self.venue.save()
+        content, _ = render()
+        self.assertIn('Freshly renovated', content)
+        
+        VenueImage.objects.create(venue=self.venue, image_url='https://example.com/new-gallery.jpg')
+        content, _ = render()
+        self.assertIn('new-gallery.jpg', content)
+        
+        self.facility.name = 'Covered Parking'
+        self.facility.save()
+        content, _ = render()
+        self.assertIn('Covered Parking', content)
+    
+    def test_venue_detail_query_count_independent_of_courts(self):
+        """Test occupancy of all courts and sessions costs a fixed number of queries"""
+        from datetime import timedelta
+        from django.core.cache import cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse('main:venue_detail', args=[self.venue.id])
+        day = (date.today() + timedelta(days=1)).isoformat()
+        
+        def count_queries():
+            cache.clear()  # Measure cold renders, not cached fragments
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url, {'date': day})
+            return len(queries)
+        
+        few = count_queries()
+        for i in range(2, 5):
+            court = Court.objects.create(venue=self.venue, name=f'Court {i}', category=self.category, price_per_hour=100000)
+            for hour in (8, 10, 12):
+                CourtSession.objects.create(court=court, session_name=f'{hour}:00', start_time=time(hour, 0), end_time=time(hour + 2, 0))
+        self.assertEqual(count_queries(), few)
+    
     def test_login_view_unauthenticated(self):
         """Test login page for unauthenticated users"""
         response = self.client.get(reverse('main:login'))
@@ -324,4 +406,146 @@ class MainViewsTestCase(TestCase):
         venue_names = [v['name'] for v in venues_json]
         self.assertIn('Test Venue', venue_names)
         self.assertNotIn('Pending Venue', venue_names)
+    
+    def test_venue_list_matches_api_with_constant_queries(self):
+        """Test the server-rendered list reuses the API payload and its query cost does not grow with venues"""
+        import json
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        def render_list():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('main:venue_list'))
+            return json.loads(response.context['venues_json']), len(queries)
+        
+        _, few_queries = render_list()
+        for i in range(5):
+            venue = Venue.objects.create(
+                name=f'Extra Venue {i}', owner=self.mitra, address='Extra Address',
+                number_of_courts=1, verification_status='approved'
+            )
+            VenueImage.objects.create(venue=venue, image_url=f'https://example.com/{i}.jpg')
+            Court.objects.create(venue=venue, name='Court 1', category=self.category, price_per_hour=100000)
+        venues, many_queries = render_list()
+        
+        self.assertEqual(few_queries, many_queries)
+        api_data = self.client.get('/api/public/venues/').json()['data']
+        self.assertEqual(venues, api_data)
 
+
+
+class MetricsEndpointTestCase(TestCase):
+    """Test cases for the /metrics endpoint and the metrics registry"""
+    
+    def setUp(self):
+        from lapangin import metrics
+        self.metrics = metrics
+        metrics.registry.reset()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='metricsuser',
+            password='testpass123',
+            role='user'
+        )
+    
+    def test_metrics_endpoint_exposes_request_latency(self):
+        """Test request latency is recorded per URL name"""
+        self.client.get(reverse('main:about'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE lapangin_http_request_duration_seconds histogram', body)
+        self.assertIn('lapangin_http_request_duration_seconds_count{view="main:about",method="GET"} 1', body)
+        self.assertIn('lapangin_http_requests_total{view="main:about",method="GET",status="200"} 1', body)
+    
+    def test_activity_log_writes_are_counted(self):
+        """Test ActivityLog inserts increment the write counter"""
+        from app.revenue.models import ActivityLog
+        ActivityLog.objects.create(user=self.user, action_type='login', description='Logged in')
+        self.assertEqual(self.metrics.ACTIVITY_LOG_WRITES.value(action_type='login'), 1)
+    
+    def test_metrics_token_required_when_configured(self):
+        """Test scrapes are rejected without the configured bearer token"""
+        with self.settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, 200)
+    
+    def test_multiprocess_snapshots_are_aggregated(self):
+        """Test /metrics sums the snapshots written by other workers"""
+        import json
+        import os
+        import tempfile
+        
+        with tempfile.TemporaryDirectory() as directory:
+            worker_snapshot = {
+                'lapangin_bookings_created_total': {'[]': 3},
+                'lapangin_proxy_image_upstream_seconds': {
+                    '[]': {'buckets': [1] + [0] * 10, 'sum': 0.004, 'count': 1},
+                },
+            }
+            with open(os.path.join(directory, 'metrics-99999.json'), 'w') as fh:
+                json.dump(worker_snapshot, fh)
+            
+            with self.settings(METRICS_MULTIPROC_DIR=directory):
+                self.metrics.BOOKINGS_CREATED.inc(2)
+                body = self.metrics.registry.render()
+        
+        self.assertIn('lapangin_bookings_created_total 5', body)
+        self.assertIn('lapangin_proxy_image_upstream_seconds_bucket{le="0.005"} 1', body)
+        self.assertIn('lapangin_proxy_image_upstream_seconds_count 1', body)
+
+
+class StaticAssetsTestCase(TestCase):
+    """Test cases for the production static storage helpers and report"""
+    
+    def test_proxy_image_serves_local_static_file(self):
+        """Test proxy_image still streams local static files without the manifest storage"""
+        response = Client().get(reverse('main:proxy_image'), {'url': '/static/img/logo/Lapangan Logo.png'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Allow-Origin'], '*')
+    
+    def test_transcode_webp_writes_smaller_copy(self):
+        """Test a photo gets a .webp sibling only when it is smaller"""
+        import os
+        import tempfile
+        from PIL import Image
+        from lapangin.storage import transcode_webp
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'photo.png')
+            Image.linear_gradient('L').resize((256, 256)).convert('RGB').save(path)
+            target = transcode_webp(path, quality=70)
+            self.assertEqual(target, path + '.webp')
+            self.assertLess(os.path.getsize(target), os.path.getsize(path))
+    
+    def test_static_report_sums_variants(self):
+        """Test static_report counts precompressed variants from the manifest"""
+        import io
+        import json
+        import os
+        import tempfile
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'css'))
+            with open(os.path.join(directory, 'css', 'site.abc123.css'), 'wb') as fh:
+                fh.write(b'x' * 1000)
+            with open(os.path.join(directory, 'css', 'site.abc123.css.gz'), 'wb') as fh:
+                fh.write(b'x' * 200)
+            
+            with self.settings(STATIC_ROOT=directory):
+                with self.assertRaises(CommandError):
+                    call_command('static_report')
+                with open(os.path.join(directory, 'staticfiles.json'), 'w') as fh:
+                    json.dump({'paths': {'css/site.css': 'css/site.abc123.css'}}, fh)
+                out = io.StringIO()
+                call_command('static_report', '--json', stdout=out)
+        
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['groups']['css']['files'], 1)
+        self.assertEqual(report['groups']['css']['.gz'], 1)
+        self.assertEqual(report['total']['original'], 1000)
+        self.assertEqual(report['total']['served'], 200)
@@ -3,90 +3,51 @@ from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.http import HttpResponse, JsonResponse, FileResponse, StreamingHttpResponse
 from django.utils.safestring import mark_safe
-from django.db.models import Avg
+from django.db.models import Avg, Prefetch
+from django.utils import timezone
 from urllib.parse import unquote
 from urllib.parse import urlparse
 from django.conf import settings
 from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+import logging
 import mimetypes
+import os
+import time
 import requests
 import json
 
+from lapangin import metrics
+from lapangin.storage import StaticStorage, webp_variant
+
 from app.users.decorators import login_required, anonymous_required, user_required, mitra_required, admin_required
 from app.venues.models import Venue, VenueImage, VenueFacility, Facility, OperationalHour
-from app.courts.models import Court
+from app.venues.search import search_venues, serialize_venues
+from app.courts import schedule
+from app.courts.models import Court, CourtSession, CourtScheduleException
 from app.reviews.models import Review
 from app.bookings.models import Booking
 
 
+logger = logging.getLogger(__name__)
+
+
 def venue_list_view(request):
     """Render halaman daftar venue"""
-    # Don't send initial data, let JavaScript fetch from API with pagination
+    # First page is rendered through the same query path as /api/public/venues/;
+    # JavaScript fetches further pages from the API
     venues = []
     search_query = request.GET.get('search', '').strip()
     
     try:
-        # Filter for approved venues only
-        qs = Venue.objects.filter(verification_status='approved')
-        
-        # Apply search filter if search query exists
-        if search_query:
-            from django.db.models import Q
-            qs = qs.filter(
-                Q(name__icontains=search_query) |
-                Q(address__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
-            print(f"[Search] Searching for: '{search_query}'")
-            print(f"[Search] Found {qs.count()} matching venues")
-        
-        # Order and limit results
-        qs = qs.order_by('-created_at', 'name')[:9]
-        
-        print(f"[Initial Load] Found {Venue.objects.filter(verification_status='approved').count()} approved venues")
-        print(f"[Initial Load] Showing first {qs.count()} venues")
-        for v in qs:
-            # pick a safe first image if available
-            first_img = ''
-            try:
-                img = VenueImage.objects.filter(venue=v).order_by('-is_primary', 'id').first()
-                if img and img.image_url:
-                    first_img = img.image_url
-            except Exception as e:
-                print(f"Error getting image for venue {v.name}: {e}")
-                first_img = ''
-
-            # Calculate average rating
-            avg_rating = Review.objects.filter(booking__court__venue=v).aggregate(Avg('rating'))['rating__avg'] or 0.0
-            rating_count = Review.objects.filter(booking__court__venue=v).count()
-            
-            # Get all unique categories from courts in this venue
-            courts = Court.objects.filter(venue=v).select_related('category')
-            categories = set()
-            for court in courts:
-                if court.category:
-                    categories.add(court.category.get_name_display())
-            categories_display = ', '.join(sorted(categories)) if categories else ''
-            
-            venues.append({
-                'id': str(v.id),
-                'name': v.name,
-                'category': categories_display,
-                'address': getattr(v, 'address', '') or '',
-                'price_per_hour': float(Court.objects.filter(venue=v).aggregate(Avg('price_per_hour'))['price_per_hour__avg'] or 0),
-                'images': [first_img] if first_img else [],
-                'avg_rating': round(avg_rating, 1),
-                'rating_count': rating_count,
-            })
-            print(f"[Initial Load] Added venue: {v.name} (ID: {v.id})")
-    except Exception as e:
-        print(f"Error in venue_list_view: {e}")
-        import traceback
-        traceback.print_exc()
-        venues = []
-    print(f"[Initial Load] Total venues loaded: {len(venues)}")
-    venue_names = [v['name'] for v in venues]
-    print(f"[Initial Load] Venue names: {venue_names}")
+        result = search_venues(request.GET, with_facets=False)
+        venues = serialize_venues(result.venues, result.distances)
+        logger.debug('Initial venue list: %d of %d venues', len(venues), result.total_count)
+    except ValueError as e:
+        logger.debug('Invalid venue list parameters: %s', e)
+    except Exception:
+        logger.exception('Error in venue_list_view')
+    
     context = {
         'venues_json': mark_safe(json.dumps(venues, default=str)),
         'search_query': search_query,
@@ -96,12 +57,14 @@ def venue_list_view(request):
 
 def venue_detail_view(request, venue_id):
     """Render venue detail page with complete information"""
-    from datetime import datetime, date
+    from datetime import datetime
     
     venue = get_object_or_404(Venue, id=venue_id)
     
-    # Get all courts for this venue with their sessions
-    courts = Court.objects.filter(venue=venue).prefetch_related('sessions')
+    # Get all courts for this venue with their active sessions
+    courts = Court.objects.filter(venue=venue).select_related('category').prefetch_related(
+        Prefetch('sessions', queryset=CourtSession.objects.filter(is_active=True).order_by('start_time'))
+    )
     
     # Get venue facilities
     facilities = VenueFacility.objects.filter(venue=venue).select_related('facility')
@@ -124,7 +87,7 @@ def venue_detail_view(request, venue_id):
     
     # Check if user has completed booking at this venue (eligible to review)
     can_review = False
-    if request.user.is_authenticated:
+    if request.principal.is_authenticated:
         can_review = Booking.objects.filter(
             court__venue=venue,
             user=request.user,
@@ -133,10 +96,28 @@ def venue_detail_view(request, venue_id):
             review__isnull=False  # Exclude bookings that already have reviews
         ).exists()
     
-    # Get today's date to check session availability
-    today = date.today()
+    # Day to show availability for: ?date=YYYY-MM-DD, today by default.
+    # Past or malformed dates fall back to today.
+    today = timezone.localdate()
+    selected_date = today
+    try:
+        selected_date = max(datetime.strptime(request.GET.get('date', ''), '%Y-%m-%d').date(), today)
+    except ValueError:
+        pass
+    
+    # Occupancy for every court and session of the venue comes from one
+    # booked-slot set; schedule exceptions of the day from one more query
+    booked = set(Booking.objects.filter(
+        court__venue=venue,
+        booking_date=selected_date,
+        booking_status__in=['pending', 'confirmed']
+    ).values_list('court_id', 'session_id'))
+    exceptions_by_court = {}
+    for exception in CourtScheduleException.objects.filter(court__venue=venue, date=selected_date):
+        exceptions_by_court.setdefault(exception.court_id, []).append(exception)
+    now_time = timezone.localtime(timezone.now()).time()
     
-    # For each court, get session availability for today
+    # For each court, get session availability for the selected day
     courts_with_availability = []
     for court in courts:
         court_data = {
@@ -147,20 +128,18 @@ def venue_detail_view(request, venue_id):
             'sessions': []
         }
         
-        # Get all sessions for this court
-        sessions = court.sessions.all()
+        # Sessions of this court's weekly template that run on the selected day
+        sessions = schedule.sessions_for_date(
+            court.sessions.all(), selected_date, exceptions_by_court.get(court.id, ())
+        )
         for session in sessions:
-            # Check if this session is booked for today
-            is_booked = Booking.objects.filter(
-                court=court,
-                session=session,
-                booking_date=today,
-                booking_status__in=['pending', 'confirmed']
-            ).exists()
+            # Sessions that already started today can no longer be booked
+            if selected_date == today and session.start_time <= now_time:
+                continue
             
             # Calculate duration in minutes
-            start_datetime = datetime.combine(today, session.start_time)
-            end_datetime = datetime.combine(today, session.end_time)
+            start_datetime = datetime.combine(selected_date, session.start_time)
+            end_datetime = datetime.combine(selected_date, session.end_time)
             duration_minutes = int((end_datetime - start_datetime).total_seconds() / 60)
             
             session_data = {
@@ -169,7 +148,7 @@ def venue_detail_view(request, venue_id):
                 'start_time': session.start_time.strftime('%H:%M'),
                 'end_time': session.end_time.strftime('%H:%M'),
                 'duration': duration_minutes,
-                'is_available': not is_booked
+                'is_available': (court.id, session.id) not in booked
             }
             court_data['sessions'].append(session_data)
         
@@ -192,7 +171,10 @@ def venue_detail_view(request, venue_id):
         'review_count': all_reviews.count(),
         'is_authenticated': request.user.is_authenticated,
         'can_review': can_review,
-        'today': today.isoformat()
+        # Key of the cached static fragments; bumped on every venue edit
+        'venue_version': venue.updated_at.isoformat(),
+        'today': today.isoformat(),
+        'selected_date': selected_date.isoformat()
     }
     return render(request, 'venue_detail.html', context)
 
@@ -246,6 +228,39 @@ def booking_history_view(request):
     return render(request, 'booking_history.html')
 
 
+def static_file_response(request, relative_path):
+    """Serve a local static file for proxy_image without an HTTP round trip to ourselves"""
+    if isinstance(staticfiles_storage, StaticStorage):
+        # Production build: send the client to the fingerprinted file (or its
+        # WebP copy when accepted), which WhiteNoise serves precompressed with
+        # an immutable Cache-Control header
+        webp_name = None
+        if 'image/webp' in request.META.get('HTTP_ACCEPT', ''):
+            webp_name = webp_variant(relative_path)
+        if webp_name:
+            url = settings.STATIC_URL + webp_name
+        else:
+            if not staticfiles_storage.exists(relative_path):
+                return JsonResponse({'error': 'Static file not found'}, status=404)
+            url = staticfiles_storage.url(relative_path)
+        response = redirect(url)
+        response['Access-Control-Allow-Origin'] = '*'
+        response['Cache-Control'] = 'public, max-age=86400'
+        response['Vary'] = 'Accept'
+        return response
+
+    fs_path = finders.find(relative_path)
+    if not fs_path:
+        return JsonResponse({'error': 'Static file not found'}, status=404)
+
+    content_type, _ = mimetypes.guess_type(fs_path)
+    metrics.PROXY_IMAGE_BYTES.inc(os.path.getsize(fs_path), source='static')
+    file_response = FileResponse(open(fs_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    file_response['Access-Control-Allow-Origin'] = '*'
+    file_response['Cache-Control'] = 'public, max-age=86400'
+    return file_response
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def proxy_image(request):
@@ -260,16 +275,7 @@ def proxy_image(request):
         # Example: /static/img/dataset-photos/xxx.jpg
         static_url = getattr(settings, 'STATIC_URL', '/static/') or '/static/'
         if image_url.startswith(static_url):
-            relative_path = image_url[len(static_url):].lstrip('/')
-            fs_path = finders.find(relative_path)
-            if not fs_path:
-                return JsonResponse({'error': 'Static file not found'}, status=404)
-
-            content_type, _ = mimetypes.guess_type(fs_path)
-            file_response = FileResponse(open(fs_path, 'rb'), content_type=content_type or 'application/octet-stream')
-            file_response['Access-Control-Allow-Origin'] = '*'
-            file_response['Cache-Control'] = 'public, max-age=86400'
-            return file_response
+            return static_file_response(request, image_url[len(static_url):].lstrip('/'))
 
         # If the caller sends any other absolute path, reject it.
         if image_url.startswith('/'):
@@ -282,18 +288,10 @@ def proxy_image(request):
         parsed = urlparse(image_url)
         if parsed.netloc == request.get_host() and parsed.path.startswith(static_url):
             # Also avoid self-HTTP calls when a full URL points to our /static/.
-            relative_path = parsed.path[len(static_url):].lstrip('/')
-            fs_path = finders.find(relative_path)
-            if not fs_path:
-                return JsonResponse({'error': 'Static file not found'}, status=404)
-
-            content_type, _ = mimetypes.guess_type(fs_path)
-            file_response = FileResponse(open(fs_path, 'rb'), content_type=content_type or 'application/octet-stream')
-            file_response['Access-Control-Allow-Origin'] = '*'
-            file_response['Cache-Control'] = 'public, max-age=86400'
-            return file_response
+            return static_file_response(request, parsed.path[len(static_url):].lstrip('/'))
 
         # Use a tuple timeout: (connect timeout, read timeout)
+        upstream_started = time.perf_counter()
         upstream = requests.get(
             image_url,
             stream=True,
@@ -303,6 +301,7 @@ def proxy_image(request):
                 'Accept': 'image/*,*/*;q=0.8',
             },
         )
+        metrics.PROXY_IMAGE_UPSTREAM_LATENCY.observe(time.perf_counter() - upstream_started)
 
         if upstream.status_code != 200:
             upstream.close()
@@ -312,6 +311,7 @@ def proxy_image(request):
             try:
                 for chunk in upstream.iter_content(chunk_size=64 * 1024):
                     if chunk:
+                        metrics.PROXY_IMAGE_BYTES.inc(len(chunk), source='upstream')
                         yield chunk
             finally:
                 upstream.close()
@@ -328,3 +328,16 @@ def proxy_image(request):
         return JsonResponse({'error': 'Upstream timed out'}, status=504)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
+
+
+@require_http_methods(["GET"])
+def metrics_view(request):
+    """Expose application metrics in the Prometheus text format"""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+
+    return HttpResponse(
+        metrics.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
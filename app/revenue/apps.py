@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RevenueConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.revenue'
+
+    def ready(self):
+        # Register signal handlers
+        from app.revenue import signals  # noqa: F401
@@ -0,0 +1,175 @@
+"""
+Streaming exports for finance reconciliation.
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and written
+to the response one CSV line at a time, so an export of the whole ledger
+never holds more than one chunk of rows (and no model instances) in memory.
+XLSX is available when the optional ``openpyxl`` package is installed; its
+write-only workbook spools rows to a temporary file instead of memory.
+"""
+import csv
+import tempfile
+
+from django.db.models import Count, Q, Sum
+from django.http import FileResponse, StreamingHttpResponse
+
+from app.users.models import User
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+
+TRANSACTION_EXPORT_HEADER = [
+    'id', 'created_at', 'paid_at', 'payment_status', 'mitra_id', 'mitra_name', 'booking_id',
+    'booking_date', 'start_time', 'end_time', 'venue_name', 'court_name', 'customer_name',
+    'amount', 'commission_rate', 'commission_amount', 'net_amount',
+]
+
+EARNINGS_EXPORT_HEADER = [
+    'mitra_id', 'mitra_name', 'mitra_email', 'mitra_phone', 'completed_transactions',
+    'total_amount', 'total_commission', 'total_earnings',
+]
+
+REFUND_EXPORT_HEADER = [
+    'id', 'refunded_at', 'mitra_id', 'mitra_name', 'customer_name', 'venue_name',
+    'court_name', 'booking_date', 'amount', 'commission_amount', 'net_amount', 'reason',
+]
+
+
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def display_name(first_name, last_name, username):
+    """Same result as User.get_full_name() or username, from plain columns"""
+    return f'{first_name} {last_name}'.strip() or username
+
+
+def refund_reason(notes: str | None) -> str:
+    """Reason part of a refunded Pendapatan's notes (``REFUND: <reason>``)"""
+    if not notes:
+        return ""
+    marker = "REFUND:"
+    idx = notes.find(marker)
+    if idx == -1:
+        return notes
+    return notes[idx + len(marker):].strip()
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(filename, header, rows):
+    response = StreamingHttpResponse(stream_csv(header, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def xlsx_response(filename, header, rows):
+    """XLSX download of ``rows``; raises ValueError if openpyxl is not installed"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValueError('XLSX export requires openpyxl; use format=csv')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    # The zip container needs the whole sheet before it can be sent, so it is
+    # built in a temporary file (closed and removed once the response is sent)
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+def export_response(export_format, basename, header, rows):
+    """CSV or XLSX response named ``<basename>.<format>``; raises ValueError for other formats"""
+    if export_format == 'csv':
+        return csv_response(f'{basename}.csv', header, rows)
+    if export_format == 'xlsx':
+        return xlsx_response(f'{basename}.xlsx', header, rows)
+    raise ValueError(f'Invalid format. Use one of: {", ".join(EXPORT_FORMATS)}')
+
+
+def _isoformat(value):
+    return value.isoformat() if value else ''
+
+
+def refund_rows(queryset):
+    """CSV rows of refunded Pendapatan in ``queryset``, read in chunks"""
+    columns = queryset.values_list(
+        'id', 'updated_at', 'mitra_id',
+        'mitra__first_name', 'mitra__last_name', 'mitra__username',
+        'booking__user__first_name', 'booking__user__last_name', 'booking__user__username',
+        'booking__court__venue__name', 'booking__court__name', 'booking__booking_date',
+        'amount', 'commission_amount', 'net_amount', 'notes',
+    )
+    for (pk, refunded_at, mitra_id, mitra_first, mitra_last, mitra_username,
+         customer_first, customer_last, customer_username, venue_name, court_name,
+         booking_date, amount, commission_amount, net_amount, notes) in columns.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            str(pk), _isoformat(refunded_at), str(mitra_id),
+            display_name(mitra_first, mitra_last, mitra_username),
+            display_name(customer_first, customer_last, customer_username),
+            venue_name, court_name, booking_date.isoformat(),
+            amount, commission_amount, net_amount, refund_reason(notes),
+        ]
+
+
+def transaction_rows(queryset):
+    """Export rows of the Pendapatan in ``queryset``, read in chunks"""
+    columns = queryset.values_list(
+        'id', 'created_at', 'paid_at', 'payment_status',
+        'mitra_id', 'mitra__first_name', 'mitra__last_name', 'mitra__username',
+        'booking_id', 'booking__booking_date', 'booking__start_time', 'booking__end_time',
+        'booking__court__venue__name', 'booking__court__name',
+        'booking__user__first_name', 'booking__user__last_name', 'booking__user__username',
+        'amount', 'commission_rate', 'commission_amount', 'net_amount',
+    )
+    for (pk, created_at, paid_at, payment_status, mitra_id, mitra_first, mitra_last, mitra_username,
+         booking_id, booking_date, start_time, end_time, venue_name, court_name,
+         customer_first, customer_last, customer_username,
+         amount, commission_rate, commission_amount, net_amount) in columns.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            str(pk), _isoformat(created_at), _isoformat(paid_at), payment_status, str(mitra_id),
+            display_name(mitra_first, mitra_last, mitra_username), str(booking_id),
+            booking_date.isoformat(), start_time.strftime('%H:%M'), end_time.strftime('%H:%M'),
+            venue_name, court_name, display_name(customer_first, customer_last, customer_username),
+            amount, commission_rate, commission_amount, net_amount,
+        ]
+
+
+def earnings_rows():
+    """Per-mitra totals of paid transactions of completed bookings, from one grouped query"""
+    earned = Q(pendapatan__payment_status='paid', pendapatan__booking__booking_status='completed')
+    columns = User.objects.filter(role='mitra').annotate(
+        completed_transactions=Count('pendapatan', filter=earned),
+        total_amount=Sum('pendapatan__amount', filter=earned),
+        total_commission=Sum('pendapatan__commission_amount', filter=earned),
+        total_earnings=Sum('pendapatan__net_amount', filter=earned),
+    ).order_by('username').values_list(
+        'id', 'first_name', 'last_name', 'username', 'email', 'phone_number',
+        'completed_transactions', 'total_amount', 'total_commission', 'total_earnings',
+    )
+    for (pk, first_name, last_name, username, email, phone_number, completed_transactions,
+         total_amount, total_commission, total_earnings) in columns.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            str(pk), display_name(first_name, last_name, username), email, phone_number or '-',
+            completed_transactions, total_amount or 0, total_commission or 0, total_earnings or 0,
+        ]
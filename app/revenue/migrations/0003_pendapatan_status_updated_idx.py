@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_unique_active_slot'),
+        ('revenue', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pendapatan',
+            index=models.Index(fields=['payment_status', 'updated_at'], name='pendapatan_status_updated_idx'),
+        ),
+    ]
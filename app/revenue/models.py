@@ -33,6 +33,10 @@ class Pendapatan(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = "Pendapatan"
+        indexes = [
+            # Refund list/export: payment_status='refunded' ordered by updated_at
+            models.Index(fields=['payment_status', 'updated_at'], name='pendapatan_status_updated_idx'),
+        ]
 
 # Activity Log Model (for admin monitoring)
 class ActivityLog(models.Model):
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from app.revenue.models import ActivityLog
+from lapangin import metrics
+
+
+@receiver(post_save, sender=ActivityLog)
+def count_activity_log_write(sender, instance, created, **kwargs):
+    """Track the ActivityLog write rate for /metrics"""
+    if created:
+        metrics.ACTIVITY_LOG_WRITES.inc(action_type=instance.action_type)
@@ -226,6 +226,18 @@ class ApiMitraEarningsDetailTests(RevenueTestCase):
         transaction = data['data']['transactions'][0]
         self.assertEqual(transaction['customer_name'], 'Regular User')
         self.assertEqual(transaction['venue_name'], 'Test Venue')
+    
+    def test_api_mitra_earnings_detail_columnar(self):
+        """Test format=columnar returns the transactions as column arrays"""
+        self.client.login(username='admin', password='admin123')
+        url = f'/api/mitra/{self.mitra.id}/earnings/'
+        rows = self.client.get(url).json()['data']['transactions']
+        table = self.client.get(url, {'format': 'columnar'}).json()['data']['transactions']
+        
+        self.assertEqual(table['count'], 1)
+        self.assertEqual(table['columns']['id'], [str(self.pendapatan.id)])
+        self.assertEqual(table['columns']['net_amount'], [180000.0])
+        self.assertEqual({field: column[0] for field, column in table['columns'].items()}, rows[0])
 
 
 class ApiRefundsTests(RevenueTestCase):
@@ -304,6 +316,83 @@ class ApiRefundsTests(RevenueTestCase):
         data = response.json()
         self.assertIn('already refunded', data['message'].lower())
 
+    def _create_refunds(self, count, mitra=None, amount='50000.00'):
+        return [
+            Pendapatan.objects.create(
+                mitra=mitra or self.mitra,
+                booking=self.booking,
+                amount=Decimal(amount),
+                payment_status='refunded',
+                notes=f'REFUND: Reason {i}'
+            )
+            for i in range(count)
+        ]
+    
+    def test_api_refunds_cursor_pagination(self):
+        """Test following next_cursor returns every refund exactly once"""
+        created = self._create_refunds(5)
+        self.client.login(username='admin', password='admin123')
+        
+        seen = []
+        cursor = None
+        while True:
+            params = {'page_size': 2}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get('/api/refunds/', params).json()
+            self.assertLessEqual(len(data['data']), 2)
+            self.assertEqual('summary' in data, cursor is None)
+            seen.extend(r['id'] for r in data['data'])
+            cursor = data['pagination']['next_cursor']
+            if not cursor:
+                break
+        
+        self.assertEqual(sorted(seen), sorted(str(p.id) for p in created))
+    
+    def test_api_refunds_summary_and_filters(self):
+        """Test the summary totals every matching refund and filters by mitra and date"""
+        self._create_refunds(3, amount='50000.00')
+        self._create_refunds(1, mitra=self.mitra2, amount='70000.00')
+        self.client.login(username='admin', password='admin123')
+        
+        summary = self.client.get('/api/refunds/', {'page_size': 1}).json()['summary']
+        self.assertEqual(summary['count'], 4)
+        self.assertEqual(summary['total_amount'], 220000.0)
+        self.assertEqual(
+            [(m['mitra_id'], m['count']) for m in summary['by_mitra']],
+            [(str(self.mitra.id), 3), (str(self.mitra2.id), 1)]
+        )
+        
+        data = self.client.get('/api/refunds/', {'mitra': str(self.mitra2.id)}).json()
+        self.assertEqual(len(data['data']), 1)
+        self.assertEqual(data['summary']['total_amount'], 70000.0)
+        
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        data = self.client.get('/api/refunds/', {'date_from': tomorrow}).json()
+        self.assertEqual(data['data'], [])
+        self.assertEqual(data['summary']['count'], 0)
+        
+        response = self.client.get('/api/refunds/', {'date_from': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_api_refunds_csv_export(self):
+        """Test the CSV export streams one row per matching refund"""
+        self._create_refunds(3)
+        self.client.login(username='admin', password='admin123')
+        
+        response = self.client.get('/api/refunds/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        import csv
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][:3], ['id', 'refunded_at', 'mitra_id'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(sorted(row[-1] for row in rows[1:]), ['Reason 0', 'Reason 1', 'Reason 2'])
+        
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/refunds/export/').status_code, 401)
+
 
 class ApiCreateRefundTests(RevenueTestCase):
     """Tests for api_create_refund endpoint"""
@@ -345,6 +434,147 @@ class ApiListRefundsTests(RevenueTestCase):
         self.assertIsInstance(data['data'], list)
 
 
+class ApiBatchRefundsTests(RevenueTestCase):
+    """Tests for api_batch_refunds endpoint"""
+    
+    def _post(self, payload):
+        return self.client.post('/api/refunds/batch/', data=json.dumps(payload), content_type='application/json')
+    
+    def test_batch_refund_requires_admin(self):
+        """Test batch refunds are admin-only"""
+        self.client.login(username='mitra1', password='mitra123')
+        response = self._post({'pendapatan_ids': [str(self.pendapatan.id)], 'reason': 'Closed'})
+        self.assertEqual(response.status_code, 401)
+    
+    def test_batch_refund_by_ids_reports_each_item(self):
+        """Test paid items are refunded in one batch and the rest are skipped"""
+        pending = Pendapatan.objects.create(
+            mitra=self.mitra, booking=self.booking, amount=Decimal('50000.00'), payment_status='pending'
+        )
+        missing = '00000000-0000-0000-0000-000000000000'
+        self.client.login(username='admin', password='admin123')
+        logs_before = ActivityLog.objects.count()
+        
+        response = self._post({
+            'pendapatan_ids': [str(self.pendapatan.id), str(pending.id), missing, 'not-a-uuid'],
+            'reason': 'Venue closed'
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['refunded'], 1)
+        self.assertEqual(data['skipped'], 3)
+        self.assertEqual(data['total_amount'], 200000.0)
+        statuses = {item['id']: item['status'] for item in data['results']}
+        self.assertEqual(statuses[str(self.pendapatan.id)], 'refunded')
+        self.assertEqual(statuses[str(pending.id)], 'skipped')
+        self.assertEqual(statuses[missing], 'skipped')
+        
+        self.pendapatan.refresh_from_db()
+        self.assertEqual(self.pendapatan.payment_status, 'refunded')
+        self.assertEqual(self.pendapatan.notes, 'REFUND: Venue closed')
+        self.assertEqual(self.pendapatan.net_amount, Decimal('180000.00'))
+        pending.refresh_from_db()
+        self.assertEqual(pending.payment_status, 'pending')
+        self.assertEqual(ActivityLog.objects.count(), logs_before + 1)
+    
+    def test_batch_refund_by_venue_and_date(self):
+        """Test a venue/date filter refunds every paid transaction of that day"""
+        other = Pendapatan.objects.create(
+            mitra=self.mitra, booking=self.booking, amount=Decimal('80000.00'), payment_status='paid'
+        )
+        self.client.login(username='admin', password='admin123')
+        with self.assertNumQueries(7):
+            response = self._post({
+                'venue_id': str(self.venue.id),
+                'date': self.booking.booking_date.isoformat(),
+                'reason': 'Venue closed'
+            })
+        self.assertEqual(response.json()['data']['refunded'], 2)
+        self.assertEqual(
+            Pendapatan.objects.filter(id__in=[self.pendapatan.id, other.id], payment_status='refunded').count(), 2
+        )
+        
+        response = self._post({
+            'venue_id': str(self.venue.id),
+            'date': (self.booking.booking_date + timedelta(days=1)).isoformat(),
+            'reason': 'Venue closed'
+        })
+        self.assertEqual(response.json()['data']['refunded'], 0)
+    
+    def test_batch_refund_validation(self):
+        """Test missing reason or selection is rejected"""
+        self.client.login(username='admin', password='admin123')
+        self.assertEqual(self._post({'pendapatan_ids': [str(self.pendapatan.id)]}).status_code, 400)
+        self.assertEqual(self._post({'reason': 'Closed'}).status_code, 400)
+        self.assertEqual(self._post({'pendapatan_ids': [], 'reason': 'Closed'}).status_code, 400)
+
+
+class ApiExportTests(RevenueTestCase):
+    """Tests for the streaming transaction and earnings exports"""
+    
+    def _rows(self, response):
+        import csv
+        self.assertTrue(response.streaming)
+        return list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+    
+    def test_mitra_exports_only_own_transactions(self):
+        """Test a mitra's export holds only their transactions"""
+        Pendapatan.objects.create(mitra=self.mitra2, booking=self.booking, amount=Decimal('50000.00'))
+        self.client.login(username='mitra1', password='mitra123')
+        response = self.client.get('/api/pendapatan/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment; filename="transactions-', response['Content-Disposition'])
+        rows = self._rows(response)
+        self.assertEqual(rows[0][0], 'id')
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.pendapatan.id)])
+        self.assertEqual(rows[1][rows[0].index('net_amount')], '180000.00')
+    
+    def test_admin_export_filters(self):
+        """Test admins can filter the export by mitra, status and date"""
+        Pendapatan.objects.create(
+            mitra=self.mitra2, booking=self.booking, amount=Decimal('50000.00'), payment_status='pending'
+        )
+        self.client.login(username='admin', password='admin123')
+        self.assertEqual(len(self._rows(self.client.get('/api/pendapatan/export/'))), 3)
+        rows = self._rows(self.client.get('/api/pendapatan/export/', {'mitra': str(self.mitra2.id)}))
+        self.assertEqual(len(rows), 2)
+        rows = self._rows(self.client.get('/api/pendapatan/export/', {'status': 'paid'}))
+        self.assertEqual([row[0] for row in rows[1:]], [str(self.pendapatan.id)])
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        self.assertEqual(len(self._rows(self.client.get('/api/pendapatan/export/', {'date_from': tomorrow}))), 1)
+        self.assertEqual(self.client.get('/api/pendapatan/export/', {'status': 'bogus'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/pendapatan/export/', {'format': 'pdf'}).status_code, 400)
+    
+    def test_export_requires_mitra_or_admin(self):
+        """Test regular users cannot export transactions"""
+        self.client.login(username='user1', password='user123')
+        self.assertEqual(self.client.get('/api/pendapatan/export/').status_code, 403)
+    
+    def test_mitra_earnings_export(self):
+        """Test the earnings export has one totals row per mitra"""
+        self.client.login(username='admin', password='admin123')
+        with self.assertNumQueries(2):  # session, earnings; the admin check needs no user query
+            rows = self._rows(self.client.get('/api/mitra/earnings/export/'))
+        totals = {row[0]: row for row in rows[1:]}
+        self.assertEqual(set(totals), {str(self.mitra.id), str(self.mitra2.id)})
+        self.assertEqual(totals[str(self.mitra.id)][4], '1')
+        self.assertEqual(Decimal(totals[str(self.mitra.id)][-1]), Decimal('180000'))
+        self.assertEqual(totals[str(self.mitra2.id)][4], '0')
+    
+    def test_xlsx_export(self):
+        """Test format=xlsx returns a workbook, or a clear error without openpyxl"""
+        self.client.login(username='admin', password='admin123')
+        response = self.client.get('/api/pendapatan/export/', {'format': 'xlsx'})
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('openpyxl', response.json()['message'])
+        else:
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('.xlsx', response['Content-Disposition'])
+
+
 class ApiCancelRefundTests(RevenueTestCase):
     """Tests for api_cancel_refund endpoint"""
     
@@ -764,6 +994,24 @@ class ApiMitraVenueDetailsTests(RevenueTestCase):
         self.assertEqual(venue['name'], 'Test Venue')
         self.assertIn('courts', venue)
         self.assertEqual(len(venue['courts']), 1)
+    
+    def test_venue_details_fieldset(self):
+        """Test include= picks the embedded relations and skips the rest"""
+        url = f'/api/mitra/{self.mitra.id}/venues/'
+        venue = self.client.get(url, {'include': 'courts'}).json()['data']['venues'][0]
+        self.assertNotIn('images', venue)
+        self.assertNotIn('images', venue['courts'][0])
+        self.assertEqual(venue['courts'][0]['name'], self.court.name)
+        
+        venue = self.client.get(url, {'fields': 'id,name', 'include': 'courts.images'}).json()['data']['venues'][0]
+        self.assertEqual(set(venue), {'id', 'name', 'courts'})
+        self.assertEqual(venue['courts'][0]['images'], [])
+        
+        with self.assertNumQueries(2):  # mitra, venues
+            response = self.client.get(url, {'fields': 'id,name'})
+        self.assertEqual(list(response.json()['data']['venues'][0]), ['id', 'name'])
+        
+        self.assertEqual(self.client.get(url, {'include': 'reviews'}).status_code, 400)
 
 
 class ApiSportsCategoriesTests(RevenueTestCase):
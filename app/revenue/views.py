@@ -2,11 +2,13 @@ from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.db.models import Sum, Avg
+from django.db.models import Count, Sum, Avg, Prefetch
 from decimal import Decimal
 import json
+import uuid
 from datetime import date, datetime, timedelta
 from django.utils import timezone
+from django.db import transaction
 
 from app.users.models import User
 from app.venues.models import Venue, VenueFacility, OperationalHour
@@ -14,27 +16,55 @@ from app.courts.models import Court
 from app.bookings.models import Booking
 from app.reviews.models import Review
 from app.revenue.models import Pendapatan, ActivityLog
+from app.users.utils import get_client_ip
+from app.revenue.exports import (
+    EARNINGS_EXPORT_HEADER, REFUND_EXPORT_HEADER, TRANSACTION_EXPORT_HEADER,
+    display_name, earnings_rows, export_response, refund_reason, refund_rows, transaction_rows,
+)
+from lapangin.columnar import FastJsonResponse, as_float, as_str, convert_rows, iso, to_columns, wants_columnar
+from lapangin.fieldsets import parse_fieldset
+from lapangin.pagination import InvalidCursor, paginate_by_cursor, parse_page_size
 
 
-def _refund_reason_from_notes(notes: str | None) -> str:
-    if not notes:
-        return ""
-    marker = "REFUND:"
-    idx = notes.find(marker)
-    if idx == -1:
-        return notes
-    return notes[idx + len(marker):].strip()
+# Keys of an earnings detail transaction, the columns of ?format=columnar
+TRANSACTION_FIELDS = (
+    'pendapatan_id', 'id', 'booking_id', 'customer_name', 'venue_name', 'court_name', 'booking_date',
+    'time_slot', 'amount', 'commission_rate', 'commission_amount', 'net_amount', 'payment_status',
+    'paid_at', 'created_at',
+)
+
+# Formatting of the raw earnings detail values, applied per row or per column (?format=columnar)
+TRANSACTION_CONVERTERS = {
+    'pendapatan_id': as_str,
+    'id': as_str,
+    'booking_id': as_str,
+    'booking_date': iso,
+    'amount': as_float,
+    'commission_rate': as_float,
+    'commission_amount': as_float,
+    'net_amount': as_float,
+    'paid_at': iso,
+    'created_at': iso,
+}
+
+# Venue fields of the admin mitra detail; courts are embedded with their images
+MITRA_DETAIL_VENUE_FIELDS = (
+    'id', 'name', 'address', 'contact', 'description', 'number_of_courts', 'verification_status',
+    'is_verified', 'created_at',
+)
+MITRA_DETAIL_VENUE_RELATIONS = ('images', 'courts', 'courts.images')
+
 
 @require_http_methods(["GET"])
 def api_pendapatan(request):
     """API endpoint for getting mitra's revenue/earnings data"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
@@ -44,7 +74,7 @@ def api_pendapatan(request):
     period = request.GET.get('period', 'all')  # all, month, year
     
     # Base queryset
-    pendapatan_qs = Pendapatan.objects.filter(mitra=request.user)
+    pendapatan_qs = Pendapatan.objects.filter(mitra_id=request.principal.id)
     
     # Apply filters
     if period == 'month':
@@ -105,16 +135,98 @@ def api_pendapatan(request):
         }
     })
 
+@require_http_methods(["GET"])
+def api_export_transactions(request):
+    """Export Pendapatan transactions as CSV (default) or XLSX, streamed in chunks
+
+    Mitra export their own transactions; admins export every mitra's, or
+    one mitra's with ``mitra=<id>``.
+
+    Query params:
+        format: csv (default) or xlsx (requires openpyxl)
+        status: all (default) or a comma-separated list of payment statuses
+        date_from / date_to: transaction date range, YYYY-MM-DD (inclusive)
+        mitra: mitra id (admin only)
+    """
+    if not request.principal.is_authenticated:
+        return JsonResponse({
+            'success': False,
+            'message': 'Authentication required'
+        }, status=401)
+
+    if request.principal.role not in ('mitra', 'admin'):
+        return JsonResponse({
+            'success': False,
+            'message': 'Access denied. Mitra role required.'
+        }, status=403)
+
+    pendapatan_qs = Pendapatan.objects.all()
+    if request.principal.role == 'mitra':
+        pendapatan_qs = pendapatan_qs.filter(mitra_id=request.principal.id)
+    elif request.GET.get('mitra'):
+        try:
+            pendapatan_qs = pendapatan_qs.filter(mitra_id=uuid.UUID(request.GET['mitra']))
+        except ValueError:
+            return JsonResponse({'success': False, 'message': 'Invalid mitra id'}, status=400)
+
+    status_filter = request.GET.get('status', 'all')
+    if status_filter != 'all':
+        statuses = [s.strip() for s in status_filter.split(',') if s.strip()]
+        valid_statuses = {choice for choice, _ in Pendapatan._meta.get_field('payment_status').choices}
+        if not statuses or any(s not in valid_statuses for s in statuses):
+            return JsonResponse({'success': False, 'message': 'Invalid status filter'}, status=400)
+        pendapatan_qs = pendapatan_qs.filter(payment_status__in=statuses)
+
+    try:
+        if request.GET.get('date_from'):
+            start = datetime.strptime(request.GET['date_from'], '%Y-%m-%d')
+            pendapatan_qs = pendapatan_qs.filter(created_at__gte=timezone.make_aware(start))
+        if request.GET.get('date_to'):
+            end = datetime.strptime(request.GET['date_to'], '%Y-%m-%d') + timedelta(days=1)
+            pendapatan_qs = pendapatan_qs.filter(created_at__lt=timezone.make_aware(end))
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Invalid date format. Use YYYY-MM-DD'
+        }, status=400)
+
+    try:
+        return export_response(
+            request.GET.get('format', 'csv'),
+            f"transactions-{timezone.localdate().isoformat()}",
+            TRANSACTION_EXPORT_HEADER,
+            transaction_rows(pendapatan_qs.order_by('-created_at', '-pk')),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+
+@require_http_methods(["GET"])
+def api_export_mitra_earnings(request):
+    """Export each mitra's earnings totals (as in api_mitra_earnings) as CSV or XLSX"""
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
+        return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
+
+    try:
+        return export_response(
+            request.GET.get('format', 'csv'),
+            f"mitra-earnings-{timezone.localdate().isoformat()}",
+            EARNINGS_EXPORT_HEADER,
+            earnings_rows(),
+        )
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
 @require_http_methods(["GET"])
 def api_mitra_dashboard(request):
     """API endpoint for mitra dashboard data with complete venue and court information"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied'
@@ -289,13 +401,13 @@ def api_mitra_dashboard(request):
 @require_http_methods(["GET"])
 def api_admin_dashboard(request):
     """API endpoint for admin dashboard data"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'admin':
+    if request.principal.role != 'admin':
         return JsonResponse({
             'success': False,
             'message': 'Access denied'
@@ -392,7 +504,7 @@ def api_mitra_list(request):
 @csrf_exempt
 def api_mitra_earnings(request):
     """Return each mitra's total earnings based on completed transactions (paid, excluding refunded)."""
-    if not request.user.is_authenticated or request.user.role != 'admin':
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
 
     mitras = User.objects.filter(role='mitra')
@@ -485,7 +597,15 @@ def api_mitra_update_status(request, mitra_id):
 @csrf_exempt
 @require_http_methods(["GET"])
 def api_mitra_venue_details(request, mitra_id):
-    """Get detailed venue information for a specific mitra"""
+    """Get detailed venue information for a specific mitra
+
+    ``fields``/``include`` (lapangin.fieldsets) trim the venues; relations
+    that are left out (images, courts, courts.images) are not prefetched.
+    """
+    try:
+        fieldset = parse_fieldset(request.GET, MITRA_DETAIL_VENUE_FIELDS, MITRA_DETAIL_VENUE_RELATIONS)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     try:
         try:
             mitra = User.objects.get(id=mitra_id, role='mitra')
@@ -493,13 +613,19 @@ def api_mitra_venue_details(request, mitra_id):
             return JsonResponse({'status': 'error', 'message': 'Mitra not found'}, status=404)
 
         # Get all venues for this mitra
-        venues = Venue.objects.filter(owner=mitra).prefetch_related('images', 'courts', 'courts__images')
+        venues = Venue.objects.filter(owner=mitra)
+        if fieldset.includes('images'):
+            venues = venues.prefetch_related('images')
+        if fieldset.includes('courts'):
+            venues = venues.prefetch_related(Prefetch('courts', queryset=Court.objects.select_related('category')))
+        if fieldset.includes('courts.images'):
+            venues = venues.prefetch_related('courts__images')
         
         venues_data = []
         for venue in venues:
             # Get venue images
             venue_images = []
-            for img in venue.images.all():
+            for img in venue.images.all() if fieldset.includes('images') else ():
                 venue_images.append({
                     'id': img.id,
                     'url': img.image_url,
@@ -509,9 +635,9 @@ def api_mitra_venue_details(request, mitra_id):
             
             # Get courts for this venue
             courts_data = []
-            for court in venue.courts.all():
+            for court in venue.courts.all() if fieldset.includes('courts') else ():
                 court_images = []
-                for img in court.images.all():
+                for img in court.images.all() if fieldset.includes('courts.images') else ():
                     court_images.append({
                         'id': img.id,
                         'url': img.image_url,
@@ -519,17 +645,19 @@ def api_mitra_venue_details(request, mitra_id):
                         'caption': img.caption or ''
                     })
                 
-                courts_data.append({
+                court_data = {
                     'id': court.id,
                     'name': court.name,
                     'category': court.category.get_name_display() if court.category else 'N/A',
                     'price_per_hour': str(court.price_per_hour),
                     'is_active': court.is_active,
                     'description': court.description or 'Tidak ada deskripsi',
-                    'images': court_images
-                })
+                }
+                if fieldset.includes('courts.images'):
+                    court_data['images'] = court_images
+                courts_data.append(court_data)
             
-            venues_data.append({
+            venues_data.append(fieldset.filter({
                 'id': str(venue.id),
                 'name': venue.name,
                 'address': venue.address,
@@ -541,7 +669,7 @@ def api_mitra_venue_details(request, mitra_id):
                 'created_at': venue.created_at.isoformat() if hasattr(venue, 'created_at') else None,
                 'images': venue_images,
                 'courts': courts_data
-            })
+            }))
 
         return JsonResponse({
             'status': 'ok',
@@ -562,8 +690,11 @@ def api_mitra_venue_details(request, mitra_id):
 @require_http_methods(["GET"])
 @csrf_exempt
 def api_mitra_earnings_detail(request, mitra_id):
-    """Get detailed earnings and transaction information for a specific mitra"""
-    if not request.user.is_authenticated or request.user.role != 'admin':
+    """Get detailed earnings and transaction information for a specific mitra
+
+    ``format=columnar`` returns the transactions as column arrays (lapangin.columnar).
+    """
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
     
     try:
@@ -571,40 +702,55 @@ def api_mitra_earnings_detail(request, mitra_id):
     except User.DoesNotExist:
         return JsonResponse({'status': 'error', 'message': 'Mitra not found'}, status=404)
     
-    # Get all completed and paid transactions for this mitra (EXCLUDING refunded)
-    pendapatans = Pendapatan.objects.filter(
+    # Get all completed and paid transactions for this mitra (EXCLUDING refunded),
+    # projected to plain columns; TRANSACTION_CONVERTERS formats them
+    rows = Pendapatan.objects.filter(
         mitra=mitra,
         payment_status='paid',
         booking__booking_status='completed'
-    ).select_related('booking', 'booking__user', 'booking__court', 'booking__court__venue').order_by('-created_at')
+    ).order_by('-created_at').values_list(
+        'id', 'booking_id', 'booking__user__first_name', 'booking__user__last_name', 'booking__user__username',
+        'booking__court__venue__name', 'booking__court__name', 'booking__booking_date',
+        'booking__start_time', 'booking__end_time', 'amount', 'commission_rate', 'commission_amount',
+        'net_amount', 'payment_status', 'paid_at', 'created_at',
+    )
     
     transactions = []
-    total_earnings = 0
-    total_commission = 0
+    total_earnings = Decimal('0')
+    total_commission = Decimal('0')
     
-    for p in pendapatans:
-        total_earnings += float(p.net_amount)
-        total_commission += float(p.commission_amount)
+    for (pk, booking_id, first_name, last_name, username, venue_name, court_name, booking_date,
+         start_time, end_time, amount, commission_rate, commission_amount, net_amount,
+         payment_status, paid_at, created_at) in rows:
+        total_earnings += net_amount
+        total_commission += commission_amount
         
         transactions.append({
-            'pendapatan_id': str(p.id),  # Added pendapatan_id for refund processing
-            'id': str(p.id),
-            'booking_id': str(p.booking.id),
-            'customer_name': p.booking.user.get_full_name() or p.booking.user.username,
-            'venue_name': p.booking.court.venue.name,
-            'court_name': p.booking.court.name,
-            'booking_date': p.booking.booking_date.isoformat(),
-            'time_slot': f"{p.booking.start_time.strftime('%H:%M')} - {p.booking.end_time.strftime('%H:%M')}",
-            'amount': float(p.amount),
-            'commission_rate': float(p.commission_rate),
-            'commission_amount': float(p.commission_amount),
-            'net_amount': float(p.net_amount),
-            'payment_status': p.payment_status,
-            'paid_at': p.paid_at.isoformat() if p.paid_at else None,
-            'created_at': p.created_at.isoformat()
+            'pendapatan_id': pk,  # Added pendapatan_id for refund processing
+            'id': pk,
+            'booking_id': booking_id,
+            'customer_name': display_name(first_name, last_name, username),
+            'venue_name': venue_name,
+            'court_name': court_name,
+            'booking_date': booking_date,
+            'time_slot': f"{start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}",
+            'amount': amount,
+            'commission_rate': commission_rate,
+            'commission_amount': commission_amount,
+            'net_amount': net_amount,
+            'payment_status': payment_status,
+            'paid_at': paid_at,
+            'created_at': created_at,
         })
     
-    return JsonResponse({
+    if wants_columnar(request):
+        response_class = FastJsonResponse
+        transactions_data = to_columns(transactions, TRANSACTION_CONVERTERS, fields=TRANSACTION_FIELDS)
+    else:
+        response_class = JsonResponse
+        transactions_data = convert_rows(transactions, TRANSACTION_CONVERTERS)
+    
+    return response_class({
         'status': 'ok',
         'data': {
             'mitra': {
@@ -615,34 +761,97 @@ def api_mitra_earnings_detail(request, mitra_id):
                 'is_verified': mitra.is_verified
             },
             'summary': {
-                'total_earnings': total_earnings,
-                'total_commission': total_commission,
+                'total_earnings': float(total_earnings),
+                'total_commission': float(total_commission),
                 'total_transactions': len(transactions),
             },
-            'transactions': transactions,
+            'transactions': transactions_data,
         }
     })
 
 
+def _filter_refunds(params):
+    """Refunded Pendapatan matching the list/export query parameters.
+
+    date_from / date_to: refund date range, YYYY-MM-DD (inclusive)
+    mitra: id of the mitra the refunds belong to
+    Raises ValueError with a client-facing message on invalid parameters.
+    """
+    qs = Pendapatan.objects.filter(payment_status='refunded')
+
+    # Compare against local-midnight datetimes so the updated_at index stays usable
+    try:
+        if params.get('date_from'):
+            start = datetime.strptime(params['date_from'], '%Y-%m-%d')
+            qs = qs.filter(updated_at__gte=timezone.make_aware(start))
+        if params.get('date_to'):
+            end = datetime.strptime(params['date_to'], '%Y-%m-%d') + timedelta(days=1)
+            qs = qs.filter(updated_at__lt=timezone.make_aware(end))
+    except ValueError:
+        raise ValueError('Invalid date format. Use YYYY-MM-DD')
+
+    if params.get('mitra'):
+        try:
+            qs = qs.filter(mitra_id=uuid.UUID(params['mitra']))
+        except ValueError:
+            raise ValueError('Invalid mitra id')
+    return qs
+
+
+def _refund_summary(qs):
+    """Count and total of ``qs``, overall and per mitra, from one grouped query"""
+    by_mitra = []
+    for row in qs.order_by().values(
+        'mitra_id', 'mitra__first_name', 'mitra__last_name', 'mitra__username'
+    ).annotate(count=Count('id'), total=Sum('amount')):
+        by_mitra.append({
+            'mitra_id': str(row['mitra_id']),
+            'mitra_name': display_name(row['mitra__first_name'], row['mitra__last_name'], row['mitra__username']),
+            'count': row['count'],
+            'total_amount': float(row['total'] or 0),
+        })
+    by_mitra.sort(key=lambda item: (-item['total_amount'], item['mitra_name']))
+    return {
+        'count': sum(item['count'] for item in by_mitra),
+        'total_amount': sum(item['total_amount'] for item in by_mitra),
+        'by_mitra': by_mitra,
+    }
+
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def api_refunds(request):
     """List refunds (GET) and create a refund (POST).
 
     Implementation uses Pendapatan records with payment_status='refunded' and stores reason in notes.
+
+    GET query params:
+        date_from / date_to: refund date range, YYYY-MM-DD (inclusive)
+        mitra: only refunds of this mitra
+        page_size: refunds per page (default 20, max 100)
+        cursor: ``pagination.next_cursor`` of the previous page
+    The first page (no cursor) also carries ``summary``: count and total
+    amount of every matching refund, overall and per mitra.
     """
-    if not request.user.is_authenticated or request.user.role != 'admin':
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
 
     if request.method == "GET":
-        qs = (
-            Pendapatan.objects.filter(payment_status='refunded')
-            .select_related('mitra', 'booking', 'booking__user', 'booking__court', 'booking__court__venue')
-            .order_by('-updated_at')
-        )
+        try:
+            refunds = _filter_refunds(request.GET)
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+        cursor = request.GET.get('cursor')
+        page_size = parse_page_size(request.GET.get('page_size'))
+        qs = refunds.select_related('mitra', 'booking', 'booking__user', 'booking__court', 'booking__court__venue')
+        try:
+            page, next_cursor = paginate_by_cursor(qs, '-updated_at', cursor, page_size)
+        except InvalidCursor as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
 
         data = []
-        for p in qs:
+        for p in page:
             data.append({
                 'id': str(p.id),
                 'mitra_name': p.mitra.get_full_name() or p.mitra.username,
@@ -651,10 +860,21 @@ def api_refunds(request):
                 'court_name': p.booking.court.name,
                 'amount': float(p.amount),
                 'refunded_at': p.updated_at.isoformat() if p.updated_at else None,
-                'reason': _refund_reason_from_notes(p.notes),
+                'reason': refund_reason(p.notes),
             })
 
-        return JsonResponse({'status': 'ok', 'data': data})
+        response = {
+            'status': 'ok',
+            'data': data,
+            'pagination': {
+                'page_size': page_size,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None,
+            },
+        }
+        if not cursor:
+            response['summary'] = _refund_summary(refunds)
+        return JsonResponse(response)
 
     # POST: create refund
     try:
@@ -700,7 +920,7 @@ def api_refunds(request):
 @require_http_methods(["POST"])
 def api_create_refund(request, pendapatan_id):
     """Back-compat endpoint: POST /api/revenue/refunds/<id>/create/"""
-    if not request.user.is_authenticated or request.user.role != 'admin':
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
 
     try:
@@ -716,6 +936,124 @@ def api_create_refund(request, pendapatan_id):
     return api_refunds(request)
 
 
+# Upper bound on the transactions one batch refund request may touch
+MAX_BATCH_REFUNDS = 500
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def api_batch_refunds(request):
+    """Refund many paid transactions at once, e.g. when a venue closes for a day.
+
+    Body: ``{"reason": ..., "pendapatan_ids": [...]}`` or
+    ``{"reason": ..., "venue_id": ..., "date": "YYYY-MM-DD"}`` (every
+    transaction of bookings at that venue on that date). All candidates are
+    loaded and locked in one query, the paid ones are switched to refunded
+    with a single bulk_update, and one ActivityLog entry records the batch.
+    Returns a result per transaction; unpaid or unknown ones are skipped.
+    """
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
+        return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
+
+    try:
+        payload = json.loads(request.body or b"{}")
+    except Exception:
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=400)
+
+    reason = (payload.get('reason') or '').strip()
+    if not reason:
+        return JsonResponse({'status': 'error', 'message': 'reason is required'}, status=400)
+
+    results = []
+    requested_ids = payload.get('pendapatan_ids')
+    if requested_ids is not None:
+        if not isinstance(requested_ids, list) or not requested_ids:
+            return JsonResponse({'status': 'error', 'message': 'pendapatan_ids must be a non-empty list'}, status=400)
+        if len(requested_ids) > MAX_BATCH_REFUNDS:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'At most {MAX_BATCH_REFUNDS} transactions per batch'
+            }, status=400)
+        ids = []
+        for raw_id in dict.fromkeys(str(i) for i in requested_ids):
+            try:
+                ids.append(uuid.UUID(raw_id))
+            except ValueError:
+                results.append({'id': raw_id, 'status': 'skipped', 'message': 'Invalid id'})
+        candidates = Pendapatan.objects.filter(id__in=ids)
+    elif payload.get('venue_id') and payload.get('date'):
+        try:
+            venue_id = uuid.UUID(str(payload['venue_id']))
+            booking_date = datetime.strptime(payload['date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return JsonResponse({'status': 'error', 'message': 'Invalid venue_id or date'}, status=400)
+        ids = None
+        candidates = Pendapatan.objects.filter(
+            booking__court__venue_id=venue_id, booking__booking_date=booking_date
+        )
+    else:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'pendapatan_ids, or venue_id and date, are required'
+        }, status=400)
+
+    with transaction.atomic():
+        found = {
+            p.id: p for p in candidates.select_for_update().only(
+                'id', 'mitra_id', 'amount', 'payment_status', 'notes'
+            )[:MAX_BATCH_REFUNDS + 1]
+        }
+        if ids is None and len(found) > MAX_BATCH_REFUNDS:
+            return JsonResponse({
+                'status': 'error',
+                'message': f'At most {MAX_BATCH_REFUNDS} transactions per batch'
+            }, status=400)
+
+        # Same transition rules as a single refund, without Pendapatan.save()
+        # recomputing the commission of every row
+        now = timezone.now()
+        to_refund = []
+        for pendapatan_id in (ids if ids is not None else list(found)):
+            p = found.get(pendapatan_id)
+            if p is None:
+                results.append({'id': str(pendapatan_id), 'status': 'skipped', 'message': 'Transaction not found'})
+            elif p.payment_status == 'refunded':
+                results.append({'id': str(p.id), 'status': 'skipped', 'message': 'Transaction already refunded'})
+            elif p.payment_status != 'paid':
+                results.append({'id': str(p.id), 'status': 'skipped', 'message': 'Only paid transactions can be refunded'})
+            else:
+                p.payment_status = 'refunded'
+                p.notes = f"REFUND: {reason}"
+                p.updated_at = now  # bulk_update does not apply auto_now
+                to_refund.append(p)
+                results.append({'id': str(p.id), 'status': 'refunded'})
+
+        total_amount = sum((p.amount for p in to_refund), Decimal('0'))
+        if to_refund:
+            Pendapatan.objects.bulk_update(to_refund, ['payment_status', 'notes', 'updated_at'], batch_size=200)
+            ActivityLog.objects.create(
+                user=request.user,
+                action_type='payment',
+                description=(
+                    f'Batch refund of {len(to_refund)} transactions '
+                    f'(Rp {total_amount:,.0f}): {reason}'
+                ),
+                ip_address=get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            )
+
+    return JsonResponse({
+        'status': 'ok',
+        'message': f'{len(to_refund)} refunds processed',
+        'data': {
+            'refunded': len(to_refund),
+            'skipped': len(results) - len(to_refund),
+            'total_amount': float(total_amount),
+            'results': results,
+        }
+    })
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def api_list_refunds(request):
@@ -723,6 +1061,24 @@ def api_list_refunds(request):
     return api_refunds(request)
 
 
+@require_http_methods(["GET"])
+def api_export_refunds(request):
+    """Stream the refunds matching the list filters as CSV (or XLSX with format=xlsx), for finance reconciliation"""
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
+        return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
+
+    try:
+        refunds = _filter_refunds(request.GET)
+        return export_response(
+            request.GET.get('format', 'csv'),
+            f"refunds-{timezone.localdate().isoformat()}",
+            REFUND_EXPORT_HEADER,
+            refund_rows(refunds.order_by('-updated_at', '-pk')),
+        )
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+
+
 @csrf_exempt
 @require_http_methods(["DELETE"])
 def api_cancel_refund(request, pendapatan_id):
@@ -730,7 +1086,7 @@ def api_cancel_refund(request, pendapatan_id):
 
     Sets Pendapatan.payment_status back to 'paid' and marks notes as cancelled.
     """
-    if not request.user.is_authenticated or request.user.role != 'admin':
+    if not request.principal.is_authenticated or request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
 
     try:
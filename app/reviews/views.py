@@ -46,7 +46,7 @@ def api_venue_reviews(request, venue_id):
         })
 
     elif request.method == "POST":
-        if not request.user.is_authenticated:
+        if not request.principal.is_authenticated:
             return JsonResponse({'status': 'error', 'message': 'Login required'}, status=401)
 
         try:
@@ -102,7 +102,7 @@ def api_venue_reviews(request, venue_id):
 @require_http_methods(["PUT", "DELETE"])
 def api_manage_review(request, review_id):
     """API endpoint for updating and deleting reviews"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'status': 'error', 'message': 'Login required'}, status=401)
 
     try:
@@ -158,7 +158,7 @@ def api_manage_review(request, review_id):
 @require_http_methods(["POST"])
 def api_update_review_post(request, review_id):
     """POST alternative for updating reviews (mobile-friendly)."""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'status': 'error', 'message': 'Login required'}, status=401)
 
     try:
@@ -205,7 +205,7 @@ def api_update_review_post(request, review_id):
 @require_http_methods(["POST"])
 def api_delete_review_post(request, review_id):
     """POST alternative for deleting reviews (mobile-friendly)."""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'status': 'error', 'message': 'Login required'}, status=401)
 
     try:
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.users'
+
+    def ready(self):
+        # Register signal handlers
+        from app.users import signals  # noqa: F401
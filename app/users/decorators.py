@@ -5,15 +5,18 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.core.exceptions import PermissionDenied
 
+from app.users.principal import get_principal
+
 
 def login_required(view_func=None, login_url='/login'):
     """
     Custom login required decorator that redirects to custom login page
+    (checks the session principal, so the User row is not loaded)
     """
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            if not request.user.is_authenticated:
+            if not get_principal(request).is_authenticated:
                 if request.headers.get('Content-Type') == 'application/json' or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                     return JsonResponse({'error': 'Authentication required'}, status=401)
                 messages.info(request, 'Silakan login terlebih dahulu.')
@@ -37,13 +40,14 @@ def role_required(allowed_roles):
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            if not request.user.is_authenticated:
+            principal = get_principal(request)
+            if not principal.is_authenticated:
                 if request.headers.get('Content-Type') == 'application/json' or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                     return JsonResponse({'error': 'Authentication required'}, status=401)
                 messages.info(request, 'Silakan login terlebih dahulu.')
                 return redirect('/login')
             
-            if request.user.role not in allowed_roles:
+            if principal.role not in allowed_roles:
                 if request.headers.get('Content-Type') == 'application/json' or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                     return JsonResponse({'error': 'Permission denied'}, status=403)
                 messages.error(request, 'Anda tidak memiliki izin untuk mengakses halaman ini.')
@@ -77,11 +81,12 @@ def anonymous_required(redirect_url='/'):
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
-            if request.user.is_authenticated:
+            principal = get_principal(request)
+            if principal.is_authenticated:
                 # Redirect based on user role
-                if request.user.role == 'admin':
+                if principal.role == 'admin':
                     return redirect('/admin/dashboard')
-                elif request.user.role == 'mitra':
+                elif principal.role == 'mitra':
                     return redirect('/mitra/dashboard')
                 else:
                     return redirect(redirect_url)
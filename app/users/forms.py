@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 from .models import User
+from app.venues import reference
 from app.venues.models import Venue, SportsCategory
 from app.courts.models import Court
 
@@ -191,6 +194,44 @@ class VenueForm(forms.ModelForm):
         self.fields['number_of_courts'].label = 'Jumlah Lapangan'
 
 
+class SportsCategoryChoiceIterator(ModelChoiceIterator):
+    """Options of a SportsCategoryField, read from the reference-data cache"""
+    
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for category in reference.sports_categories():
+            yield self.choice(category)
+    
+    def __len__(self):
+        return len(reference.sports_categories()) + (self.field.empty_label is not None)
+    
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(reference.sports_categories())
+
+
+class SportsCategoryField(forms.ModelChoiceField):
+    """Sports category select that renders and validates without a database query"""
+    iterator = SportsCategoryChoiceIterator
+    
+    def __init__(self, **kwargs):
+        super().__init__(queryset=SportsCategory.objects.all(), **kwargs)
+    
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, SportsCategory):
+            value = value.pk
+        category = reference.sports_category(value)
+        if category is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return category
+
+
 class CourtForm(forms.ModelForm):
     """Form for creating and editing courts"""
     
@@ -211,8 +252,7 @@ class CourtForm(forms.ModelForm):
         })
     )
     
-    category = forms.ModelChoiceField(
-        queryset=SportsCategory.objects.all(),
+    category = SportsCategoryField(
         widget=forms.Select(attrs={
             'class': 'w-full px-4 py-3 rounded-xl border border-neutral-300 focus:border-primary-500 focus:ring-2 focus:ring-primary-500 focus:outline-none transition-all duration-200',
             'id': 'category'
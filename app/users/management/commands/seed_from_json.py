@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.utils import timezone
 from decimal import Decimal
 import random
@@ -10,6 +11,9 @@ from datetime import datetime, time, date, timedelta
 # Import from new apps
 from app.users.models import User
 from app.venues.models import SportsCategory, Venue, VenueImage, Facility, VenueFacility, OperationalHour
+from app.venues import reference
+from app.venues.facets import category_bit
+from app.venues.geo import geohash_encode, resolve_coordinates, validate_coordinates
 from app.courts.models import Court, CourtSession, CourtImage
 from app.bookings.models import Booking, Payment
 from app.reviews.models import Review
@@ -17,21 +21,135 @@ from app.revenue.models import ActivityLog, Pendapatan
 
 User = get_user_model()
 
+
+def iter_json_array(path, chunk_size=64 * 1024):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as file:
+        buffer = ''
+        started = False
+        eof = False
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if buffer:
+                    if buffer[0] != '[':
+                        raise ValueError(f'{path} does not contain a JSON array')
+                    buffer = buffer[1:]
+                    started = True
+                    continue
+            elif buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            elif buffer.startswith(']'):
+                return
+            elif buffer:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    if eof:
+                        raise
+                else:
+                    # A number at the very end of the buffer may still be incomplete.
+                    if end < len(buffer) or eof:
+                        yield item
+                        buffer = buffer[end:]
+                        continue
+            if eof:
+                raise ValueError(f'Unexpected end of JSON array in {path}')
+            chunk = file.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+
 class Command(BaseCommand):
     help = 'Seed the database with venue data from data.json and generate additional realistic data'
 
+    CATEGORY_DESCRIPTIONS = {
+        'FUTSAL': 'Olahraga futsal dengan lapangan indoor berukuran standar FIFA',
+        'BADMINTON': 'Olahraga badminton dengan lapangan indoor dan net standar BWF',
+        'BASKET': 'Olahraga basket dengan lapangan indoor/outdoor berstandar internasional',
+        'TENNIS': 'Olahraga tenis dengan lapangan outdoor/indoor surface berkualitas',
+        'PADEL': 'Olahraga padel dengan lapangan khusus berdinding kaca',
+        'VOLI': 'Olahraga voli dengan lapangan indoor/outdoor dan net profesional',
+    }
+
+    # Common facilities that are not listed in the JSON data
+    ADDITIONAL_FACILITIES = [
+        'CCTV',
+        'Penjaga Lapangan',
+        'Loker',
+        'First Aid Kit',
+        'Sound System',
+        'Pencahayaan LED',
+        'Area Istirahat',
+        'Lapangan Berkualitas Sintetis',
+    ]
+
+    REVIEW_COMMENTS = [
+        "Lapangan bagus banget, fasilitas lengkap. Highly recommended!",
+        "Pelayanan memuaskan, lapangan bersih dan terawat dengan baik.",
+        "Lokasi strategis, parkir luas. Pasti booking lagi next time.",
+        "Fasilitas OK, tapi bisa ditingkatkan lagi kebersihan toiletnya.",
+        "Lapangan berkualitas tinggi, harga sesuai dengan fasilitas yang ada.",
+        "Perfect venue untuk main bareng team! Lapangan mantap.",
+        "Lapangan standar internasional, sangat puas dengan kualitasnya.",
+        "Good experience overall, staff friendly dan sangat helpful.",
+        "Lapangan agak sempit untuk ukuran turnamen, tapi overall masih OK.",
+        "Excellent venue! Highly recommended untuk event dan turnamen.",
+        "Tempatnya bersih, fasilitasnya lengkap, recommended banget!",
+        "Harga agak mahal tapi sebanding dengan kualitas lapangan.",
+        "Staff ramah, booking mudah, lapangan sesuai ekspektasi.",
+        "Venue terbaik di area ini, selalu jadi pilihan utama.",
+        "Fasilitas shower dan ruang ganti sangat bersih dan nyaman."
+    ]
+
+    BOOKING_NOTES = [
+        None,
+        'Tournament practice',
+        'Company team building',
+        'Birthday celebration',
+        'Regular weekly session',
+        'Training session',
+        'League match'
+    ]
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--clear',
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Stream data.json and insert rows with bulk_create inside one transaction',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per bulk_create batch in --bulk mode (default: 500)',
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=1,
+            help='Synthesize N times the venues, bookings and reviews for load testing (implies --bulk)',
+        )
 
     def handle(self, *args, **options):
         if options['clear']:
             self.stdout.write(self.style.WARNING('Clearing existing data...'))
             self.clear_data()
 
+        if options['bulk'] or options['scale'] > 1:
+            self.stdout.write(self.style.SUCCESS(f'Starting bulk data seeding from JSON (scale {options["scale"]})...'))
+            self.seed_bulk(max(options['batch_size'], 1), max(options['scale'], 1))
+            self.stdout.write(self.style.SUCCESS('Data seeding completed successfully!'))
+            return
+
         self.stdout.write(self.style.SUCCESS('Starting data seeding from JSON...'))
         
         # Load the JSON data
@@ -58,14 +176,16 @@ class Command(BaseCommand):
 
     def load_json_data(self):
         """Load venue data from data.json"""
-        # Get the project root directory (5 levels up from this file)
-        json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), 'static', 'dataset', 'data.json')
-        
-        with open(json_path, 'r', encoding='utf-8') as file:
+        with open(self.get_json_path(), 'r', encoding='utf-8') as file:
             self.venue_data = json.load(file)
         
         self.stdout.write(f'Loaded {len(self.venue_data)} venues from JSON file')
 
+    def get_json_path(self):
+        """Path of static/dataset/data.json"""
+        # Get the project root directory (5 levels up from this file)
+        return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), 'static', 'dataset', 'data.json')
+
     def clear_data(self):
         """Clear all existing data"""
         models_to_clear = [
@@ -102,9 +222,7 @@ class Command(BaseCommand):
             admin_user.set_password('admin123')
             admin_user.save()
 
-        # Create mitra users based on unique categories from JSON
-        categories_in_data = list(set([venue['Category'] for venue in self.venue_data]))
-        
+        # Create mitra users
         mitra_templates = [
             {'name': 'Ahmad', 'surname': 'Futsal', 'location': 'Jakarta'},
             {'name': 'Sari', 'surname': 'Badminton', 'location': 'Bandung'},
@@ -223,21 +341,11 @@ class Command(BaseCommand):
         """Create sports categories based on JSON data"""
         self.stdout.write('Creating sports categories...')
         
-        # Get unique categories from JSON and create descriptions
-        category_descriptions = {
-            'FUTSAL': 'Olahraga futsal dengan lapangan indoor berukuran standar FIFA',
-            'BADMINTON': 'Olahraga badminton dengan lapangan indoor dan net standar BWF',
-            'BASKET': 'Olahraga basket dengan lapangan indoor/outdoor berstandar internasional',
-            'TENNIS': 'Olahraga tenis dengan lapangan outdoor/indoor surface berkualitas',
-            'PADEL': 'Olahraga padel dengan lapangan khusus berdinding kaca',
-            'VOLI': 'Olahraga voli dengan lapangan indoor/outdoor dan net profesional',
-        }
-        
         # Create categories from JSON data
         categories_in_data = set([venue['Category'] for venue in self.venue_data])
         
         for category_name in categories_in_data:
-            description = category_descriptions.get(category_name, f'Olahraga {category_name.lower()}')
+            description = self.CATEGORY_DESCRIPTIONS.get(category_name, f'Olahraga {category_name.lower()}')
             category, created = SportsCategory.objects.get_or_create(
                 name=category_name,
                 defaults={'description': description}
@@ -256,18 +364,7 @@ class Command(BaseCommand):
                 all_facilities.update(venue['Facilities'])
         
         # Create additional common facilities not in JSON
-        additional_facilities = [
-            'CCTV',
-            'Penjaga Lapangan',
-            'Loker',
-            'First Aid Kit',
-            'Sound System',
-            'Pencahayaan LED',
-            'Area Istirahat',
-            'Lapangan Berkualitas Sintetis',
-        ]
-        
-        all_facilities.update(additional_facilities)
+        all_facilities.update(self.ADDITIONAL_FACILITIES)
         
         for facility_name in all_facilities:
             facility, created = Facility.objects.get_or_create(
@@ -294,15 +391,7 @@ class Command(BaseCommand):
             # Generate description based on venue data
             description = self.generate_venue_description(venue_data)
             
-            # Handle contact field - could be null, string, or phone number
-            contact = venue_data.get('Contact')
-            if contact and not str(contact).startswith('+'):
-                if str(contact).startswith('08'):
-                    contact = '+62' + str(contact)[1:]  # Convert Indonesian format
-                elif str(contact).startswith('62'):
-                    contact = '+' + str(contact)
-                elif contact == 'null' or contact == '':
-                    contact = None
+            contact = self.normalize_contact(venue_data.get('Contact'))
             
             venue, created = Venue.objects.get_or_create(
                 name=venue_name,
@@ -313,6 +402,7 @@ class Command(BaseCommand):
                     'contact': contact,
                     'description': description,
                     'number_of_courts': venue_data.get('jumlahLapangan', 1),
+                    **self.venue_coordinates(venue_data),
                     'verification_status': 'approved',
                     'verified_by': admin,
                     'verification_date': timezone.now(),
@@ -333,6 +423,36 @@ class Command(BaseCommand):
 
         self.stdout.write(f'Created {Venue.objects.count()} venues from JSON data')
 
+    def venue_coordinates(self, venue_data):
+        """Latitude, longitude and geohash of a dataset venue.
+
+        Uses explicit latitude/longitude keys when present; otherwise the Maps
+        link or, for short links, the city centroid of the address.
+        """
+        try:
+            coordinates = validate_coordinates(venue_data['latitude'], venue_data['longitude'])
+        except (KeyError, TypeError, ValueError):
+            coordinates = resolve_coordinates(venue_data.get('location'), venue_data.get('address'))
+        if not coordinates:
+            return {}
+        # bulk_create skips Venue.save(), so the geohash is set here as well
+        return {
+            'latitude': coordinates[0],
+            'longitude': coordinates[1],
+            'geohash': geohash_encode(*coordinates),
+        }
+
+    def normalize_contact(self, contact):
+        """Handle contact field - could be null, string, or phone number"""
+        if contact and not str(contact).startswith('+'):
+            if str(contact).startswith('08'):
+                contact = '+62' + str(contact)[1:]  # Convert Indonesian format
+            elif str(contact).startswith('62'):
+                contact = '+' + str(contact)
+            elif contact == 'null' or contact == '':
+                contact = None
+        return contact
+
     def generate_venue_description(self, venue_data):
         """Generate a realistic description for the venue"""
         category = venue_data['Category'].lower()
@@ -460,9 +580,29 @@ class Command(BaseCommand):
         self.stdout.write('Creating court sessions...')
         
         courts = Court.objects.all()
+        session_patterns = self.get_session_patterns()
         
-        # Different session patterns based on sport type
-        session_patterns = {
+        for court in courts:
+            # Choose pattern based on court category
+            category_name = court.category.name if court.category else 'FUTSAL'
+            pattern = session_patterns.get(category_name, session_patterns['FUTSAL'])
+            
+            for session_data in pattern:
+                CourtSession.objects.get_or_create(
+                    court=court,
+                    start_time=session_data['start'],
+                    defaults={
+                        'session_name': session_data['name'],
+                        'end_time': session_data['end'],
+                        'is_active': True,
+                    }
+                )
+        
+        self.stdout.write(f'Created {CourtSession.objects.count()} court sessions')
+
+    def get_session_patterns(self):
+        """Different session patterns based on sport type"""
+        return {
             'FUTSAL': [
                 {'name': f'Session {i+1}', 'start': time(6 + i, 0), 'end': time(7 + i, 0)}
                 for i in range(17)  # 6 AM to 11 PM
@@ -486,24 +626,6 @@ class Command(BaseCommand):
                 for i in range(8)  # 2-hour blocks
             ],
         }
-        
-        for court in courts:
-            # Choose pattern based on court category
-            category_name = court.category.name if court.category else 'FUTSAL'
-            pattern = session_patterns.get(category_name, session_patterns['FUTSAL'])
-            
-            for session_data in pattern:
-                CourtSession.objects.get_or_create(
-                    court=court,
-                    start_time=session_data['start'],
-                    defaults={
-                        'session_name': session_data['name'],
-                        'end_time': session_data['end'],
-                        'is_active': True,
-                    }
-                )
-        
-        self.stdout.write(f'Created {CourtSession.objects.count()} court sessions')
 
     def create_court_images(self):
         """Create images for individual courts"""
@@ -666,15 +788,7 @@ class Command(BaseCommand):
                                 total_price=total_price,
                                 booking_status=status,
                                 payment_status=payment_status,
-                                notes=random.choice([
-                                    None, 
-                                    'Tournament practice',
-                                    'Company team building',
-                                    'Birthday celebration',
-                                    'Regular weekly session',
-                                    'Training session',
-                                    'League match'
-                                ])
+                                notes=random.choice(self.BOOKING_NOTES)
                             )
                             booking_count += 1
                         except Exception:
@@ -721,24 +835,6 @@ class Command(BaseCommand):
         
         completed_bookings = Booking.objects.filter(booking_status='completed')
         
-        review_comments = [
-            "Lapangan bagus banget, fasilitas lengkap. Highly recommended!",
-            "Pelayanan memuaskan, lapangan bersih dan terawat dengan baik.",
-            "Lokasi strategis, parkir luas. Pasti booking lagi next time.",
-            "Fasilitas OK, tapi bisa ditingkatkan lagi kebersihan toiletnya.",
-            "Lapangan berkualitas tinggi, harga sesuai dengan fasilitas yang ada.",
-            "Perfect venue untuk main bareng team! Lapangan mantap.",
-            "Lapangan standar internasional, sangat puas dengan kualitasnya.",
-            "Good experience overall, staff friendly dan sangat helpful.",
-            "Lapangan agak sempit untuk ukuran turnamen, tapi overall masih OK.",
-            "Excellent venue! Highly recommended untuk event dan turnamen.",
-            "Tempatnya bersih, fasilitasnya lengkap, recommended banget!",
-            "Harga agak mahal tapi sebanding dengan kualitas lapangan.",
-            "Staff ramah, booking mudah, lapangan sesuai ekspektasi.",
-            "Venue terbaik di area ini, selalu jadi pilihan utama.",
-            "Fasilitas shower dan ruang ganti sangat bersih dan nyaman."
-        ]
-        
         # About 65% of completed bookings have reviews
         reviewed_bookings = random.sample(
             list(completed_bookings), 
@@ -751,7 +847,7 @@ class Command(BaseCommand):
                 weights=[0.03, 0.07, 0.15, 0.35, 0.4]  # Mostly positive reviews
             )[0]
             
-            comment = random.choice(review_comments) if random.random() > 0.25 else None
+            comment = random.choice(self.REVIEW_COMMENTS) if random.random() > 0.25 else None
             
             Review.objects.create(
                 booking=booking,
@@ -847,4 +943,356 @@ class Command(BaseCommand):
                 )
             )
 
-        self.stdout.write(f'Created {ActivityLog.objects.count()} activity logs')
\ No newline at end of file
+        self.stdout.write(f'Created {ActivityLog.objects.count()} activity logs')
+
+    # Bulk loader (--bulk / --scale) ----------------------------------------
+
+    def seed_bulk(self, batch_size, scale):
+        """Seed everything with bulk_create inside a single transaction.
+
+        data.json is streamed venue by venue and foreign keys are resolved
+        through in-memory maps, so each model costs one INSERT per batch
+        instead of one query (or more) per row.
+        """
+        self.batch_size = batch_size
+
+        with transaction.atomic():
+            self.create_users()
+            admin = User.objects.filter(role='admin').first()
+            mitras = list(User.objects.filter(role='mitra'))
+            users = list(User.objects.filter(role='user'))
+
+            self.category_ids = dict(SportsCategory.objects.values_list('name', 'id'))
+            self.facility_ids = dict(Facility.objects.values_list('name', 'id'))
+            self.ensure_facilities(self.ADDITIONAL_FACILITIES)
+
+            # (court_id, price_per_hour, owner_id, [(session_id, start, end), ...])
+            self.seeded_courts = []
+            existing_names = set(Venue.objects.values_list('name', flat=True))
+            pending = []
+            venue_count = 0
+
+            for copy_index in range(scale):
+                for venue_data in iter_json_array(self.get_json_path()):
+                    name = venue_data['name'].strip()
+                    if copy_index:
+                        name = f'{name} #{copy_index + 1}'
+                    if name in existing_names:
+                        continue
+                    existing_names.add(name)
+
+                    owner = mitras[venue_count % len(mitras)]
+                    pending.append((name, venue_data, owner))
+                    venue_count += 1
+                    if len(pending) >= batch_size:
+                        self.bulk_create_venues(pending, admin)
+                        pending = []
+            if pending:
+                self.bulk_create_venues(pending, admin)
+            self.stdout.write(f'Created {venue_count} venues with {len(self.seeded_courts)} courts')
+
+            self.bulk_create_bookings(users, admin, scale)
+            self.bulk_create_activity_logs(scale)
+
+    def ensure_facilities(self, names):
+        """Insert facilities missing from the in-memory name -> id map"""
+        missing = [name for name in set(names) if name not in self.facility_ids]
+        if not missing:
+            return
+        Facility.objects.bulk_create(
+            [Facility(name=name, description=f'Fasilitas {name} tersedia di venue') for name in missing],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.facility_ids.update(Facility.objects.filter(name__in=missing).values_list('name', 'id'))
+        reference.invalidate()  # bulk_create sends no post_save
+
+    def get_category_id(self, category_name):
+        """Resolve a category through the in-memory map, creating it on first use"""
+        if category_name not in self.category_ids:
+            category, _ = SportsCategory.objects.get_or_create(
+                name=category_name,
+                defaults={'description': self.CATEGORY_DESCRIPTIONS.get(category_name, f'Olahraga {category_name.lower()}')}
+            )
+            self.category_ids[category_name] = category.id
+        return self.category_ids[category_name]
+
+    def operational_hour_rows(self, venue, hour_strings):
+        """Build the 7 OperationalHour rows of a venue, falling back to 06:00-23:00"""
+        rows = []
+        for day_index in range(7):
+            open_time, close_time = time(6, 0), time(23, 0)
+            hour_string = hour_strings[day_index] if len(hour_strings or []) == 7 else None
+            if hour_string and ' - ' in hour_string:
+                try:
+                    open_str, close_str = hour_string.split(' - ')
+                    open_time = self.parse_time_string(open_str)
+                    close_time = self.parse_time_string(close_str)
+                except ValueError:
+                    open_time, close_time = time(6, 0), time(23, 0)
+            rows.append(OperationalHour(
+                venue=venue,
+                day_of_week=day_index,
+                open_time=open_time,
+                close_time=close_time,
+                is_closed=False,
+            ))
+        return rows
+
+    def bulk_create_venues(self, pending, admin):
+        """Insert one batch of venues together with all of their child rows"""
+        now = timezone.now()
+        self.ensure_facilities(
+            facility for _, venue_data, _ in pending for facility in (venue_data.get('Facilities') or [])
+        )
+
+        venues, venue_images, venue_facilities, hours, courts = [], [], [], [], []
+        image_urls_by_venue = {}
+        for name, venue_data, owner in pending:
+            venue = Venue(
+                owner=owner,
+                name=name,
+                address=venue_data['address'],
+                location_url=venue_data.get('location', ''),
+                contact=self.normalize_contact(venue_data.get('Contact')),
+                description=self.generate_venue_description(venue_data),
+                number_of_courts=venue_data.get('jumlahLapangan', 1),
+                verification_status='approved',
+                verified_by=admin,
+                verification_date=now,
+                **self.venue_coordinates(venue_data),
+            )
+            venues.append(venue)
+
+            image_urls = [f'/static/img/dataset-photos/{image_file}' for image_file in (venue_data.get('Image') or [])]
+            if image_urls:
+                for i, image_url in enumerate(image_urls):
+                    venue_images.append(VenueImage(
+                        venue=venue,
+                        image_url=image_url,
+                        is_primary=(i == 0),
+                        caption=f'{name} - View {i+1}',
+                    ))
+            else:
+                venue_images.append(VenueImage(
+                    venue=venue,
+                    image_url='/static/img/dataset-photos/default-venue.jpg',
+                    is_primary=True,
+                    caption=f'{name} - Main View',
+                ))
+            image_urls_by_venue[venue.id] = image_urls
+
+            for facility_name in set(venue_data.get('Facilities') or []):
+                venue_facilities.append(VenueFacility(venue=venue, facility_id=self.facility_ids[facility_name]))
+
+            hours.extend(self.operational_hour_rows(venue, venue_data.get('OperationalHours', [])))
+
+            category_id = self.get_category_id(venue_data['Category'])
+            price = Decimal(str(venue_data.get('Price', 100000)))
+            # bulk_create bypasses the Court signals that maintain these
+            if venue.number_of_courts:
+                venue.min_price = venue.max_price = price
+                venue.category_mask = category_bit(venue_data['Category']) or 0
+            for i in range(venue.number_of_courts):
+                court = Court(
+                    venue=venue,
+                    name=f"Court {i+1}" if venue.number_of_courts > 1 else "Main Court",
+                    category_id=category_id,
+                    price_per_hour=price,
+                    is_active=True,
+                    description=venue.description,
+                    maintenance_notes=None if random.random() > 0.1 else 'Regular maintenance schedule',
+                )
+                court.category_name = venue_data['Category']
+                courts.append(court)
+
+        Venue.objects.bulk_create(venues, batch_size=self.batch_size)
+        VenueImage.objects.bulk_create(venue_images, batch_size=self.batch_size)
+        VenueFacility.objects.bulk_create(venue_facilities, batch_size=self.batch_size)
+        OperationalHour.objects.bulk_create(hours, batch_size=self.batch_size)
+        Court.objects.bulk_create(courts, batch_size=self.batch_size)
+
+        if not connection.features.can_return_rows_from_bulk_insert:
+            court_ids = {
+                (venue_id, name): court_id
+                for venue_id, name, court_id in Court.objects.filter(venue__in=venues).values_list('venue_id', 'name', 'id')
+            }
+            for court in courts:
+                court.pk = court_ids[(court.venue_id, court.name)]
+
+        session_patterns = self.get_session_patterns()
+        sessions, court_images = [], []
+        for court in courts:
+            pattern = session_patterns.get(court.category_name, session_patterns['FUTSAL'])
+            for session_data in pattern:
+                sessions.append(CourtSession(
+                    court=court,
+                    session_name=session_data['name'],
+                    start_time=session_data['start'],
+                    end_time=session_data['end'],
+                    is_active=True,
+                ))
+
+            image_urls = image_urls_by_venue[court.venue_id][:2] or ['/static/img/dataset-photos/default-court.jpg']
+            for i, image_url in enumerate(image_urls):
+                court_images.append(CourtImage(
+                    court=court,
+                    image_url=image_url,
+                    is_primary=(i == 0),
+                    caption=f'{court.name} - View {i+1}' if image_url != '/static/img/dataset-photos/default-court.jpg' else f'{court.name} - Main View',
+                ))
+
+        CourtSession.objects.bulk_create(sessions, batch_size=self.batch_size)
+        CourtImage.objects.bulk_create(court_images, batch_size=self.batch_size)
+
+        if not connection.features.can_return_rows_from_bulk_insert:
+            sessions = list(CourtSession.objects.filter(court__in=courts))
+        sessions_by_court = {}
+        for session in sessions:
+            sessions_by_court.setdefault(session.court_id, []).append(
+                (session.pk, session.start_time, session.end_time)
+            )
+        owner_by_venue = {venue.id: venue.owner_id for venue in venues}
+        for court in courts:
+            self.seeded_courts.append((
+                court.pk,
+                court.price_per_hour,
+                owner_by_venue[court.venue_id],
+                sessions_by_court.get(court.pk, []),
+            ))
+
+    def bulk_create_bookings(self, users, admin, scale):
+        """Synthesize bookings, payments, pendapatan and reviews for the seeded courts"""
+        courts = [court for court in self.seeded_courts if court[3]]
+        if not courts or not users:
+            self.stdout.write('No new courts to book, skipping bookings')
+            return
+
+        today = date.today()
+        start_date = today - timedelta(days=30)
+        end_date = today + timedelta(days=14)
+        max_bookings = 150 * scale
+        payment_methods = ['bank_transfer', 'e_wallet', 'credit_card', 'cash']
+
+        bookings, payments, pendapatan, reviews = [], [], [], []
+        taken_slots = set()
+        current_date = start_date
+
+        while current_date <= end_date and len(bookings) < max_bookings:
+            # Random chance of having bookings on any given day
+            if random.random() < 0.7:
+                for _ in range(random.randint(1, 8) * scale):
+                    court_id, price_per_hour, owner_id, court_sessions = random.choice(courts)
+                    session_id, start_time, end_time = random.choice(court_sessions)
+                    if (court_id, session_id, current_date) in taken_slots:
+                        continue
+                    taken_slots.add((court_id, session_id, current_date))
+
+                    duration = Decimal(
+                        (datetime.combine(current_date, end_time) - datetime.combine(current_date, start_time)).seconds
+                    ) / Decimal(3600)
+                    total_price = price_per_hour * duration
+
+                    # Determine status based on date
+                    if current_date < today:
+                        status = random.choices(['completed', 'cancelled'], weights=[0.85, 0.15])[0]
+                    elif current_date == today:
+                        status = random.choices(['confirmed', 'pending'], weights=[0.8, 0.2])[0]
+                    else:
+                        status = random.choices(['confirmed', 'pending'], weights=[0.7, 0.3])[0]
+                    payment_status = 'paid' if status in ['completed', 'confirmed'] else 'unpaid'
+
+                    booking = Booking(
+                        user=random.choice(users),
+                        court_id=court_id,
+                        session_id=session_id,
+                        booking_date=current_date,
+                        start_time=start_time,
+                        end_time=end_time,
+                        duration_hours=duration,
+                        total_price=total_price,
+                        booking_status=status,
+                        payment_status=payment_status,
+                        notes=random.choice(self.BOOKING_NOTES),
+                    )
+                    bookings.append(booking)
+
+                    if payment_status != 'paid':
+                        continue
+
+                    payments.append(Payment(
+                        booking=booking,
+                        amount=total_price,
+                        payment_method=random.choice(payment_methods),
+                        transaction_id=f'TXN{random.randint(100000, 999999)}',
+                        verified_by=admin if random.random() > 0.15 else None,
+                        paid_at=timezone.now(),
+                    ))
+
+                    # Pendapatan.save() is bypassed by bulk_create, so compute the commission here
+                    commission_rate = Decimal(str(random.choice([5.00, 7.50, 10.00, 12.50, 15.00])))
+                    commission_amount = (total_price * commission_rate) / Decimal('100')
+                    if current_date < today - timedelta(days=14):
+                        revenue_status = 'paid'
+                    elif current_date < today:
+                        revenue_status = random.choice(['paid', 'pending'])
+                    else:
+                        revenue_status = 'pending'
+                    pendapatan.append(Pendapatan(
+                        mitra_id=owner_id,
+                        booking=booking,
+                        amount=total_price,
+                        commission_rate=commission_rate,
+                        commission_amount=commission_amount,
+                        net_amount=total_price - commission_amount,
+                        payment_status=revenue_status,
+                        paid_at=timezone.now() if revenue_status == 'paid' else None,
+                    ))
+
+                    # About 65% of completed bookings have reviews
+                    if status == 'completed' and random.random() < 0.65:
+                        reviews.append(Review(
+                            booking=booking,
+                            rating=random.choices([1, 2, 3, 4, 5], weights=[0.03, 0.07, 0.15, 0.35, 0.4])[0],
+                            comment=random.choice(self.REVIEW_COMMENTS) if random.random() > 0.25 else None,
+                        ))
+            current_date += timedelta(days=1)
+
+        Booking.objects.bulk_create(bookings, batch_size=self.batch_size)
+        Payment.objects.bulk_create(payments, batch_size=self.batch_size)
+        Pendapatan.objects.bulk_create(pendapatan, batch_size=self.batch_size)
+        Review.objects.bulk_create(reviews, batch_size=self.batch_size)
+
+        self.stdout.write(
+            f'Created {len(bookings)} bookings, {len(payments)} payments, '
+            f'{len(pendapatan)} pendapatan records and {len(reviews)} reviews'
+        )
+
+    def bulk_create_activity_logs(self, scale):
+        """Create activity logs for user actions"""
+        users = list(User.objects.only('id', 'username', 'role'))
+        actions = ['login', 'logout', 'booking', 'payment', 'update', 'create', 'view']
+        logs = []
+
+        for _ in range(300 * scale):
+            user = random.choice(users)
+            action = random.choice(actions)
+            descriptions = {
+                'login': f'User {user.username} logged in successfully',
+                'logout': f'User {user.username} logged out',
+                'booking': f'User {user.username} created a new booking',
+                'payment': f'User {user.username} completed payment transaction',
+                'update': f'User {user.username} updated profile information',
+                'create': f'User {user.username} created new venue' if user.role == 'mitra' else f'User {user.username} registered account',
+                'view': f'User {user.username} viewed venue details',
+            }
+            logs.append(ActivityLog(
+                user=user,
+                action_type=action,
+                description=descriptions[action],
+                ip_address=f'192.168.{random.randint(1, 255)}.{random.randint(1, 255)}',
+                user_agent='Mozilla/5.0 (compatible; LapangIN/1.0)',
+            ))
+
+        ActivityLog.objects.bulk_create(logs, batch_size=self.batch_size)
+        self.stdout.write(f'Created {len(logs)} activity logs')
@@ -40,3 +40,18 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
+
+# Refresh tokens issued to the mobile app (app.users.tokens); a row marks one as
+# still usable, so single use and logout hold on every worker
+class RefreshToken(models.Model):
+    jti = models.CharField(max_length=32, primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_tokens')
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(blank=True, null=True)  # Refreshed or logged out
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.jti}"
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'expires_at'])]
@@ -0,0 +1,118 @@
+"""
+The authenticated principal: a user's id, role and verification flag.
+
+Authorization checks only need these three values, yet ``request.user``
+loads the whole User row on first access. At login the principal is copied
+into the session, and :func:`get_principal` answers from there without a
+user-table query; ``request.user`` still loads lazily for views that touch
+profile fields. A stored principal is trusted for PRINCIPAL_TTL seconds and
+until its user is saved again (a role change, verification, deactivation, new
+password), which records a change stamp in the Django cache. After that the
+principal is rebuilt from ``request.user``, which also runs Django's session
+checks. The stamp only reaches other workers through a shared cache (REDIS_URL),
+and the per-process default may also evict it, so without one the session
+copy is trusted for a much shorter PRINCIPAL_TTL (see settings).
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+
+
+PRINCIPAL_SESSION_KEY = '_auth_principal'
+
+
+class Principal:
+    """Id, role and verification flag of an authenticated user"""
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, id, role, is_verified):
+        self.id = id
+        self.role = role
+        self.is_verified = is_verified
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(str(user.pk), user.role, user.is_verified)
+
+    def __repr__(self):
+        return f'<Principal {self.id} ({self.role})>'
+
+
+class AnonymousPrincipal:
+    id = None
+    role = None
+    is_verified = False
+    is_authenticated = False
+    is_anonymous = True
+
+
+ANONYMOUS = AnonymousPrincipal()
+
+
+def _ttl():
+    return getattr(settings, 'PRINCIPAL_TTL', 30)
+
+
+def _stamp_ttl():
+    # Long enough to outlive every principal and access token issued before it
+    return max(_ttl(), getattr(settings, 'ACCESS_TOKEN_TTL', 0))
+
+
+def _changed_key(user_id):
+    return f'principal-changed:{user_id}'
+
+
+def remember(session, user):
+    """Store ``user``'s principal in ``session``"""
+    principal = Principal.from_user(user)
+    session[PRINCIPAL_SESSION_KEY] = {
+        'id': principal.id,
+        'role': principal.role,
+        'is_verified': principal.is_verified,
+        'loaded_at': time.time(),
+    }
+    return principal
+
+
+def user_changed(user_id):
+    """Make stored principals (and access tokens) of ``user_id`` stale"""
+    cache.set(_changed_key(user_id), time.time(), _stamp_ttl())
+
+
+def changed_since(user_id, timestamp):
+    """Whether ``user_id`` was saved (or logged out of its tokens) at or after ``timestamp``"""
+    changed_at = cache.get(_changed_key(user_id))
+    return changed_at is not None and changed_at >= timestamp
+
+
+def _stored(session):
+    stored = session.get(PRINCIPAL_SESSION_KEY)
+    if not stored or stored.get('id') != session.get(SESSION_KEY):
+        return None
+    loaded_at = stored.get('loaded_at', 0)
+    if time.time() - loaded_at > _ttl() or changed_since(stored['id'], loaded_at):
+        return None
+    return Principal(stored['id'], stored['role'], stored['is_verified'])
+
+
+def get_principal(request):
+    """The principal of ``request`` (AnonymousPrincipal if not logged in), resolved once per request"""
+    principal = getattr(request, '_principal', None)
+    if principal is not None:
+        return principal
+
+    session = getattr(request, 'session', None)
+    principal = _stored(session) if session is not None else None
+    if principal is None:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            principal = ANONYMOUS
+        elif session is not None and session.get(SESSION_KEY) == str(user.pk):
+            principal = remember(session, user)
+        else:
+            principal = Principal.from_user(user)
+    request._principal = principal
+    return principal
@@ -0,0 +1,22 @@
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.users import principal
+from app.users.models import User
+
+
+@receiver(user_logged_in)
+def remember_principal(sender, request, user, **kwargs):
+    """Sessions carry the principal from login on (app.users.principal)"""
+    if request is not None and hasattr(request, 'session'):
+        principal.remember(request.session, user)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def expire_principal(sender, instance, update_fields=None, **kwargs):
+    """A changed role, verification or password must not wait for the principal TTL"""
+    if update_fields == {'last_login'}:
+        return  # Saved by every login
+    principal.user_changed(instance.pk)
@@ -265,6 +265,148 @@ class UserDecoratorsTestCase(TestCase):
         self.assertIn('/mitra/dashboard', response.url)
 
 
+class PrincipalTestCase(TestCase):
+    """Test cases for the session principal used by the role checks"""
+    
+    def setUp(self):
+        """Set up a logged-in mitra"""
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            role='mitra'
+        )
+        self.client.login(username='testmitra', password='testpass123')
+    
+    def user_queries(self, path):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [q['sql'] for q in queries if 'FROM "users_user"' in q['sql']]
+    
+    def test_role_check_skips_user_query(self):
+        """Test a role-protected API authorizes from the session alone"""
+        self.assertEqual(self.user_queries('/api/courts/'), [])
+        self.assertEqual(self.user_queries('/api/bookings/?fields=id'), [])
+    
+    def test_saved_role_change_applies_immediately(self):
+        """Test saving the user expires the stored principal"""
+        self.mitra.role = 'user'
+        self.mitra.save()
+        
+        response = self.client.get('/api/courts/')
+        self.assertEqual(response.status_code, 403)
+    
+    def test_principal_expires_after_ttl(self):
+        """Test a change made without a save signal applies once the TTL has passed"""
+        from django.test import override_settings
+        User.objects.filter(pk=self.mitra.pk).update(role='user')
+        self.assertEqual(self.client.get('/api/courts/').status_code, 200)
+        
+        with override_settings(PRINCIPAL_TTL=-1):
+            self.assertEqual(self.client.get('/api/courts/').status_code, 403)
+
+
+class TokenAuthTestCase(TestCase):
+    """Test cases for the bearer token mode of the mobile API"""
+    
+    def setUp(self):
+        """Set up a mitra and log in with tokens"""
+        self.mitra = User.objects.create_user(
+            username='tokenmitra',
+            password='testpass123',
+            role='mitra'
+        )
+        self.tokens = self.login()
+    
+    def login(self):
+        response = self.client.post('/api/login/', data=json.dumps({
+            'username': 'tokenmitra', 'password': 'testpass123', 'auth': 'token'
+        }), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['tokens']
+    
+    def get(self, path, access_token=None):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {access_token or self.tokens["access_token"]}')
+    
+    def refresh(self, refresh_token):
+        return self.client.post('/api/token/refresh/', data=json.dumps({
+            'refresh_token': refresh_token
+        }), content_type='application/json')
+    
+    def test_token_login_creates_no_session(self):
+        """Test token login and bearer requests never touch the session or user tables"""
+        from django.contrib.sessions.models import Session
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.assertEqual(self.tokens['token_type'], 'Bearer')
+        self.assertEqual(Session.objects.count(), 0)
+        self.assertNotIn('sessionid', self.client.cookies)
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get('/api/courts/')
+        self.assertEqual(response.status_code, 200)
+        tables = ' '.join(q['sql'] for q in queries)
+        self.assertNotIn('django_session', tables)
+        self.assertNotIn('FROM "users_user"', tables)
+    
+    def test_invalid_and_expired_tokens(self):
+        """Test a tampered or expired access token is rejected"""
+        from django.test import override_settings
+        response = self.get('/api/courts/', self.tokens['access_token'] + 'x')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer error="invalid_token"')
+        with override_settings(ACCESS_TOKEN_TTL=-1):
+            self.assertEqual(self.get('/api/courts/').status_code, 401)
+        # A refresh token is not an access token
+        self.assertEqual(self.get('/api/courts/', self.tokens['refresh_token']).status_code, 401)
+    
+    def test_refresh_rotates_and_applies_role_changes(self):
+        """Test refresh issues new tokens once per refresh token and re-reads the role"""
+        self.mitra.role = 'user'
+        self.mitra.save()
+        self.assertEqual(self.get('/api/courts/').status_code, 401)
+        
+        response = self.refresh(self.tokens['refresh_token'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['role'], 'user')
+        self.assertEqual(self.get('/api/courts/', response.json()['tokens']['access_token']).status_code, 403)
+        
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 401)
+
+    def test_used_refresh_token_survives_cache_loss(self):
+        """Test single use holds when the cache is emptied, as on another worker"""
+        from django.core.cache import cache
+        from app.users.models import RefreshToken
+
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 200)
+        cache.clear()
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 401)
+        self.assertEqual(RefreshToken.objects.filter(user=self.mitra, used_at__isnull=True).count(), 1)
+
+    def test_password_change_revokes_refresh_token(self):
+        """Test refresh tokens issued before a password change are rejected"""
+        self.mitra.set_password('newpass456')
+        self.mitra.save()
+        
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 401)
+    
+    def test_logout_revokes_tokens(self):
+        """Test a bearer logout revokes the access token and the given refresh token"""
+        response = self.client.post(
+            '/api/logout/',
+            data=json.dumps({'refresh_token': self.tokens['refresh_token']}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens["access_token"]}',
+        )
+        self.assertEqual(response.status_code, 200)
+        
+        self.assertEqual(self.get('/api/courts/').status_code, 401)
+        self.assertEqual(self.refresh(self.tokens['refresh_token']).status_code, 401)
+
+
 class UserAPITestCase(TestCase):
     """Test cases for user API endpoints"""
     
@@ -593,3 +735,34 @@ class UserAPITestCase(TestCase):
         response_data = response.json()
         self.assertEqual(response_data['status'], 'success')
 
+
+class SeedFromJsonTestCase(TestCase):
+    """Test cases for the streaming JSON reader used by seed_from_json --bulk"""
+
+    def test_iter_json_array_across_chunks(self):
+        """Test items are decoded correctly when they span several read chunks"""
+        import os
+        import tempfile
+        from app.users.management.commands.seed_from_json import iter_json_array
+
+        items = [{'name': f'Venue {i}', 'Price': 100000 + i, 'Facilities': ['Parkir', 'Toilet']} for i in range(25)]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as fh:
+            json.dump(items + [12345], fh, indent=2)
+        try:
+            self.assertEqual(list(iter_json_array(fh.name, chunk_size=7)), items + [12345])
+        finally:
+            os.unlink(fh.name)
+
+    def test_iter_json_array_rejects_non_array(self):
+        """Test a JSON object at the top level is rejected"""
+        import os
+        import tempfile
+        from app.users.management.commands.seed_from_json import iter_json_array
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as fh:
+            fh.write('{"name": "Venue"}')
+        try:
+            with self.assertRaises(ValueError):
+                list(iter_json_array(fh.name))
+        finally:
+            os.unlink(fh.name)
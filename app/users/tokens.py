@@ -0,0 +1,141 @@
+"""
+Signed bearer tokens for the mobile client.
+
+``api_login`` with ``"auth": "token"`` returns a short-lived access token and
+a long-lived refresh token instead of creating a session. The tokens are
+signed with django.core.signing (SECRET_KEY), so checking one needs neither
+the session table nor the user table. An access token carries the principal
+(id, role, is_verified) and is sent as ``Authorization: Bearer <token>``;
+TokenAuthenticationMiddleware turns it into ``request.principal``. It is
+rejected once ACCESS_TOKEN_TTL has passed, or if the user was saved or
+logged out after it was issued (the change stamp of app.users.principal).
+
+``api_token_refresh`` trades a refresh token for a new pair, re-reading the
+user so role changes apply. Refresh tokens are bound to the password hash,
+so a password change revokes them, and each one is single use: its id is
+recorded in the RefreshToken table, which refreshing or logging out marks as
+used. The table is shared by every worker and nothing evicts it. Access tokens
+are only revoked through the cache, so without a shared cache they stay valid
+on other workers until they expire (ACCESS_TOKEN_TTL is short then).
+"""
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.utils import timezone
+
+from app.users import principal as principals
+from app.users.models import RefreshToken, User
+
+
+ACCESS_SALT = 'lapangin.tokens.access'
+REFRESH_SALT = 'lapangin.tokens.refresh'
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def _access_ttl():
+    return settings.ACCESS_TOKEN_TTL
+
+
+def _refresh_ttl():
+    return settings.REFRESH_TOKEN_TTL
+
+
+def _password_stamp(user):
+    return user.get_session_auth_hash()[:16]
+
+
+def bearer_token(request):
+    """The token of an ``Authorization: Bearer`` header, or None"""
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header[:7].lower() != 'bearer ':
+        return None
+    return header[7:].strip()
+
+
+def issue_tokens(user):
+    """Access and refresh token for ``user``, in the shape returned by the login API"""
+    now = time.time()
+    access = signing.dumps(
+        {'sub': str(user.pk), 'role': user.role, 'ver': user.is_verified, 'iat': now},
+        salt=ACCESS_SALT,
+    )
+    issued_at = timezone.now()
+    RefreshToken.objects.filter(user=user, expires_at__lte=issued_at).delete()
+    token = RefreshToken.objects.create(
+        jti=uuid.uuid4().hex,
+        user=user,
+        expires_at=issued_at + timedelta(seconds=_refresh_ttl()),
+    )
+    refresh = signing.dumps(
+        {'sub': str(user.pk), 'jti': token.jti, 'pwd': _password_stamp(user)},
+        salt=REFRESH_SALT,
+    )
+    return {
+        'token_type': 'Bearer',
+        'access_token': access,
+        'expires_in': _access_ttl(),
+        'refresh_token': refresh,
+        'refresh_expires_in': _refresh_ttl(),
+    }
+
+
+def principal_from_access_token(token):
+    """The Principal carried by ``token``; raises InvalidToken"""
+    try:
+        payload = signing.loads(token, salt=ACCESS_SALT, max_age=_access_ttl())
+    except signing.BadSignature:  # Includes SignatureExpired
+        raise InvalidToken('Invalid or expired access token')
+    if principals.changed_since(payload['sub'], payload['iat']):
+        raise InvalidToken('Access token revoked')
+    return principals.Principal(payload['sub'], payload['role'], payload['ver'])
+
+
+def _load_refresh_token(token):
+    try:
+        return signing.loads(token, salt=REFRESH_SALT, max_age=_refresh_ttl())
+    except signing.BadSignature:
+        raise InvalidToken('Invalid or expired refresh token')
+
+
+def _use_refresh_token(payload):
+    """Mark the refresh token of ``payload`` as used; False if it already was"""
+    now = timezone.now()
+    # A conditional UPDATE is atomic, so only one request can use a token
+    return RefreshToken.objects.filter(
+        jti=payload['jti'], user_id=payload['sub'], used_at__isnull=True, expires_at__gt=now
+    ).update(used_at=now) == 1
+
+
+def refresh_tokens(token):
+    """New tokens for a valid refresh ``token``, which is revoked; raises InvalidToken"""
+    payload = _load_refresh_token(token)
+    if not _use_refresh_token(payload):
+        raise InvalidToken('Refresh token already used')
+    user = User.objects.filter(pk=payload['sub'], is_active=True).first()
+    if user is None or payload['pwd'] != _password_stamp(user):
+        raise InvalidToken('Refresh token revoked')
+    return user, issue_tokens(user)
+
+
+def revoke(user_id, refresh_token=None):
+    """Log ``user_id`` out of its access tokens and, if given, ``refresh_token``"""
+    principals.user_changed(user_id)
+    if refresh_token:
+        try:
+            payload = _load_refresh_token(refresh_token)
+        except InvalidToken:
+            return
+        if payload['sub'] == str(user_id):
+            _use_refresh_token(payload)
+
+
+def get_user(user_id):
+    """The User of a token principal, loaded when a view first touches request.user"""
+    return User.objects.filter(pk=user_id, is_active=True).first() or AnonymousUser()
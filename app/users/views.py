@@ -1,6 +1,7 @@
 from django.shortcuts import redirect
 from django.http import JsonResponse
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.models import update_last_login
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
@@ -12,6 +13,7 @@ from app.revenue.models import ActivityLog
 # Import forms
 from .forms import CustomUserCreationForm, CustomUserUpdateForm
 from .utils import get_client_ip
+from . import tokens
 
 
 def index(request):
@@ -21,7 +23,11 @@ def index(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def api_login(request):
-    """API endpoint for login - for AJAX requests"""
+    """API endpoint for login - for AJAX requests
+
+    With ``"auth": "token"`` no session is created; the response carries
+    bearer tokens instead (app.users.tokens).
+    """
     try:
         data = json.loads(request.body)
         username = data.get('username')
@@ -36,7 +42,11 @@ def api_login(request):
         user = authenticate(username=username, password=password)
         
         if user is not None:
-            login(request, user)
+            token_auth = data.get('auth') == 'token'
+            if token_auth:
+                update_last_login(None, user)
+            else:
+                login(request, user)
             
             # Log the login activity
             ActivityLog.objects.create(
@@ -54,7 +64,7 @@ def api_login(request):
             elif user.role == 'mitra':
                 redirect_url = '/mitra/dashboard'
             
-            return JsonResponse({
+            response_data = {
                 'success': True,
                 'message': f'Login berhasil! Selamat datang, {user.first_name}',
                 'user': {
@@ -64,7 +74,10 @@ def api_login(request):
                     'role': user.role
                 },
                 'redirect_url': redirect_url
-            })
+            }
+            if token_auth:
+                response_data['tokens'] = tokens.issue_tokens(user)
+            return JsonResponse(response_data)
         else:
             return JsonResponse({
                 'success': False,
@@ -142,7 +155,7 @@ def api_register(request):
 def api_logout(request):
     """API endpoint for logout - for AJAX requests"""
     try:
-        if request.user.is_authenticated:
+        if request.principal.is_authenticated:
             # Log the logout activity
             ActivityLog.objects.create(
                 user=request.user,
@@ -152,7 +165,15 @@ def api_logout(request):
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
             )
             
-            logout(request)
+            if tokens.bearer_token(request) is not None:
+                # Bearer token client: revoke its tokens, there is no session
+                try:
+                    refresh_token = json.loads(request.body or b'{}').get('refresh_token')
+                except (json.JSONDecodeError, AttributeError):
+                    refresh_token = None
+                tokens.revoke(request.principal.id, refresh_token)
+            else:
+                logout(request)
             
             return JsonResponse({
                 'success': True,
@@ -171,10 +192,55 @@ def api_logout(request):
         }, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def api_token_refresh(request):
+    """API endpoint trading a refresh token for new bearer tokens (app.users.tokens)"""
+    try:
+        data = json.loads(request.body)
+        refresh_token = data.get('refresh_token')
+        
+        if not refresh_token:
+            return JsonResponse({
+                'success': False,
+                'message': 'refresh_token harus diisi'
+            }, status=400)
+        
+        try:
+            user, issued = tokens.refresh_tokens(refresh_token)
+        except tokens.InvalidToken as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=401)
+        
+        return JsonResponse({
+            'success': True,
+            'user': {
+                'id': str(user.id),
+                'username': user.username,
+                'first_name': user.first_name,
+                'role': user.role
+            },
+            'tokens': issued
+        })
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'message': 'Format data tidak valid'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Terjadi kesalahan server'
+        }, status=500)
+
+
 @require_http_methods(["GET"])
 def api_user_status(request):
     """Check if user is authenticated and return user data"""
-    if request.user.is_authenticated:
+    if request.principal.is_authenticated:
         return JsonResponse({
             'success': True,
             'authenticated': True,
@@ -198,7 +264,7 @@ def api_user_status(request):
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE", "POST"])
 def api_profile(request):
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'success': False, 'message': 'Authentication required'}, status=401)
 
     user = request.user
@@ -305,13 +371,13 @@ def api_profile(request):
 @require_http_methods(["GET"])
 def api_user_dashboard(request):
     """API endpoint for user dashboard data"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'user':
+    if request.principal.role != 'user':
         return JsonResponse({
             'success': False,
             'message': 'Access denied'
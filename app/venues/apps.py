@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VenuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.venues'
+
+    def ready(self):
+        # Register signal handlers
+        from app.venues import signals  # noqa: F401
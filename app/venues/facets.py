@@ -0,0 +1,144 @@
+"""
+Per-venue search summaries and facet counts for the venue listing.
+
+Each venue stores the price range and the set of sports of its courts
+(``min_price``, ``max_price`` and ``category_mask``, one bit per
+SportsCategory choice), so category and price filters are plain column
+comparisons instead of DISTINCT joins over courts. :func:`facet_counts`
+computes the category counts and the price histogram for a search in a
+single aggregate query.
+"""
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.lookups import GreaterThan
+
+from app.courts.models import Court
+from app.venues.models import SportsCategory, Venue
+
+
+# Bit index of each category follows the order of CATEGORY_CHOICES; append
+# new choices at the end so stored masks stay valid
+CATEGORY_BITS = {name: 1 << index for index, (name, _) in enumerate(SportsCategory.CATEGORY_CHOICES)}
+CATEGORY_LABELS = dict(SportsCategory.CATEGORY_CHOICES)
+
+# Spellings used by static/dataset/data.json for categories outside the choices
+CATEGORY_ALIASES = {'TENNIS': 'TENIS'}
+
+# Histogram bucket edges (Rp per hour) for the starting price of a venue;
+# the last bucket is open-ended
+PRICE_BUCKETS = [0, 50000, 100000, 150000, 200000, 300000]
+
+
+def category_bit(name):
+    """Mask bit of a SportsCategory name (case-insensitive), or None if unknown"""
+    name = (name or '').strip().upper()
+    return CATEGORY_BITS.get(CATEGORY_ALIASES.get(name, name))
+
+
+def categories_from_mask(mask):
+    return [name for name, bit in CATEGORY_BITS.items() if mask & bit]
+
+
+def parse_price(value):
+    """Decimal price from a query parameter; raises ValueError if invalid"""
+    try:
+        price = Decimal(str(value))
+    except (InvalidOperation, TypeError):
+        raise ValueError('Invalid price')
+    if not price.is_finite() or price < 0:
+        raise ValueError('Invalid price')
+    return price
+
+
+def category_filter(names):
+    """Q matching venues with a court in any of the categories ``names``.
+
+    Unknown names match nothing, like the old join on courts__category__name.
+    """
+    mask = 0
+    for name in names:
+        mask |= category_bit(name) or 0
+    return Q(GreaterThan(F('category_mask').bitand(mask), 0)) if mask else Q(pk__in=[])
+
+
+def price_filter(min_price=None, max_price=None):
+    """Q matching venues with a court priced at least ``min_price`` and one at most ``max_price``"""
+    query = Q()
+    if min_price is not None:
+        query &= Q(max_price__gte=min_price)
+    if max_price is not None:
+        query &= Q(min_price__lte=max_price)
+    return query
+
+
+def _bucket_bounds():
+    edges = PRICE_BUCKETS + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def facet_counts(queryset, category_q=Q(), price_q=Q()):
+    """Category counts and starting-price histogram for ``queryset`` in one query.
+
+    ``queryset`` is the search without the category and price filters. Each
+    facet is counted with the other facet's filter applied but not its own,
+    so selecting "Futsal" still shows how many venues the other sports have.
+    """
+    aggregates = {
+        'price_min': Min('min_price', filter=category_q),
+        'price_max': Max('max_price', filter=category_q),
+    }
+    for name, bit in CATEGORY_BITS.items():
+        aggregates[f'category_{name}'] = Count(
+            'pk', filter=price_q & Q(GreaterThan(F('category_mask').bitand(bit), 0))
+        )
+    for index, (low, high) in enumerate(_bucket_bounds()):
+        bucket_q = Q(min_price__gte=low)
+        if high is not None:
+            bucket_q &= Q(min_price__lt=high)
+        aggregates[f'price_{index}'] = Count('pk', filter=category_q & bucket_q)
+
+    totals = queryset.order_by().aggregate(**aggregates)
+    return {
+        'categories': [
+            {'name': name, 'label': CATEGORY_LABELS[name], 'count': totals[f'category_{name}']}
+            for name in CATEGORY_BITS
+        ],
+        'price_buckets': [
+            {'min': low, 'max': high, 'count': totals[f'price_{index}']}
+            for index, (low, high) in enumerate(_bucket_bounds())
+        ],
+        'price_range': {
+            'min': float(totals['price_min']) if totals['price_min'] is not None else None,
+            'max': float(totals['price_max']) if totals['price_max'] is not None else None,
+        },
+    }
+
+
+def refresh_venue_summaries(venue_ids):
+    """Recompute min_price, max_price and category_mask of the given venues from their courts"""
+    venue_ids = list(venue_ids)
+    if not venue_ids:
+        return 0
+    prices = {
+        row['venue_id']: row
+        for row in Court.objects.filter(venue_id__in=venue_ids).values('venue_id').annotate(
+            low=Min('price_per_hour'), high=Max('price_per_hour')
+        )
+    }
+    masks = defaultdict(int)
+    categories = Court.objects.filter(venue_id__in=venue_ids, category__isnull=False).values_list(
+        'venue_id', 'category__name'
+    ).distinct()
+    for venue_id, name in categories:
+        masks[venue_id] |= category_bit(name) or 0
+
+    venues = list(Venue.objects.filter(id__in=venue_ids).only('id'))
+    for venue in venues:
+        price = prices.get(venue.id, {})
+        venue.min_price = price.get('low')
+        venue.max_price = price.get('high')
+        venue.category_mask = masks[venue.id]
+    Venue.objects.bulk_update(venues, ['min_price', 'max_price', 'category_mask'], batch_size=500)
+    return len(venues)
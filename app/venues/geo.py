@@ -0,0 +1,218 @@
+"""
+Geospatial helpers for venue search.
+
+Venues store latitude/longitude plus a geohash of them. A "near me" query
+first narrows the candidates in SQL with the geohash cells and the bounding
+box covering the search circle (both indexed), then computes the exact
+haversine distance in Python for the few rows left and sorts by it.
+"""
+import math
+import re
+
+from django.db.models import Q
+
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+MAX_RADIUS_KM = 200
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Approximate centroids of the cities in static/dataset/data.json. Used when a
+# venue has no explicit coordinates and its location_url is a short link that
+# cannot be resolved offline, so the position is only accurate to the city.
+CITY_CENTROIDS = {
+    'kota jakarta selatan': (-6.2615, 106.8106),
+    'kota jakarta utara': (-6.1384, 106.8660),
+    'kota jakarta barat': (-6.1674, 106.7637),
+    'kota jakarta timur': (-6.2250, 106.9004),
+    'kota jakarta pusat': (-6.1862, 106.8341),
+    'kota yogyakarta': (-7.7956, 110.3695),
+    'kota bandung': (-6.9175, 107.6191),
+    'kota tangerang selatan': (-6.2886, 106.7179),
+    'kota bogor': (-6.5971, 106.8060),
+    'kota surabaya': (-7.2575, 112.7521),
+    'kota tangerang': (-6.1783, 106.6319),
+    'kota depok': (-6.4025, 106.7942),
+    'kabupaten tangerang': (-6.2000, 106.5000),
+    'kabupaten bogor': (-6.4797, 106.8250),
+    'kabupaten bandung barat': (-6.8652, 107.4919),
+    'kota malang': (-7.9666, 112.6326),
+    'kota bekasi': (-6.2383, 106.9756),
+    'kota denpasar': (-8.6705, 115.2126),
+    'kota medan': (3.5952, 98.6722),
+    'kota balikpapan': (-1.2379, 116.8529),
+    'kota banda aceh': (5.5483, 95.3238),
+    'kota salatiga': (-7.3305, 110.5084),
+    'kota cimahi': (-6.8841, 107.5413),
+    'kota padang': (-0.9471, 100.4172),
+}
+
+# Coordinates embedded in full Google Maps URLs: .../@-6.2,106.8,15z,
+# ?q=-6.2,106.8, ?ll=..., ?query=... and the !3d<lat>!4d<lng> place format
+_URL_PATTERNS = [
+    re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)'),
+    re.compile(r'@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)'),
+    re.compile(r'[?&](?:q|ll|query|destination)=(-?\d+(?:\.\d+)?)(?:,|%2C)\s*(-?\d+(?:\.\d+)?)'),
+]
+
+
+def validate_coordinates(lat, lng):
+    """Return (lat, lng) as floats; raises ValueError when missing or out of range"""
+    lat, lng = float(lat), float(lng)
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError('Koordinat tidak valid')
+    return lat, lng
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) of the box enclosing the search circle"""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = 180.0 if cos_lat < 1e-9 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, lat - d_lat),
+        min(90.0, lat + d_lat),
+        max(-180.0, lng - d_lng),
+        min(180.0, lng + d_lng),
+    )
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of a point"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, rng = (lng, lng_range) if even else (lat, lat_range)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size(precision):
+    """(height, width) in degrees of a geohash cell at ``precision``"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def geohash_cover(box):
+    """Geohash prefixes whose cells together cover ``box``.
+
+    Picks the finest precision whose cells are at least as large as the box,
+    so its corners fall into at most four distinct cells.
+    """
+    min_lat, max_lat, min_lng, max_lng = box
+    precision = 0
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(candidate)
+        if height >= max_lat - min_lat and width >= max_lng - min_lng:
+            precision = candidate
+            break
+    if precision == 0:
+        return []  # Box larger than a whole precision-1 cell: no useful prefix
+    corners = [(min_lat, min_lng), (min_lat, max_lng), (max_lat, min_lng), (max_lat, max_lng)]
+    return sorted({geohash_encode(lat, lng, precision) for lat, lng in corners})
+
+
+def nearby_filter(lat, lng, radius_km):
+    """Q object preselecting venues that may lie within radius_km of (lat, lng)"""
+    box = bounding_box(lat, lng, radius_km)
+    query = Q(
+        latitude__gte=box[0], latitude__lte=box[1],
+        longitude__gte=box[2], longitude__lte=box[3],
+    )
+    cells = geohash_cover(box)
+    if cells:
+        cell_query = Q()
+        for cell in cells:
+            cell_query |= Q(geohash__startswith=cell)
+        query &= cell_query
+    return query
+
+
+def sort_by_distance(rows, lat, lng, radius_km):
+    """Refine (key, latitude, longitude) rows to the circle; returns [(key, distance_km)] nearest first"""
+    matches = []
+    for key, row_lat, row_lng in rows:
+        if row_lat is None or row_lng is None:
+            continue
+        distance = haversine_km(lat, lng, row_lat, row_lng)
+        if distance <= radius_km:
+            matches.append((key, distance))
+    matches.sort(key=lambda match: match[1])
+    return matches
+
+
+def coordinates_from_location_url(url):
+    """Extract (lat, lng) from a full Google Maps URL, or None"""
+    if not url:
+        return None
+    for pattern in _URL_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            try:
+                return validate_coordinates(match.group(1), match.group(2))
+            except ValueError:
+                continue
+    return None
+
+
+def coordinates_from_address(address):
+    """Approximate (lat, lng) from the city part of an address, or None"""
+    for part in (address or '').split(','):
+        centroid = CITY_CENTROIDS.get(part.strip().lower())
+        if centroid:
+            return centroid
+    return None
+
+
+def resolve_coordinates(location_url, address):
+    """Best known position of a venue: the Maps URL first, then the city centroid"""
+    return coordinates_from_location_url(location_url) or coordinates_from_address(address)
+
+
+def apply_venue_coordinates(venue, data=None, relocated=True):
+    """Set venue.latitude/longitude from explicit ``latitude``/``longitude`` in
+    ``data``, falling back to the location URL and the address.
+
+    The fallback only runs when ``relocated`` (address or Maps link changed)
+    or the venue has no coordinates yet, so precise coordinates are not
+    replaced by a city centroid on unrelated edits. Raises ValueError if
+    explicit coordinates are given but invalid.
+    """
+    data = data or {}
+    lat, lng = data.get('latitude'), data.get('longitude')
+    if lat not in (None, '') and lng not in (None, ''):
+        try:
+            venue.latitude, venue.longitude = validate_coordinates(lat, lng)
+        except (TypeError, ValueError):
+            raise ValueError('Koordinat tidak valid')
+        return
+    if not relocated and venue.latitude is not None:
+        return
+    coordinates = resolve_coordinates(venue.location_url, venue.address)
+    if coordinates:
+        venue.latitude, venue.longitude = coordinates
+    elif relocated:
+        venue.latitude = venue.longitude = None
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+from app.venues.geo import geohash_encode, resolve_coordinates
+
+
+def backfill_coordinates(apps, schema_editor):
+    """Resolve coordinates of existing venues from their Maps URL or city"""
+    Venue = apps.get_model('venues', 'Venue')
+    venues = []
+    for venue in Venue.objects.filter(latitude__isnull=True).only('id', 'address', 'location_url'):
+        coordinates = resolve_coordinates(venue.location_url, venue.address)
+        if coordinates:
+            venue.latitude, venue.longitude = coordinates
+            venue.geohash = geohash_encode(*coordinates)
+            venues.append(venue)
+    Venue.objects.bulk_update(venues, ['latitude', 'longitude', 'geohash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['latitude', 'longitude'], name='venue_lat_lng_idx'),
+        ),
+        migrations.RunPython(backfill_coordinates, migrations.RunPython.noop),
+    ]
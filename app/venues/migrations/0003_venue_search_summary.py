@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+# app.venues.facets.CATEGORY_BITS and CATEGORY_ALIASES as of this migration
+CATEGORY_BITS = {'FUTSAL': 1, 'BADMINTON': 2, 'BASKET': 4, 'TENIS': 8, 'PADEL': 16, 'VOLI': 32}
+CATEGORY_ALIASES = {'TENNIS': 'TENIS'}
+
+
+def category_bit(name):
+    name = (name or '').strip().upper()
+    return CATEGORY_BITS.get(CATEGORY_ALIASES.get(name, name))
+
+
+def backfill_search_summary(apps, schema_editor):
+    """Compute min/max price and category mask of existing venues from their courts"""
+    Venue = apps.get_model('venues', 'Venue')
+    Court = apps.get_model('courts', 'Court')
+    prices = {
+        row['venue_id']: row
+        for row in Court.objects.values('venue_id').annotate(low=Min('price_per_hour'), high=Max('price_per_hour'))
+    }
+    masks = {}
+    for venue_id, name in Court.objects.filter(category__isnull=False).values_list('venue_id', 'category__name').distinct():
+        masks[venue_id] = masks.get(venue_id, 0) | (category_bit(name) or 0)
+    venues = list(Venue.objects.only('id'))
+    for venue in venues:
+        price = prices.get(venue.id, {})
+        venue.min_price = price.get('low')
+        venue.max_price = price.get('high')
+        venue.category_mask = masks.get(venue.id, 0)
+    Venue.objects.bulk_update(venues, ['min_price', 'max_price', 'category_mask'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0002_venue_coordinates'),
+        ('courts', '0002_session_days_mask_schedule_exceptions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='category_mask',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='min_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['min_price'], name='venue_min_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['max_price'], name='venue_max_price_idx'),
+        ),
+        migrations.RunPython(backfill_search_summary, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator
 from app.users.models import User
+from app.venues.geo import geohash_encode
 import uuid
 
 # Sports Category Model
@@ -37,9 +38,20 @@ class Venue(models.Model):
     contact = models.CharField(max_length=20, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     
+    # Coordinates (WGS84) and their geohash, used by the nearby search
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, default='', db_index=True)
+    
     # Operational details
     number_of_courts = models.PositiveIntegerField(default=1, validators=[MinValueValidator(1)])
     
+    # Search summary of the venue's courts, kept up to date from Court
+    # signals (see app.venues.facets.refresh_venue_summaries)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    category_mask = models.PositiveIntegerField(default=0)  # One bit per SportsCategory choice
+    
     # Verification
     verification_status = models.CharField(max_length=10, choices=VERIFICATION_STATUS, default='pending')
     verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, 
@@ -51,12 +63,27 @@ class Venue(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    def save(self, *args, **kwargs):
+        # Keep the geohash in step with the coordinates
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash_encode(self.latitude, self.longitude)
+        else:
+            self.geohash = ''
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return self.name
     
     @property
     def is_verified(self):
         return self.verification_status == 'approved'
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='venue_lat_lng_idx'),
+            models.Index(fields=['min_price'], name='venue_min_price_idx'),
+            models.Index(fields=['max_price'], name='venue_max_price_idx'),
+        ]
 
 # Venue Images Model
 class VenueImage(models.Model):
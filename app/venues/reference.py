@@ -0,0 +1,101 @@
+"""
+In-process cache of the reference data: sports categories and facilities.
+
+Both tables hold a handful of rows that change almost never, yet they were
+read on every category list, court form and venue save. Each worker loads
+them once and keeps them until the version key in the Django cache changes.
+Saving or deleting a row (see signals.py), or calling :func:`invalidate`
+after a bulk write, bumps the key and every worker reloads on its next
+access. With Redis configured (REDIS_URL) this reaches the whole cluster;
+with the default per-process cache it only reaches the current worker, so
+a copy is also reloaded once it is REFERENCE_DATA_MAX_AGE seconds old.
+Reading the reference data costs one cache lookup and no database query.
+
+The returned instances are shared between requests and must not be modified.
+"""
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from app.venues.models import Facility, SportsCategory
+
+
+VERSION_KEY = 'reference-data:version'
+
+ReferenceData = namedtuple('ReferenceData', ['categories', 'categories_by_id', 'categories_by_name', 'facilities'])
+
+_lock = threading.Lock()
+_loaded = None  # (version, loaded_at, ReferenceData)
+
+
+def _max_age():
+    return getattr(settings, 'REFERENCE_DATA_MAX_AGE', 60)
+
+
+def current_version():
+    """Version stamp of the reference data shared by all workers"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Evicted or never set: the first worker to get here picks one
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY) or version
+    return version
+
+
+def invalidate():
+    """Make every worker reload the reference data on its next access"""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _load():
+    categories = tuple(SportsCategory.objects.order_by('id'))
+    return ReferenceData(
+        categories=categories,
+        categories_by_id={category.id: category for category in categories},
+        categories_by_name={category.name: category for category in categories},
+        facilities={facility.name: facility for facility in Facility.objects.order_by('name')},
+    )
+
+
+def _is_current(loaded, version):
+    return loaded is not None and loaded[0] == version and time.monotonic() - loaded[1] < _max_age()
+
+
+def _data():
+    global _loaded
+    version = current_version()  # Read before loading, so a bump during the load is not missed
+    loaded = _loaded
+    if not _is_current(loaded, version):
+        with _lock:
+            if not _is_current(_loaded, version):
+                _loaded = (version, time.monotonic(), _load())
+            loaded = _loaded
+    return loaded[2]
+
+
+def sports_categories():
+    """All sports categories, ordered by id"""
+    return _data().categories
+
+
+def sports_category(pk):
+    """The sports category with primary key ``pk`` (int or numeric string), or None"""
+    try:
+        return _data().categories_by_id.get(int(pk))
+    except (TypeError, ValueError):
+        return None
+
+
+def sports_category_by_name(name):
+    """The sports category named ``name`` (e.g. 'FUTSAL'), or None"""
+    return _data().categories_by_name.get(name)
+
+
+def facilities_by_name():
+    """{name: Facility} of every facility"""
+    return _data().facilities
@@ -0,0 +1,232 @@
+"""
+Query builder and serializer for the public venue listing.
+
+Shared by ``api_venue_list`` (JSON) and ``main.views.venue_list_view`` (the
+server-rendered first page of /lapangan/), so both run the same filters and
+return the same card payload. A page costs a fixed number of queries however
+many venues it holds: the page itself, its images, courts and facilities
+(prefetched) and one grouped rating query, plus the count and the facets.
+"""
+import logging
+from collections import namedtuple
+
+from django.db.models import Avg, Count, Prefetch, Q, prefetch_related_objects
+
+from app.courts.models import Court
+from app.reviews.models import Review
+from app.venues.facets import category_filter, facet_counts, parse_price, price_filter
+from app.venues.geo import MAX_RADIUS_KM, nearby_filter, sort_by_distance, validate_coordinates
+from app.venues.models import Venue, VenueFacility, VenueImage
+from lapangin.fieldsets import Fieldset
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 9
+MAX_PAGE_SIZE = 100
+
+# Default search radius (km) when lat/lng are given without radius_km
+DEFAULT_RADIUS_KM = 10
+
+VenuePage = namedtuple('VenuePage', ['venues', 'distances', 'total_count', 'page', 'page_size', 'facets'])
+
+
+def _positive_int(value, default, name):
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid {name}')
+    if number < 1:
+        raise ValueError(f'Invalid {name}')
+    return number
+
+
+def search_venues(params, with_facets=True):
+    """Run a listing search described by ``params`` (a QueryDict or dict).
+
+    Supports search, name, location, category (comma-separated), min_price,
+    max_price, lat/lng/radius_km and page/page_size. Returns a VenuePage;
+    raises ValueError with a client-facing message on invalid parameters.
+    """
+    page = _positive_int(params.get('page'), 1, 'page')
+    page_size = min(_positive_int(params.get('page_size'), DEFAULT_PAGE_SIZE, 'page_size'), MAX_PAGE_SIZE)
+
+    # Nearby search: lat/lng plus an optional radius (km) sorts by distance
+    nearby = params.get('lat') not in (None, '') or params.get('lng') not in (None, '')
+    if nearby:
+        try:
+            lat, lng = validate_coordinates(params.get('lat'), params.get('lng'))
+            radius_km = float(params.get('radius_km') or DEFAULT_RADIUS_KM)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid lat, lng or radius_km')
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f'radius_km must be greater than 0 and at most {MAX_RADIUS_KM}')
+
+    # Category and price filters compare the precomputed per-venue summary
+    # columns, so no join over courts (and no DISTINCT) is needed
+    category = params.get('category')
+    min_price, max_price = params.get('min_price'), params.get('max_price')
+    try:
+        category_q = category_filter(category.split(',')) if category else Q()
+        price_q = price_filter(
+            parse_price(min_price) if min_price else None,
+            parse_price(max_price) if max_price else None,
+        )
+    except ValueError:
+        raise ValueError('Invalid min_price or max_price')
+
+    base = Venue.objects.filter(verification_status='approved').order_by('-created_at', 'name')
+
+    # General search across multiple fields
+    search = (params.get('search') or '').strip()
+    if search:
+        base = base.filter(
+            Q(name__icontains=search) |
+            Q(address__icontains=search) |
+            Q(description__icontains=search)
+        )
+
+    # Specific field searches
+    if params.get('name'):
+        base = base.filter(name__icontains=params.get('name'))
+    if params.get('location'):
+        base = base.filter(address__icontains=params.get('location'))
+
+    offset = (page - 1) * page_size
+    distances = None  # {venue_id: km} of the page when searching nearby
+    if nearby:
+        # Bounding box + geohash cells narrow the candidates in SQL; the exact
+        # distance is computed only for those, then sorted and paginated
+        candidates = base.filter(nearby_filter(lat, lng, radius_km)).order_by().values_list(
+            'id', 'latitude', 'longitude'
+        )
+        in_range = sort_by_distance(candidates, lat, lng, radius_km)
+        base = base.filter(id__in=[venue_id for venue_id, _ in in_range])
+        if category_q or price_q:
+            allowed = set(base.filter(category_q & price_q).order_by().values_list('id', flat=True))
+            in_range = [match for match in in_range if match[0] in allowed]
+        total_count = len(in_range)
+        page_matches = in_range[offset:offset + page_size]
+        distances = dict(page_matches)
+        by_id = Venue.objects.in_bulk([venue_id for venue_id, _ in page_matches])
+        venues = [by_id[venue_id] for venue_id, _ in page_matches]
+    else:
+        matching = base.filter(category_q & price_q)
+        total_count = matching.count()
+        venues = list(matching[offset:offset + page_size])
+
+    # Category counts and price histogram of the current search
+    facets = facet_counts(base, category_q, price_q) if with_facets else None
+
+    logger.debug('Venue search %s: %d matches, page %d has %d', dict(params.items()), total_count, page, len(venues))
+    return VenuePage(venues, distances, total_count, page, page_size, facets)
+
+
+VENUE_CARD_FIELDS = (
+    'id', 'name', 'category', 'category_icon', 'address', 'location_url', 'contact', 'price_per_hour',
+    'number_of_courts', 'avg_rating', 'rating_count', 'latitude', 'longitude', 'distance_km',
+)
+VENUE_CARD_RELATIONS = ('images', 'facilities')
+# Keys of a card in the order serialize_venues builds them
+VENUE_CARD_KEYS = (
+    'id', 'name', 'category', 'category_icon', 'address', 'location_url', 'contact', 'price_per_hour',
+    'number_of_courts', 'images', 'avg_rating', 'rating_count', 'facilities', 'latitude', 'longitude',
+    'distance_km',
+)
+
+
+def venue_card_fields(fieldset=None, distances=None):
+    """Keys of the cards serialize_venues returns for ``fieldset``, also when the page is empty"""
+    if fieldset is None:
+        fieldset = Fieldset(VENUE_CARD_FIELDS, VENUE_CARD_RELATIONS)
+    return [
+        key for key in VENUE_CARD_KEYS
+        if key in fieldset and (key != 'distance_km' or distances is not None)
+    ]
+
+
+def serialize_venues(venues, distances=None, fieldset=None):
+    """Card payloads for ``venues`` with a constant number of queries.
+
+    Images, courts (with categories) and facilities are prefetched in one
+    query each and ratings come from one grouped aggregate. With a
+    ``fieldset`` (see lapangin.fieldsets) only the requested keys are
+    returned, and the prefetches and rating query they need are skipped
+    when nothing requested depends on them.
+    """
+    venues = list(venues)
+    if not venues:
+        return []
+    if fieldset is None:
+        fieldset = Fieldset(VENUE_CARD_FIELDS, VENUE_CARD_RELATIONS)
+    with_courts = fieldset.wants('category', 'price_per_hour')
+    with_ratings = fieldset.wants('avg_rating', 'rating_count')
+
+    lookups = []
+    if fieldset.includes('images'):
+        lookups.append(Prefetch('images', queryset=VenueImage.objects.order_by('-is_primary', 'id')))
+    if with_courts:
+        lookups.append(Prefetch('courts', queryset=Court.objects.select_related('category')))
+    if fieldset.includes('facilities'):
+        lookups.append(Prefetch('venuefacility_set', queryset=VenueFacility.objects.select_related('facility')))
+    prefetch_related_objects(venues, *lookups)
+    ratings = {}
+    if with_ratings:
+        ratings = {
+            row['booking__court__venue_id']: row
+            for row in Review.objects.filter(booking__court__venue__in=venues)
+            .values('booking__court__venue_id')
+            .annotate(avg=Avg('rating'), count=Count('id'))
+            .order_by()
+        }
+
+    data = []
+    for v in venues:
+        categories, avg_price = set(), 0
+        if with_courts:
+            courts = list(v.courts.all())
+            # All unique categories from courts in this venue
+            categories = {court.category.get_name_display() for court in courts if court.category}
+            avg_price = sum(float(court.price_per_hour) for court in courts) / len(courts) if courts else 0
+        rating = ratings.get(v.id, {})
+
+        item = {
+            'id': str(v.id),
+            'name': v.name,
+            'category': ', '.join(sorted(categories)),
+            'category_icon': None,  # Venue model doesn't have category field
+            'address': v.address or '',
+            'location_url': v.location_url,
+            'contact': v.contact,
+            'price_per_hour': float(avg_price),
+            'number_of_courts': v.number_of_courts,
+            'images': [img.image_url for img in v.images.all() if img.image_url] if fieldset.includes('images') else None,
+            'avg_rating': round(rating.get('avg') or 0, 1),
+            'rating_count': rating.get('count', 0),
+            'facilities': [
+                {
+                    'name': vf.facility.name,
+                    'icon': vf.facility.icon
+                } for vf in v.venuefacility_set.all()
+            ] if fieldset.includes('facilities') else None,
+            'latitude': v.latitude,
+            'longitude': v.longitude,
+        }
+        if distances is not None:
+            item['distance_km'] = round(distances[v.id], 2)
+        data.append(fieldset.filter(item))
+    return data
+
+
+def pagination_payload(result):
+    total_pages = (result.total_count + result.page_size - 1) // result.page_size  # Ceiling division
+    return {
+        'page': result.page,
+        'page_size': result.page_size,
+        'total_count': result.total_count,
+        'total_pages': total_pages,
+        'has_next': result.page < total_pages,
+        'has_previous': result.page > 1
+    }
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from app.venues import reference
+from app.venues.models import Facility, OperationalHour, SportsCategory, Venue, VenueFacility, VenueImage
+
+
+def touch_venues(venue_ids):
+    """Bump updated_at, the version stamp of the venue's cached page fragments"""
+    Venue.objects.filter(pk__in=list(venue_ids)).update(updated_at=timezone.now())
+
+
+# Only post_save: a post_delete receiver would turn the bulk deletes of the
+# editor sync into per-row deletes. Deletions happen either together with a
+# venue save (which bumps updated_at itself) or call touch_venues explicitly.
+@receiver(post_save, sender=VenueImage)
+@receiver(post_save, sender=VenueFacility)
+@receiver(post_save, sender=OperationalHour)
+def invalidate_venue_fragments(sender, instance, **kwargs):
+    """Child rows shown on the venue page expire its cached fragments"""
+    touch_venues([instance.venue_id])
+
+
+@receiver(post_save, sender=Facility)
+def invalidate_facility_venues(sender, instance, created, **kwargs):
+    """A renamed facility or new icon shows on every venue that has it"""
+    if not created:
+        touch_venues(VenueFacility.objects.filter(facility=instance).values_list('venue_id', flat=True))
+
+
+@receiver(post_save, sender=SportsCategory)
+@receiver(post_delete, sender=SportsCategory)
+@receiver(post_save, sender=Facility)
+@receiver(post_delete, sender=Facility)
+def invalidate_reference_data(sender, instance, **kwargs):
+    """Workers reload the cached categories and facilities (app.venues.reference)"""
+    reference.invalidate()
+    # Again once committed, in case a worker reloaded before the commit
+    transaction.on_commit(reference.invalidate)
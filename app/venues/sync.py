@@ -0,0 +1,87 @@
+"""
+Set-based sync of a venue's images and facilities from the venue editor payload.
+
+Shared by the JSON (Flutter) and form-data (web) branches of ``api_venues``
+and ``api_venue_detail``; callers run it inside the same transaction as the
+venue save so a failed write never leaves a half-updated venue behind.
+"""
+import json
+
+from app.venues import reference
+from app.venues.models import Facility, VenueFacility, VenueImage
+from app.venues.signals import touch_venues
+from lapangin.sync import sync_image_urls
+
+
+def parse_json_list(value):
+    """Return ``value`` as a list, decoding JSON strings; None if absent or malformed"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, ValueError):
+            return None
+    return value if isinstance(value, list) else None
+
+
+def sync_venue_images(venue, image_urls):
+    """Make the venue's images exactly ``image_urls``, keeping existing rows"""
+    return sync_image_urls(VenueImage, 'venue', venue, image_urls)
+
+
+def sync_venue_facilities(venue, facilities, delete_missing=True):
+    """Link the venue to exactly the facilities named in ``facilities``.
+
+    ``facilities`` is a list of ``{'name': ..., 'icon': ...}`` dicts. Names are
+    resolved from the reference-data cache, unknown facilities are
+    bulk-created, changed icons bulk-updated, and the VenueFacility links are
+    diffed against the current ones (one insert and one delete at most).
+    """
+    icons = {}
+    for facility_data in facilities or []:
+        if isinstance(facility_data, dict) and facility_data.get('name'):
+            icons[facility_data['name']] = facility_data.get('icon') or ''
+    names = list(icons)
+
+    known = reference.facilities_by_name()
+    by_name = {name: known[name] for name in names if name in known}
+
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        Facility.objects.bulk_create(
+            [Facility(name=name, icon=icons[name]) for name in missing],
+            ignore_conflicts=True,
+        )
+        # Re-read so primary keys are known on every backend (and for rows a
+        # concurrent request created between the two queries)
+        by_name.update((f.name, f) for f in Facility.objects.filter(name__in=missing))
+        reference.invalidate()  # bulk_create sends no post_save
+
+    # If facility exists but icon is different, update it (on a copy: the
+    # cached instances are shared)
+    changed = []
+    for name, facility in by_name.items():
+        if icons[name] and facility.icon != icons[name] and name not in missing:
+            changed.append(Facility(id=facility.id, name=name, icon=icons[name]))
+    if changed:
+        Facility.objects.bulk_update(changed, ['icon'])
+        reference.invalidate()
+        # bulk_update skips the Facility signal; other venues show the icon too
+        touch_venues(VenueFacility.objects.filter(facility__in=changed).values_list('venue_id', flat=True))
+
+    wanted_ids = {facility.id for facility in by_name.values()}
+    current_ids = set(VenueFacility.objects.filter(venue=venue).values_list('facility_id', flat=True))
+
+    to_add = wanted_ids - current_ids
+    if to_add:
+        VenueFacility.objects.bulk_create(
+            [VenueFacility(venue=venue, facility_id=facility_id) for facility_id in to_add],
+            ignore_conflicts=True,
+        )
+
+    to_remove = current_ids - wanted_ids if delete_missing else set()
+    if to_remove:
+        VenueFacility.objects.filter(venue=venue, facility_id__in=to_remove).delete()
+
+    return to_add, to_remove
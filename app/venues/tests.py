@@ -27,6 +27,66 @@ class SportsCategoryModelTestCase(TestCase):
         self.assertEqual(str(category), 'Futsal')
 
 
+class ReferenceDataTestCase(TestCase):
+    """Test cases for the cached sports categories and facilities"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.futsal = SportsCategory.objects.create(name='FUTSAL')
+        self.parking = Facility.objects.create(name='Parkir')
+    
+    def test_categories_endpoint_skips_database(self):
+        """Test api_sports_categories is served from the cache once loaded"""
+        self.client.get('/api/sports-categories/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/sports-categories/')
+        
+        self.assertEqual([c['name'] for c in response.json()['data']], ['FUTSAL'])
+    
+    def test_saves_and_version_bumps_reload(self):
+        """Test a saved row or a version bumped by another worker is picked up"""
+        from django.core.cache import cache
+        from app.venues import reference
+        
+        self.assertEqual(list(reference.facilities_by_name()), ['Parkir'])
+        SportsCategory.objects.create(name='PADEL')
+        self.assertEqual([c.name for c in reference.sports_categories()], ['FUTSAL', 'PADEL'])
+        
+        # A write that sends no signal, followed by another worker's invalidate()
+        Facility.objects.filter(pk=self.parking.pk).update(name='Parkir Motor')
+        self.assertIn('Parkir', reference.facilities_by_name())
+        cache.set(reference.VERSION_KEY, 'bumped-elsewhere', None)
+        self.assertEqual(list(reference.facilities_by_name()), ['Parkir Motor'])
+
+    def test_copy_expires_without_version_bump(self):
+        """Test a worker re-reads the data after REFERENCE_DATA_MAX_AGE even if it missed the bump"""
+        from unittest import mock
+        from app.venues import reference
+
+        self.assertEqual([c.name for c in reference.sports_categories()], ['FUTSAL'])
+        # Added on another worker whose version bump never reached this cache
+        SportsCategory.objects.bulk_create([SportsCategory(name='PADEL')])
+        self.assertEqual([c.name for c in reference.sports_categories()], ['FUTSAL'])
+
+        later = reference.time.monotonic() + reference._max_age()
+        with mock.patch.object(reference.time, 'monotonic', return_value=later):
+            self.assertEqual([c.name for c in reference.sports_categories()], ['FUTSAL', 'PADEL'])
+
+    def test_court_form_category_field(self):
+        """Test the court form category renders and validates without queries"""
+        from django.core.exceptions import ValidationError
+        from app.users.forms import CourtForm
+        
+        form = CourtForm()
+        field = form.fields['category']
+        str(form['category'])  # Warm the cache
+        with self.assertNumQueries(0):
+            self.assertIn('Futsal', str(form['category']))
+            self.assertEqual(field.clean(str(self.futsal.id)), self.futsal)
+        with self.assertRaises(ValidationError):
+            field.clean('999')
+
+
 class VenueModelTestCase(TestCase):
     """Test cases for Venue model"""
     
@@ -268,3 +328,400 @@ class OperationalHourModelTestCase(TestCase):
                 close_time=time(23, 0)
             )
 
+
+
+class VenueSyncTestCase(TestCase):
+    """Test cases for the set-based venue image and facility sync"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        self.venue = Venue.objects.create(
+            name='Test Venue',
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1
+        )
+        
+        self.parking = Facility.objects.create(name='Parkir', icon='https://example.com/old-parkir.png')
+        self.toilet = Facility.objects.create(name='Toilet')
+        VenueFacility.objects.create(venue=self.venue, facility=self.parking)
+        VenueFacility.objects.create(venue=self.venue, facility=self.toilet)
+        
+        VenueImage.objects.create(venue=self.venue, image_url='https://example.com/old.jpg', is_primary=True)
+        
+        self.client.force_login(self.mitra)
+    
+    def put_venue(self, **fields):
+        import json
+        body = {'_method': 'PUT', 'name': self.venue.name, 'address': self.venue.address}
+        body.update(fields)
+        return self.client.post(f'/api/venues/{self.venue.id}/', data=json.dumps(body), content_type='application/json')
+    
+    def test_update_syncs_facilities_and_images(self):
+        """Test facilities are linked, created, re-iconed and unlinked in one update"""
+        response = self.put_venue(
+            facilities=[
+                {'name': 'Parkir', 'icon': 'https://example.com/parkir.png'},
+                {'name': 'Kantin', 'icon': 'https://example.com/kantin.png'},
+            ],
+            image_urls=['https://example.com/new.jpg'],
+        )
+        self.assertEqual(response.status_code, 200)
+        
+        names = set(VenueFacility.objects.filter(venue=self.venue).values_list('facility__name', flat=True))
+        self.assertEqual(names, {'Parkir', 'Kantin'})
+        self.parking.refresh_from_db()
+        self.assertEqual(self.parking.icon, 'https://example.com/parkir.png')
+        # Unlinked facilities are kept for other venues
+        self.assertTrue(Facility.objects.filter(name='Toilet').exists())
+        
+        images = list(self.venue.images.values_list('image_url', 'is_primary'))
+        self.assertEqual(images, [('https://example.com/new.jpg', True)])
+    
+    def test_omitted_lists_are_left_alone(self):
+        """Test an update without facilities or images keeps the current ones"""
+        self.put_venue(description='Baru')
+        
+        self.assertEqual(VenueFacility.objects.filter(venue=self.venue).count(), 2)
+        self.assertEqual(self.venue.images.count(), 1)
+    
+    def test_query_count_does_not_grow_with_facilities(self):
+        """Test facilities are resolved and linked in a fixed number of queries"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as small:
+            self.put_venue(facilities=[{'name': 'F1'}], image_urls=['https://example.com/1.jpg'])
+        with CaptureQueriesContext(connection) as large:
+            self.put_venue(
+                facilities=[{'name': f'G{i}'} for i in range(15)],
+                image_urls=[f'https://example.com/x{i}.jpg' for i in range(8)],
+            )
+        
+        self.assertEqual(VenueFacility.objects.filter(venue=self.venue).count(), 15)
+        self.assertEqual(len(small), len(large))
+
+
+class VenueGeoSearchTestCase(TestCase):
+    """Test cases for venue coordinates and the nearby venue search"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        
+        # Monas, Blok M (~8 km away), Bandung (~120 km away), and one without coordinates
+        self.monas = self.create_venue('Monas Arena', -6.1754, 106.8272)
+        self.blok_m = self.create_venue('Blok M Sport', -6.2443, 106.8005)
+        self.bandung = self.create_venue('Bandung Hall', -6.9175, 107.6191)
+        self.unknown = self.create_venue('Unknown Place', None, None)
+    
+    def create_venue(self, name, latitude, longitude):
+        return Venue.objects.create(
+            name=name,
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved',
+            latitude=latitude,
+            longitude=longitude,
+        )
+    
+    def test_geohash_set_on_save(self):
+        """Test saving a venue keeps its geohash in step with the coordinates"""
+        from app.venues.geo import geohash_encode
+        
+        self.assertEqual(self.monas.geohash, geohash_encode(-6.1754, 106.8272))
+        self.assertTrue(self.monas.geohash.startswith('qqguy'))
+        self.assertEqual(self.unknown.geohash, '')
+    
+    def test_haversine_and_cover(self):
+        """Test the distance helper and that the geohash cover contains points near the edge"""
+        from app.venues.geo import bounding_box, geohash_cover, geohash_encode, haversine_km
+        
+        self.assertAlmostEqual(haversine_km(-6.1754, 106.8272, -6.2443, 106.8005), 8.2, delta=0.2)
+        self.assertAlmostEqual(haversine_km(-6.1754, 106.8272, -6.9175, 107.6191), 120, delta=5)
+        
+        box = bounding_box(-6.1754, 106.8272, 10)
+        cells = geohash_cover(box)
+        self.assertTrue(cells)
+        for lat, lng in [(box[0], box[2]), (box[1], box[3]), (-6.1754, 106.8272)]:
+            self.assertTrue(any(geohash_encode(lat, lng).startswith(cell) for cell in cells))
+    
+    def test_coordinates_from_location_url_and_address(self):
+        """Test resolving coordinates from a full Maps URL, then from the city"""
+        from app.venues.geo import resolve_coordinates
+        
+        self.assertEqual(
+            resolve_coordinates('https://www.google.com/maps/place/X/@-6.2001,106.8167,17z', 'Kota Bandung'),
+            (-6.2001, 106.8167)
+        )
+        self.assertEqual(
+            resolve_coordinates('https://maps.app.goo.gl/abc', 'Kota Bandung, Jawa Barat'),
+            (-6.9175, 107.6191)
+        )
+        self.assertIsNone(resolve_coordinates('https://maps.app.goo.gl/abc', 'Somewhere'))
+    
+    def test_nearby_search_sorted_by_distance(self):
+        """Test lat/lng/radius_km return only venues in range, nearest first"""
+        response = self.client.get('/api/public/venues/', {'lat': -6.1754, 'lng': 106.8272, 'radius_km': 15})
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([v['name'] for v in data['data']], ['Monas Arena', 'Blok M Sport'])
+        self.assertEqual(data['data'][0]['distance_km'], 0)
+        self.assertAlmostEqual(data['data'][1]['distance_km'], 8.2, delta=0.2)
+        self.assertEqual(data['pagination']['total_count'], 2)
+    
+    def test_nearby_search_paginates_and_combines_filters(self):
+        """Test nearby results are paginated after sorting and respect other filters"""
+        params = {'lat': -6.1754, 'lng': 106.8272, 'radius_km': 200, 'page_size': 1}
+        
+        response = self.client.get('/api/public/venues/', {**params, 'page': 3})
+        data = response.json()
+        self.assertEqual([v['name'] for v in data['data']], ['Bandung Hall'])
+        self.assertEqual(data['pagination']['total_count'], 3)
+        
+        response = self.client.get('/api/public/venues/', {**params, 'name': 'Blok'})
+        self.assertEqual([v['name'] for v in response.json()['data']], ['Blok M Sport'])
+    
+    def test_nearby_search_invalid_params(self):
+        """Test invalid coordinates or radius are rejected"""
+        for params in [
+            {'lat': 'abc', 'lng': 106.8},
+            {'lat': -6.2},
+            {'lat': 95, 'lng': 106.8},
+            {'lat': -6.2, 'lng': 106.8, 'radius_km': 0},
+            {'lat': -6.2, 'lng': 106.8, 'radius_km': 10000},
+        ]:
+            response = self.client.get('/api/public/venues/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response.json()['status'], 'error')
+    
+    def test_venue_edit_updates_coordinates(self):
+        """Test editing a venue stores explicit coordinates or resolves them from the address"""
+        import json
+        self.client.force_login(self.mitra)
+        url = f'/api/venues/{self.unknown.id}/'
+        
+        body = {'_method': 'PUT', 'name': 'Unknown Place', 'address': 'Kota Malang, Jawa Timur'}
+        self.client.post(url, data=json.dumps(body), content_type='application/json')
+        self.unknown.refresh_from_db()
+        self.assertEqual((self.unknown.latitude, self.unknown.longitude), (-7.9666, 112.6326))
+        
+        body.update({'latitude': -7.95, 'longitude': 112.61})
+        self.client.post(url, data=json.dumps(body), content_type='application/json')
+        self.unknown.refresh_from_db()
+        self.assertEqual((self.unknown.latitude, self.unknown.longitude), (-7.95, 112.61))
+        self.assertTrue(self.unknown.geohash)
+        
+        # Unrelated edits keep precise coordinates
+        body = {'_method': 'PUT', 'name': 'Renamed', 'address': 'Kota Malang, Jawa Timur'}
+        self.client.post(url, data=json.dumps(body), content_type='application/json')
+        self.unknown.refresh_from_db()
+        self.assertEqual((self.unknown.latitude, self.unknown.longitude), (-7.95, 112.61))
+        
+        body['latitude'], body['longitude'] = 'x', 'y'
+        response = self.client.post(url, data=json.dumps(body), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class VenueFacetTestCase(TestCase):
+    """Test cases for the precomputed venue summaries and listing facets"""
+
+    def setUp(self):
+        """Set up test data"""
+        from app.courts.models import Court
+        
+        self.mitra = User.objects.create_user(
+            username='testmitra',
+            password='testpass123',
+            email='mitra@test.com',
+            role='mitra'
+        )
+        self.futsal = SportsCategory.objects.create(name='FUTSAL')
+        self.badminton = SportsCategory.objects.create(name='BADMINTON')
+        
+        self.arena = self.create_venue('Arena')
+        Court.objects.create(venue=self.arena, name='Court 1', category=self.futsal, price_per_hour=120000)
+        Court.objects.create(venue=self.arena, name='Court 2', category=self.badminton, price_per_hour=40000)
+        
+        self.hall = self.create_venue('Hall')
+        self.hall_court = Court.objects.create(
+            venue=self.hall, name='Court 1', category=self.badminton, price_per_hour=60000
+        )
+        
+        self.empty = self.create_venue('Empty')
+    
+    def create_venue(self, name):
+        return Venue.objects.create(
+            name=name,
+            owner=self.mitra,
+            address='Test Address',
+            number_of_courts=1,
+            verification_status='approved',
+        )
+    
+    def facet(self, facets, name):
+        return next(c['count'] for c in facets['categories'] if c['name'] == name)
+    
+    def test_summary_follows_court_changes(self):
+        """Test court saves and deletes keep min/max price and category mask up to date"""
+        from app.venues.facets import CATEGORY_BITS
+        
+        self.arena.refresh_from_db()
+        self.assertEqual(self.arena.min_price, 40000)
+        self.assertEqual(self.arena.max_price, 120000)
+        self.assertEqual(self.arena.category_mask, CATEGORY_BITS['FUTSAL'] | CATEGORY_BITS['BADMINTON'])
+        
+        self.hall_court.price_per_hour = 80000
+        self.hall_court.category = self.futsal
+        self.hall_court.save()
+        self.hall.refresh_from_db()
+        self.assertEqual((self.hall.min_price, self.hall.max_price), (80000, 80000))
+        self.assertEqual(self.hall.category_mask, CATEGORY_BITS['FUTSAL'])
+        
+        self.hall_court.delete()
+        self.hall.refresh_from_db()
+        self.assertIsNone(self.hall.min_price)
+        self.assertEqual(self.hall.category_mask, 0)
+    
+    def test_filters_use_summary(self):
+        """Test category and price filters keep their previous meaning"""
+        def names(**params):
+            response = self.client.get('/api/public/venues/', params)
+            return sorted(v['name'] for v in response.json()['data'])
+        
+        self.assertEqual(names(category='FUTSAL'), ['Arena'])
+        self.assertEqual(names(category='BADMINTON'), ['Arena', 'Hall'])
+        self.assertEqual(names(category='TENIS'), [])
+        self.assertEqual(names(min_price=100000), ['Arena'])
+        self.assertEqual(names(max_price=50000), ['Arena'])
+        self.assertEqual(names(min_price=50000, max_price=70000), ['Arena', 'Hall'])
+        self.assertEqual(names(category='BADMINTON', min_price=100000), ['Arena'])
+        
+        response = self.client.get('/api/public/venues/', {'min_price': 'abc'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_facet_counts(self):
+        """Test facets count each facet without its own filter in one query"""
+        with self.assertNumQueries(1):
+            from app.venues.facets import facet_counts
+            facets = facet_counts(Venue.objects.filter(verification_status='approved'))
+        self.assertEqual(self.facet(facets, 'FUTSAL'), 1)
+        self.assertEqual(self.facet(facets, 'BADMINTON'), 2)
+        self.assertEqual(self.facet(facets, 'TENIS'), 0)
+        self.assertEqual(facets['price_range'], {'min': 40000.0, 'max': 120000.0})
+        buckets = {bucket['min']: bucket['count'] for bucket in facets['price_buckets']}
+        self.assertEqual(buckets[0], 1)
+        self.assertEqual(buckets[50000], 1)
+        
+        # Selecting a category narrows the price histogram but not the category counts
+        facets = self.client.get('/api/public/venues/', {'category': 'FUTSAL'}).json()['facets']
+        self.assertEqual(self.facet(facets, 'BADMINTON'), 2)
+        self.assertEqual(sum(bucket['count'] for bucket in facets['price_buckets']), 1)
+        
+        # A price filter narrows the category counts
+        facets = self.client.get('/api/public/venues/', {'min_price': 100000}).json()['facets']
+        self.assertEqual(self.facet(facets, 'BADMINTON'), 1)
+    
+    def test_category_alias(self):
+        """Test the dataset spelling TENNIS maps to the TENIS choice"""
+        from app.venues.facets import CATEGORY_BITS, category_bit
+        
+        self.assertEqual(category_bit('TENNIS'), CATEGORY_BITS['TENIS'])
+        self.assertEqual(category_bit('futsal'), CATEGORY_BITS['FUTSAL'])
+        self.assertIsNone(category_bit('CURLING'))
+    
+    def test_listing_query_count_is_constant(self):
+        """Test the listing runs the same number of queries for one or many venues"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from app.courts.models import Court
+        
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/public/venues/')
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+        
+        few = count_queries()
+        for i in range(5):
+            venue = self.create_venue(f'Extra {i}')
+            VenueImage.objects.create(venue=venue, image_url=f'https://example.com/{i}.jpg')
+            Court.objects.create(venue=venue, name='Court 1', category=self.futsal, price_per_hour=90000)
+        self.assertEqual(count_queries(), few)
+    
+    def test_listing_columnar_format(self):
+        """Test format=columnar lists each field once with one value per venue"""
+        rows = self.client.get('/api/public/venues/').json()
+        table = self.client.get('/api/public/venues/', {'format': 'columnar'}).json()
+        
+        self.assertEqual(table['pagination'], rows['pagination'])
+        self.assertEqual(table['data']['count'], len(rows['data']))
+        self.assertEqual(table['data']['columns']['name'], [v['name'] for v in rows['data']])
+        self.assertEqual(table['data']['columns']['facilities'], [v['facilities'] for v in rows['data']])
+        self.assertEqual(table['data']['fields'], list(rows['data'][0]))
+
+        # An empty page keeps the same columns
+        empty = self.client.get('/api/public/venues/', {'format': 'columnar', 'name': 'no such venue'}).json()
+        self.assertEqual(empty['data']['count'], 0)
+        self.assertEqual(empty['data']['fields'], table['data']['fields'])
+        self.assertEqual(empty['data']['columns']['name'], [])
+
+        sparse = self.client.get('/api/public/venues/', {
+            'format': 'columnar', 'fields': 'id,name', 'name': 'no such venue'
+        }).json()
+        self.assertEqual(sparse['data']['fields'], ['id', 'name'])
+
+    def test_listing_fieldset_skips_relations(self):
+        """Test fields= trims the cards and drops the prefetches nothing asked for"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as full:
+            self.client.get('/api/public/venues/')
+        with CaptureQueriesContext(connection) as sparse:
+            response = self.client.get('/api/public/venues/', {'fields': 'id,name'})
+        
+        self.assertEqual(response.status_code, 200)
+        for venue in response.json()['data']:
+            self.assertEqual(list(venue), ['id', 'name'])
+        # images, courts, facilities and the rating aggregate
+        self.assertEqual(len(full) - len(sparse), 4)
+        
+        venue = self.client.get('/api/public/venues/', {'fields': 'name,price_per_hour', 'include': 'images'}).json()['data'][0]
+        self.assertEqual(list(venue), ['name', 'price_per_hour', 'images'])
+        
+        response = self.client.get('/api/public/venues/', {'include': 'owner'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_mitra_venue_list_fieldset(self):
+        """Test the mitra venue list embeds images and facilities only when included"""
+        VenueImage.objects.create(venue=self.arena, image_url='https://example.com/arena.jpg')
+        self.client.login(username='testmitra', password='testpass123')
+        
+        venues = self.client.get('/api/venues/').json()['data']
+        self.assertIn('images', venues[0])
+        self.assertIn('facilities', venues[0])
+        
+        with self.assertNumQueries(2):  # session, venues
+            venues = self.client.get('/api/venues/', {'include': ''}).json()['data']
+        self.assertNotIn('images', venues[0])
+        self.assertIn('verification_status', venues[0])
+        
+        venues = self.client.get('/api/venues/', {'fields': 'id', 'include': 'images'}).json()['data']
+        arena = next(v for v in venues if v['id'] == str(self.arena.id))
+        self.assertEqual(set(arena), {'id', 'images'})
+        self.assertEqual(arena['images'][0]['url'], 'https://example.com/arena.jpg')
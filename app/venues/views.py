@@ -1,16 +1,33 @@
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Q, Avg
+from django.db import transaction
+from django.db.models import Avg, Prefetch
 from django.utils import timezone
 import json
 
-from app.venues.models import Venue, SportsCategory, VenueFacility, Facility, OperationalHour
+from app.venues import reference
+from app.venues.models import Venue, VenueFacility, OperationalHour
+from app.venues.geo import apply_venue_coordinates
+from app.venues.search import (
+    VENUE_CARD_FIELDS, VENUE_CARD_RELATIONS, pagination_payload, search_venues, serialize_venues,
+    venue_card_fields,
+)
+from app.venues.signals import touch_venues
+from app.venues.sync import parse_json_list, sync_venue_facilities, sync_venue_images
 from app.users.forms import VenueForm
 from app.revenue.models import ActivityLog
 from app.reviews.models import Review
-from app.courts.models import Court
 from app.users.decorators import login_required, role_required
+from lapangin.columnar import FastJsonResponse, to_columns, wants_columnar
+from lapangin.fieldsets import parse_fieldset
+
+# Fields of the mitra venue list; images and facilities are optional relations
+MITRA_VENUE_FIELDS = (
+    'id', 'name', 'address', 'location_url', 'latitude', 'longitude', 'contact', 'description',
+    'number_of_courts', 'verification_status', 'is_verified', 'created_at', 'updated_at',
+)
+MITRA_VENUE_RELATIONS = ('images', 'facilities')
 
 
 @csrf_exempt
@@ -21,10 +38,10 @@ def api_venue_update_status(request, venue_id):
     Supports PATCH (web dashboard) and POST (pbp_django_auth clients).
     Body: {"status": "approved"|"rejected", "rejection_reason": "..."}
     """
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({'status': 'error', 'message': 'Authentication required'}, status=401)
 
-    if getattr(request.user, 'role', None) != 'admin':
+    if request.principal.role != 'admin':
         return JsonResponse({'status': 'error', 'message': 'Access denied. Admin role required.'}, status=403)
 
     try:
@@ -78,105 +95,29 @@ def get_client_ip(request):
 # Venue List & Search API
 @require_http_methods(["GET"])
 def api_venue_list(request):
-    """API endpoint for venue list & search/filter"""
-    # Get query params
-    search = request.GET.get('search')  # General search parameter
-    name = request.GET.get('name')
-    category = request.GET.get('category')
-    min_price = request.GET.get('min_price')
-    max_price = request.GET.get('max_price')
-    location = request.GET.get('location')
-    
-    # Pagination params
-    page = int(request.GET.get('page', 1))
-    page_size = int(request.GET.get('page_size', 9))
-
-    venues = Venue.objects.filter(verification_status='approved').order_by('-created_at', 'name')
-    
-    # General search across multiple fields
-    if search:
-        venues = venues.filter(
-            Q(name__icontains=search) |
-            Q(address__icontains=search) |
-            Q(description__icontains=search)
-        )
-    
-    # Specific field searches
-    if name:
-        venues = venues.filter(name__icontains=name)
-    if category:
-        venues = venues.filter(courts__category__name=category).distinct()
-    if min_price:
-        venues = venues.filter(courts__price_per_hour__gte=min_price).distinct()
-    if max_price:
-        venues = venues.filter(courts__price_per_hour__lte=max_price).distinct()
-    if location:
-        venues = venues.filter(address__icontains=location)
-
-    # Get total count before pagination
-    total_count = venues.count()
-    
-    # Calculate pagination
-    total_pages = (total_count + page_size - 1) // page_size  # Ceiling division
-    offset = (page - 1) * page_size
-    
-    # Apply pagination
-    venues = venues[offset:offset + page_size]
-
-    data = []
-    for v in venues:
-        images = [img.image_url for img in v.images.all()]
-        avg_rating = Review.objects.filter(booking__court__venue=v).aggregate(Avg('rating'))['rating__avg'] or 0
-        
-        # Get all unique categories from courts in this venue
-        courts = Court.objects.filter(venue=v).select_related('category')
-        categories = set()
-        total_price = 0
-        court_count = 0
-        for court in courts:
-            if court.category:
-                categories.add(court.category.get_name_display())
-            total_price += float(court.price_per_hour)
-            court_count += 1
-        
-        categories_display = ', '.join(sorted(categories)) if categories else ''
-        avg_price = total_price / court_count if court_count > 0 else 0
-        
-        # Get venue facilities
-        facilities = [
-            {
-                'name': vf.facility.name,
-                'icon': vf.facility.icon
-            } for vf in VenueFacility.objects.filter(venue=v).select_related('facility')
-        ]
-        
-        data.append({
-            'id': str(v.id),
-            'name': v.name,
-            'category': categories_display,
-            'category_icon': None,  # Venue model doesn't have category field
-            'address': v.address,
-            'location_url': v.location_url,
-            'contact': v.contact,
-            'price_per_hour': float(avg_price),
-            'number_of_courts': v.number_of_courts,
-            'images': images,
-            'avg_rating': round(avg_rating, 1),
-            'rating_count': Review.objects.filter(booking__court__venue=v).count(),
-            'facilities': facilities,
+    """API endpoint for venue list & search/filter (``format=columnar`` returns column arrays, ``fields``/``include`` trim the cards)"""
+    try:
+        fieldset = parse_fieldset(request.GET, VENUE_CARD_FIELDS, VENUE_CARD_RELATIONS)
+        result = search_venues(request.GET)
+    except ValueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    
+    if wants_columnar(request):
+        return FastJsonResponse({
+            'status': 'ok',
+            'data': to_columns(
+                serialize_venues(result.venues, result.distances, fieldset),
+                fields=venue_card_fields(fieldset, result.distances)
+            ),
+            'pagination': pagination_payload(result),
+            'facets': result.facets,
         })
     
     return JsonResponse({
         'status': 'ok', 
-        'data': data,
-        'pagination': {
-            'page': page,
-            'page_size': page_size,
-            'total_count': total_count,
-            'total_pages': total_pages,
-            'has_next': page < total_pages,
-            'has_previous': page > 1
-        }
+        'data': serialize_venues(result.venues, result.distances, fieldset),
+        'pagination': pagination_payload(result),
+        'facets': result.facets,
     })
 
 # Public Venue Detail API (no authentication required)
@@ -234,6 +175,8 @@ def api_public_venue_detail(request, venue_id):
             'name': v.name,
             'address': v.address,
             'location_url': v.location_url,
+            'latitude': v.latitude,
+            'longitude': v.longitude,
             'contact': v.contact,
             'description': v.description,
             'number_of_courts': v.number_of_courts,
@@ -255,48 +198,63 @@ def api_public_venue_detail(request, venue_id):
 @require_http_methods(["GET", "POST"])
 def api_venues(request):
     """API endpoint for listing and creating venues"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
         }, status=403)
     
     if request.method == 'GET':
-        # List all venues for the mitra
-        venues = Venue.objects.filter(owner=request.user)
+        # List all venues for the mitra; fields/include skip unused relations
+        try:
+            fieldset = parse_fieldset(request.GET, MITRA_VENUE_FIELDS, MITRA_VENUE_RELATIONS)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'message': str(e)}, status=400)
+        
+        venues = Venue.objects.filter(owner_id=request.principal.id)
+        if fieldset.includes('images'):
+            venues = venues.prefetch_related('images')
+        if fieldset.includes('facilities'):
+            venues = venues.prefetch_related(
+                Prefetch('venuefacility_set', queryset=VenueFacility.objects.select_related('facility'))
+            )
         venues_data = []
         
         for venue in venues:
             # Get venue images
             images = []
-            for img in venue.images.all():
-                images.append({
-                    'id': img.id,
-                    'url': img.image_url,
-                    'is_primary': img.is_primary,
-                    'caption': img.caption
-                })
+            if fieldset.includes('images'):
+                for img in venue.images.all():
+                    images.append({
+                        'id': img.id,
+                        'url': img.image_url,
+                        'is_primary': img.is_primary,
+                        'caption': img.caption
+                    })
             
             # Get venue facilities
             facilities = []
-            for vf in VenueFacility.objects.filter(venue=venue).select_related('facility'):
-                facilities.append({
-                    'id': vf.facility.id,
-                    'name': vf.facility.name,
-                    'icon': vf.facility.icon
-                })
+            if fieldset.includes('facilities'):
+                for vf in venue.venuefacility_set.all():
+                    facilities.append({
+                        'id': vf.facility.id,
+                        'name': vf.facility.name,
+                        'icon': vf.facility.icon
+                    })
             
-            venues_data.append({
+            venues_data.append(fieldset.filter({
                 'id': str(venue.id),
                 'name': venue.name,
                 'address': venue.address,
                 'location_url': venue.location_url,
+                'latitude': venue.latitude,
+                'longitude': venue.longitude,
                 'contact': venue.contact,
                 'description': venue.description,
                 'number_of_courts': venue.number_of_courts,
@@ -306,7 +264,7 @@ def api_venues(request):
                 'updated_at': venue.updated_at.isoformat(),
                 'images': images,
                 'facilities': facilities
-            })
+            }))
         
         return JsonResponse({
             'success': True,
@@ -329,56 +287,18 @@ def api_venues(request):
                     description=body.get('description', ''),
                     number_of_courts=0
                 )
-                venue.save()
-
-                # Handle image URLs (list or JSON string)
-                image_urls_data = body.get('image_urls', [])
                 try:
-                    if isinstance(image_urls_data, str):
-                        image_urls = json.loads(image_urls_data)
-                    else:
-                        image_urls = image_urls_data
-
-                    from app.venues.models import VenueImage
-                    for idx, url in enumerate(image_urls or []):
-                        if url and str(url).strip():
-                            VenueImage.objects.create(
-                                venue=venue,
-                                image_url=str(url).strip(),
-                                is_primary=(idx == 0),
-                            )
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    pass  # Continue without images if parsing fails
-
-                # Handle facilities (list or JSON string)
-                facilities_data = body.get('facilities', [])
-                try:
-                    if isinstance(facilities_data, str):
-                        facilities = json.loads(facilities_data)
-                    else:
-                        facilities = facilities_data
-
-                    for facility_data in facilities or []:
-                        if not isinstance(facility_data, dict):
-                            continue
-                        if facility_data.get('name'):
-                            facility, created = Facility.objects.get_or_create(
-                                name=facility_data['name'],
-                                defaults={'icon': facility_data.get('icon', '')}
-                            )
-                            if (
-                                not created
-                                and facility_data.get('icon')
-                                and facility.icon != facility_data.get('icon')
-                            ):
-                                facility.icon = facility_data.get('icon')
-                                facility.save()
-                            VenueFacility.objects.get_or_create(
-                                venue=venue,
-                                facility=facility
-                            )
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    pass  # Continue without facilities if parsing fails
+                    apply_venue_coordinates(venue, body)
+                except ValueError:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Koordinat tidak valid'
+                    }, status=400)
+                # Save the venue, its images and facilities in one transaction
+                with transaction.atomic():
+                    venue.save()
+                    sync_venue_images(venue, parse_json_list(body.get('image_urls')) or [])
+                    sync_venue_facilities(venue, parse_json_list(body.get('facilities')) or [])
                 
                 # Log the activity
                 ActivityLog.objects.create(
@@ -409,45 +329,19 @@ def api_venues(request):
                 venue.owner = request.user
                 # Set initial number_of_courts to 0 (will be updated when courts are added)
                 venue.number_of_courts = 0
-                venue.save()
-                
-                # Handle image URLs (JSON array of URLs)
-                image_urls_str = request.POST.get('image_urls', '[]')
                 try:
-                    image_urls = json.loads(image_urls_str)
-                    from app.venues.models import VenueImage
-                    for idx, url in enumerate(image_urls):
-                        if url and url.strip():
-                            VenueImage.objects.create(
-                                venue=venue,
-                                image_url=url.strip(),
-                                is_primary=(idx == 0)  # First image is primary
-                            )
-                except (json.JSONDecodeError, ValueError):
-                    pass  # Continue without images if parsing fails
+                    apply_venue_coordinates(venue, request.POST)
+                except ValueError:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Koordinat tidak valid'
+                    }, status=400)
                 
-                # Handle facilities (JSON array of facility objects)
-                facilities_str = request.POST.get('facilities', '[]')
-                try:
-                    facilities = json.loads(facilities_str)
-                    for facility_data in facilities:
-                        if facility_data.get('name'):
-                            # Get or create facility
-                            facility, created = Facility.objects.get_or_create(
-                                name=facility_data['name'],
-                                defaults={'icon': facility_data.get('icon', '')}
-                            )
-                            # If facility exists but icon is different, update it
-                            if not created and facility_data.get('icon') and facility.icon != facility_data.get('icon'):
-                                facility.icon = facility_data.get('icon')
-                                facility.save()
-                            # Create venue-facility relationship
-                            VenueFacility.objects.get_or_create(
-                                venue=venue,
-                                facility=facility
-                            )
-                except (json.JSONDecodeError, ValueError):
-                    pass  # Continue without facilities if parsing fails
+                # Save the venue, its images (first one is primary) and facilities in one transaction
+                with transaction.atomic():
+                    venue.save()
+                    sync_venue_images(venue, parse_json_list(request.POST.get('image_urls')) or [])
+                    sync_venue_facilities(venue, parse_json_list(request.POST.get('facilities')) or [])
                 
                 # Log the activity
                 ActivityLog.objects.create(
@@ -483,20 +377,20 @@ def api_venues(request):
 @csrf_exempt
 def api_venue_detail(request, venue_id):
     """API endpoint for getting, updating, and deleting a specific venue"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
         }, status=403)
     
     try:
-        venue = Venue.objects.get(id=venue_id, owner=request.user)
+        venue = Venue.objects.get(id=venue_id, owner_id=request.principal.id)
     except Venue.DoesNotExist:
         return JsonResponse({
             'success': False,
@@ -539,6 +433,8 @@ def api_venue_detail(request, venue_id):
             'name': venue.name,
             'address': venue.address,
             'location_url': venue.location_url or '',
+            'latitude': venue.latitude,
+            'longitude': venue.longitude,
             'contact': venue.contact or '',
             'description': venue.description or '',
             'number_of_courts': venue.number_of_courts,
@@ -562,85 +458,32 @@ def api_venue_detail(request, venue_id):
             body = json.loads(request.body)
             
             # Update basic fields
+            previous_location = (venue.address, venue.location_url)
             venue.name = body.get('name', venue.name)
             venue.address = body.get('address', venue.address)
             venue.location_url = body.get('location_url', '')
             venue.contact = body.get('contact', '')
             venue.description = body.get('description', '')
-            venue.save()
-            
-            # Handle image URLs
-            image_urls_data = body.get('image_urls', '[]')
             try:
-                if isinstance(image_urls_data, str):
-                    image_urls = json.loads(image_urls_data)
-                else:
-                    image_urls = image_urls_data
-                
-                # Clean submitted URLs
-                submitted_urls = [url.strip() for url in image_urls if url and url.strip()]
-                
-                # Delete images not in submitted list
-                venue.images.exclude(image_url__in=submitted_urls).delete()
-                
-                # Get existing URLs
-                existing_urls = set(venue.images.values_list('image_url', flat=True))
-                
-                # Add new images
-                from app.venues.models import VenueImage
-                for idx, url in enumerate(submitted_urls):
-                    if url not in existing_urls:
-                        is_primary = (idx == 0 and not venue.images.filter(is_primary=True).exists())
-                        VenueImage.objects.create(
-                            venue=venue,
-                            image_url=url,
-                            is_primary=is_primary
-                        )
-            except (json.JSONDecodeError, ValueError):
-                pass
-            
-            # Handle facilities
-            facilities_data = body.get('facilities', '[]')
-            try:
-                if isinstance(facilities_data, str):
-                    facilities = json.loads(facilities_data)
-                else:
-                    facilities = facilities_data
-                
-                # Get current facility names
-                current_facility_names = set(
-                    VenueFacility.objects.filter(venue=venue).values_list('facility__name', flat=True)
+                apply_venue_coordinates(
+                    venue, body, relocated=(venue.address, venue.location_url) != previous_location
                 )
-                
-                # Get submitted facility names
-                submitted_facility_names = set()
-                for facility_data in facilities:
-                    if facility_data.get('name'):
-                        submitted_facility_names.add(facility_data['name'])
-                        # Get or create facility
-                        facility, created = Facility.objects.get_or_create(
-                            name=facility_data['name'],
-                            defaults={'icon': facility_data.get('icon', '')}
-                        )
-                        # Update icon if different
-                        if not created and facility_data.get('icon') and facility.icon != facility_data.get('icon'):
-                            facility.icon = facility_data.get('icon')
-                            facility.save()
-                        # Create venue-facility relationship
-                        VenueFacility.objects.get_or_create(
-                            venue=venue,
-                            facility=facility
-                        )
-                
-                # Remove facilities no longer in list
-                facilities_to_remove = current_facility_names - submitted_facility_names
-                if facilities_to_remove:
-                    VenueFacility.objects.filter(
-                        venue=venue,
-                        facility__name__in=facilities_to_remove
-                    ).delete()
-            except (json.JSONDecodeError, ValueError):
-                pass
+            except ValueError:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Koordinat tidak valid'
+                }, status=400)
+            
+            # Images and facilities are only synced when sent; anything left
+            # out of a submitted list is removed
+            image_urls = parse_json_list(body.get('image_urls'))
+            facilities = parse_json_list(body.get('facilities'))
+            with transaction.atomic():
+                venue.save()
+                if image_urls is not None:
+                    sync_venue_images(venue, image_urls)
+                if facilities is not None:
+                    sync_venue_facilities(venue, facilities)
             
             # Log activity
             ActivityLog.objects.create(
@@ -676,77 +519,28 @@ def api_venue_detail(request, venue_id):
             form = VenueForm(request.POST, instance=venue)
             
             if form.is_valid():
-                venue = form.save()
-                
-                # Handle image URLs update
-                # Delete images not in the submitted list, add new ones
-                image_urls_str = request.POST.get('image_urls', '')
-                if image_urls_str:
-                    try:
-                        image_urls = json.loads(image_urls_str)
-                        from app.venues.models import VenueImage
-                        
-                        # Clean and normalize submitted URLs
-                        submitted_urls = [url.strip() for url in image_urls if url and url.strip()]
-                        
-                        # Delete images that are not in the submitted list
-                        venue.images.exclude(image_url__in=submitted_urls).delete()
-                        
-                        # Get current image URLs after deletion
-                        existing_urls = set(venue.images.values_list('image_url', flat=True))
-                        
-                        # Add new images that don't exist yet
-                        for idx, url in enumerate(submitted_urls):
-                            if url not in existing_urls:
-                                is_primary = (idx == 0 and not venue.images.filter(is_primary=True).exists())
-                                VenueImage.objects.create(
-                                    venue=venue,
-                                    image_url=url,
-                                    is_primary=is_primary
-                                )
-                    except (json.JSONDecodeError, ValueError):
-                        pass  # Continue without images if parsing fails
+                venue = form.save(commit=False)
+                try:
+                    apply_venue_coordinates(
+                        venue, request.POST,
+                        relocated=bool({'address', 'location_url'} & set(form.changed_data))
+                    )
+                except ValueError:
+                    return JsonResponse({
+                        'success': False,
+                        'message': 'Koordinat tidak valid'
+                    }, status=400)
                 
-                # Handle facilities update
-                facilities_str = request.POST.get('facilities', '')
-                if facilities_str:
-                    try:
-                        facilities = json.loads(facilities_str)
-                        
-                        # Get current facilities
-                        current_facility_names = set(
-                            VenueFacility.objects.filter(venue=venue).values_list('facility__name', flat=True)
-                        )
-                        
-                        # Get submitted facility names
-                        submitted_facility_names = set()
-                        for facility_data in facilities:
-                            if facility_data.get('name'):
-                                submitted_facility_names.add(facility_data['name'])
-                                # Get or create facility
-                                facility, created = Facility.objects.get_or_create(
-                                    name=facility_data['name'],
-                                    defaults={'icon': facility_data.get('icon', '')}
-                                )
-                                # If facility exists but icon is different, update it
-                                if not created and facility_data.get('icon') and facility.icon != facility_data.get('icon'):
-                                    facility.icon = facility_data.get('icon')
-                                    facility.save()
-                                # Create venue-facility relationship if doesn't exist
-                                VenueFacility.objects.get_or_create(
-                                    venue=venue,
-                                    facility=facility
-                                )
-                        
-                        # Remove facilities that are no longer in the list
-                        facilities_to_remove = current_facility_names - submitted_facility_names
-                        if facilities_to_remove:
-                            VenueFacility.objects.filter(
-                                venue=venue,
-                                facility__name__in=facilities_to_remove
-                            ).delete()
-                    except (json.JSONDecodeError, ValueError):
-                        pass  # Continue without facilities if parsing fails
+                # Images and facilities are only synced when sent; anything
+                # left out of a submitted list is removed
+                image_urls = parse_json_list(request.POST.get('image_urls'))
+                facilities = parse_json_list(request.POST.get('facilities'))
+                with transaction.atomic():
+                    venue.save()
+                    if image_urls is not None:
+                        sync_venue_images(venue, image_urls)
+                    if facilities is not None:
+                        sync_venue_facilities(venue, facilities)
                 
                 # Log the activity
                 ActivityLog.objects.create(
@@ -810,8 +604,8 @@ def api_venue_detail(request, venue_id):
 
 @require_http_methods(["GET"])
 def api_sports_categories(request):
-    """API endpoint for getting all sports categories"""
-    categories = SportsCategory.objects.all()
+    """API endpoint for getting all sports categories (served from app.venues.reference)"""
+    categories = reference.sports_categories()
     categories_data = []
     
     for category in categories:
@@ -831,13 +625,13 @@ def api_sports_categories(request):
 @require_http_methods(["DELETE"])
 def api_delete_venue_image(request, image_id):
     """API endpoint for deleting a venue image"""
-    if not request.user.is_authenticated:
+    if not request.principal.is_authenticated:
         return JsonResponse({
             'success': False,
             'message': 'Authentication required'
         }, status=401)
     
-    if request.user.role != 'mitra':
+    if request.principal.role != 'mitra':
         return JsonResponse({
             'success': False,
             'message': 'Access denied. Mitra role required.'
@@ -845,8 +639,9 @@ def api_delete_venue_image(request, image_id):
     
     try:
         from app.venues.models import VenueImage
-        image = VenueImage.objects.get(id=image_id, venue__owner=request.user)
+        image = VenueImage.objects.get(id=image_id, venue__owner_id=request.principal.id)
         image.delete()
+        touch_venues([image.venue_id])
         
         return JsonResponse({
             'success': True,
@@ -884,7 +679,7 @@ def api_venue_operational_hours(request, venue_id):
     DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     
     try:
-        venue = Venue.objects.get(id=venue_id, owner=request.user)
+        venue = Venue.objects.get(id=venue_id, owner_id=request.principal.id)
     except Venue.DoesNotExist:
         return JsonResponse({
             'success': False,
@@ -973,7 +768,7 @@ def api_venue_operational_hour_detail(request, venue_id, hour_id):
     DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     
     try:
-        venue = Venue.objects.get(id=venue_id, owner=request.user)
+        venue = Venue.objects.get(id=venue_id, owner_id=request.principal.id)
         hour = OperationalHour.objects.get(id=hour_id, venue=venue)
     except Venue.DoesNotExist:
         return JsonResponse({
@@ -1039,6 +834,7 @@ def api_venue_operational_hour_detail(request, venue_id, hour_id):
     
     elif request.method == 'DELETE' or request.POST.get('_method') == 'DELETE':
         hour.delete()
+        touch_venues([venue.id])
         return JsonResponse({
             'success': True,
             'message': 'Jam operasional berhasil dihapus'
@@ -0,0 +1,72 @@
+"""
+Sparse fieldsets for the JSON list endpoints.
+
+``?fields=id,name`` limits a resource to the listed fields and ``?include=``
+picks the embedded relations (``images``, ``courts``, ``courts.images``...).
+Without either parameter (or with an empty ``fields``) every field and
+relation is returned, as before. When ``fields`` is given, only the
+relations it names (or ``include`` adds) are embedded, so ``fields=id,name``
+is a flat list, and an empty ``include=`` drops every relation. Endpoints ask the
+Fieldset which relations are wanted before prefetching them, so an omitted
+relation costs neither its query nor its serialization.
+"""
+
+
+class Fieldset:
+    """The fields and relations of one resource requested by a client"""
+
+    def __init__(self, fields, include):
+        self.fields = frozenset(fields)
+        self.include = frozenset(include)
+
+    def __contains__(self, name):
+        return name in self.fields or name in self.include
+
+    def wants(self, *names):
+        """Whether any of ``names`` (fields or relations) is requested"""
+        return any(name in self for name in names)
+
+    def includes(self, relation):
+        return relation in self.include
+
+    def filter(self, record):
+        """``record`` without the keys that were not requested"""
+        return {key: value for key, value in record.items() if key in self}
+
+
+def parse_fieldset(params, fields, relations=()):
+    """Read ``fields`` and ``include`` from ``params`` (a QueryDict or dict).
+
+    ``fields`` lists every field of the resource and ``relations`` every
+    embeddable relation; nested relations are dotted (``courts.images``) and
+    imply their parent. Raises ValueError naming unknown fields or relations.
+    """
+    fields = tuple(fields)
+    relations = tuple(relations)
+    requested_fields = _split(params.get('fields')) or None
+    requested_include = _split(params.get('include'))
+
+    if requested_fields is None and requested_include is None:
+        return Fieldset(fields, relations)
+
+    unknown = [name for name in requested_fields or () if name not in fields and name not in relations]
+    unknown += [name for name in requested_include or () if name not in relations]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+
+    if requested_fields is None:
+        selected_fields = fields
+        include = set(requested_include)
+    else:
+        selected_fields = [name for name in fields if name in requested_fields]
+        include = {name for name in requested_fields if name in relations} | set(requested_include or ())
+    for name in list(include):
+        parts = name.split('.')
+        include.update('.'.join(parts[:depth]) for depth in range(1, len(parts)))
+    return Fieldset(selected_fields, include)
+
+
+def _split(value):
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
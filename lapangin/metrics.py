@@ -0,0 +1,285 @@
+"""
+In-process metrics registry exposed in the Prometheus text format.
+
+Every worker keeps its own counters and histograms in memory. When
+``METRICS_MULTIPROC_DIR`` is set (e.g. under gunicorn with several workers),
+each process periodically dumps a JSON snapshot of its values into that
+directory and the ``/metrics`` endpoint sums the snapshots of all workers,
+so the scrape result does not depend on which worker answered it.
+"""
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labelnames, labels):
+    """Return a stable key for a label set, validating the label names"""
+    if set(labels) != set(labelnames):
+        raise ValueError(f'Expected labels {sorted(labelnames)}, got {sorted(labels)}')
+    return json.dumps([str(labels[name]) for name in labelnames])
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels"""
+    kind = 'counter'
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('Counters can only be incremented')
+        key = _label_key(self.labelnames, labels)
+        with self._registry.lock:
+            self._values[key] = self._values.get(key, 0) + amount
+            self._registry.dirty = True
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def snapshot(self):
+        return dict(self._values)
+
+    @staticmethod
+    def merge(target, samples):
+        for key, value in samples.items():
+            target[key] = target.get(key, 0) + value
+
+    def render(self, samples):
+        lines = []
+        for key in sorted(samples):
+            pairs = list(zip(self.labelnames, json.loads(key)))
+            lines.append(f'{self.name}{_format_labels(pairs)} {_format_value(samples[key])}')
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values over fixed cumulative buckets"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._registry = registry
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._registry.lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = {
+                    'buckets': [0] * len(self.buckets),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    sample['buckets'][index] += 1
+                    break
+            sample['sum'] += value
+            sample['count'] += 1
+            self._registry.dirty = True
+
+    def count(self, **labels):
+        sample = self._values.get(_label_key(self.labelnames, labels))
+        return sample['count'] if sample else 0
+
+    def snapshot(self):
+        return {
+            key: {'buckets': list(sample['buckets']), 'sum': sample['sum'], 'count': sample['count']}
+            for key, sample in self._values.items()
+        }
+
+    @staticmethod
+    def merge(target, samples):
+        for key, sample in samples.items():
+            current = target.get(key)
+            if current is None or len(current['buckets']) != len(sample['buckets']):
+                target[key] = {'buckets': list(sample['buckets']), 'sum': sample['sum'], 'count': sample['count']}
+                continue
+            current['buckets'] = [a + b for a, b in zip(current['buckets'], sample['buckets'])]
+            current['sum'] += sample['sum']
+            current['count'] += sample['count']
+
+    def render(self, samples):
+        lines = []
+        for key in sorted(samples):
+            sample = samples[key]
+            pairs = list(zip(self.labelnames, json.loads(key)))
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, sample['buckets']):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(pairs + [('le', _format_value(upper_bound))])
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            inf_labels = _format_labels(pairs + [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{inf_labels} {sample["count"]}')
+            lines.append(f'{self.name}_sum{_format_labels(pairs)} {_format_value(sample["sum"])}')
+            lines.append(f'{self.name}_count{_format_labels(pairs)} {sample["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """Holds all metrics of this process and renders them for scraping"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dirty = False
+        self._metrics = {}
+        self._last_flush = 0.0
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def reset(self):
+        """Drop all recorded values (used by tests)"""
+        with self.lock:
+            for metric in self._metrics.values():
+                metric._values.clear()
+            self.dirty = False
+
+    # Multiprocess support -------------------------------------------------
+
+    @staticmethod
+    def multiproc_dir():
+        return getattr(settings, 'METRICS_MULTIPROC_DIR', None) or None
+
+    def flush(self, force=False):
+        """Write this process' snapshot into the shared directory.
+
+        Writes are throttled to ``METRICS_FLUSH_INTERVAL`` seconds unless
+        ``force`` is set; the file is replaced atomically so a concurrent
+        scrape never reads a half-written snapshot.
+        """
+        directory = self.multiproc_dir()
+        if not directory or not (self.dirty or force):
+            return
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0)
+        now = time.monotonic()
+        if not force and now - self._last_flush < interval:
+            return
+        self._last_flush = now
+        self.dirty = False
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """Return the samples to expose, merged across workers if configured"""
+        directory = self.multiproc_dir()
+        if not directory:
+            return self.snapshot()
+
+        self.flush(force=True)
+        merged = {name: {} for name in self._metrics}
+        for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+            try:
+                with open(path, encoding='utf-8') as fh:
+                    worker_samples = json.load(fh)
+            except (OSError, ValueError):
+                # Another worker may be replacing its file right now.
+                continue
+            for name, samples in worker_samples.items():
+                metric = self._metrics.get(name)
+                if metric is not None:
+                    metric.merge(merged[name], samples)
+        return merged
+
+    def render(self):
+        samples = self.collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.render(samples.get(name, {})))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush, force=True)
+
+
+# Application metrics ------------------------------------------------------
+
+REQUEST_LATENCY = registry.histogram(
+    'lapangin_http_request_duration_seconds',
+    'Time spent handling a request, per URL name',
+    labelnames=('view', 'method'),
+)
+REQUESTS_TOTAL = registry.counter(
+    'lapangin_http_requests_total',
+    'Handled requests, per URL name and response status',
+    labelnames=('view', 'method', 'status'),
+)
+BOOKINGS_CREATED = registry.counter(
+    'lapangin_bookings_created_total',
+    'Bookings created through create_booking',
+)
+BOOKINGS_CANCELLED = registry.counter(
+    'lapangin_bookings_cancelled_total',
+    'Bookings cancelled, by who cancelled them',
+    labelnames=('actor',),
+)
+PROXY_IMAGE_UPSTREAM_LATENCY = registry.histogram(
+    'lapangin_proxy_image_upstream_seconds',
+    'Time until proxy_image received the upstream response headers',
+)
+PROXY_IMAGE_BYTES = registry.counter(
+    'lapangin_proxy_image_bytes_total',
+    'Bytes served by proxy_image, by source',
+    labelnames=('source',),
+)
+ACTIVITY_LOG_WRITES = registry.counter(
+    'lapangin_activity_log_writes_total',
+    'ActivityLog rows written, by action type',
+    labelnames=('action_type',),
+)
@@ -1,6 +1,15 @@
 """
-Custom middleware for development
+Custom middleware for the lapangin project
 """
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.utils.functional import SimpleLazyObject
+
+from app.users import tokens
+from app.users.principal import ANONYMOUS, get_principal
+from lapangin import metrics
+
 
 class DevCsrfMiddleware:
     """
@@ -21,3 +30,70 @@ class DevCsrfMiddleware:
             if origin not in settings.CSRF_TRUSTED_ORIGINS:
                 settings.CSRF_TRUSTED_ORIGINS.append(origin)
         return None
+
+
+class MetricsMiddleware:
+    """
+    Record request latency and response status per resolved URL name
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or '<unmatched>'
+        metrics.REQUEST_LATENCY.observe(elapsed, view=view, method=request.method)
+        metrics.REQUESTS_TOTAL.inc(view=view, method=request.method, status=response.status_code)
+        metrics.registry.flush()
+        return response
+
+
+class PrincipalMiddleware:
+    """
+    Expose the session's principal (id, role, is_verified) as request.principal
+    without loading the User row; see app.users.principal
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.principal = SimpleLazyObject(lambda: get_principal(request))
+        return self.get_response(request)
+
+
+class TokenAuthenticationMiddleware:
+    """
+    Authenticate ``Authorization: Bearer <access token>`` requests from the
+    signed token alone (app.users.tokens), without reading the session table.
+    Requests without the header keep the session flow. A bearer value that is
+    not a valid access token (expired, revoked, or another scheme's token such
+    as METRICS_TOKEN) leaves the request anonymous; the view decides, and a
+    401 it returns tells the client to refresh.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = tokens.bearer_token(request)
+        if token is None:
+            return self.get_response(request)
+
+        try:
+            principal = tokens.principal_from_access_token(token)
+        except tokens.InvalidToken:
+            request._principal = ANONYMOUS
+            request.user = AnonymousUser()
+            response = self.get_response(request)
+            if response.status_code == 401:
+                response['WWW-Authenticate'] = 'Bearer error="invalid_token"'
+            return response
+
+        request._principal = principal
+        request.user = SimpleLazyObject(lambda: tokens.get_user(principal.id))
+        # The token is not an ambient credential like the session cookie
+        request._dont_enforce_csrf_checks = True
+        return self.get_response(request)
@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination for the JSON list endpoints.
+
+Instead of OFFSET, each page remembers the sort value and primary key of its
+last row in an opaque cursor; the next page filters for rows strictly after
+that position. The cost of a page stays constant however deep the client
+scrolls, and rows inserted meanwhile do not shift or duplicate results.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the ordering"""
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+def encode_cursor(ordering, values):
+    payload = json.dumps([ordering, values], default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, ordering):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_ordering, values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    if cursor_ordering != ordering or not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursor('Cursor does not match the requested sort order')
+    return values
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Clamp a page_size query parameter to 1..maximum, falling back to default"""
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, maximum))
+
+
+def paginate_by_cursor(queryset, ordering, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Return ``(rows, next_cursor)`` for one page of ``queryset``.
+
+    ``ordering`` is a single field name, optionally prefixed with ``-``; the
+    primary key is appended as a tie-breaker in the same direction so the
+    position of every row is unique. ``next_cursor`` is None on the last page.
+    """
+    descending = ordering.startswith('-')
+    field = ordering.lstrip('-')
+    pk_ordering = '-pk' if descending else 'pk'
+    queryset = queryset.order_by(ordering, pk_ordering)
+
+    if cursor:
+        value, pk = decode_cursor(cursor, ordering)
+        after = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{after}': value}) | Q(**{field: value, f'pk__{after}': pk})
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(ordering, [getattr(last, field), last.pk])
+    return rows, next_cursor
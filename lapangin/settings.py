@@ -87,16 +87,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'lapangin.middleware.MetricsMiddleware',  # Outermost so latency covers the whole stack
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files before sessions/auth run
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'lapangin.middleware.DevCsrfMiddleware',  # Custom middleware for dev
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'lapangin.middleware.TokenAuthenticationMiddleware',  # Bearer tokens of the mobile app, no session
+    'lapangin.middleware.PrincipalMiddleware',  # request.principal: role checks without a user query
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
 ROOT_URLCONF = 'lapangin.urls'
@@ -221,6 +224,24 @@ STATICFILES_DIRS = [
 # Vercel auto-detects this and runs collectstatic + serves the result from its CDN
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Production builds fingerprint and precompress static files during
+# collectstatic (gzip, plus brotli if the brotli package is installed), so
+# WhiteNoise can serve them with immutable caching. Development and tests keep
+# the plain storage, which needs no collectstatic manifest.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'lapangin.storage.StaticStorage' if PRODUCTION
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Also write WebP copies of dataset photos during collectstatic (needs Pillow)
+STATIC_WEBP = os.getenv('STATIC_WEBP', 'False').lower() == 'true'
+STATIC_WEBP_QUALITY = int(os.getenv('STATIC_WEBP_QUALITY', '80'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -238,3 +259,64 @@ CORS_ALLOWED_ORIGINS = [
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
+
+# Metrics (/metrics, Prometheus text format)
+# Under gunicorn with several workers, point this at a directory shared by all
+# workers (e.g. /tmp/lapangin-metrics) so /metrics aggregates every process.
+# Empty the directory before (re)starting the server to reset the counters.
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '').strip() or None
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1.0'))
+# When set, scrapers must send "Authorization: Bearer <token>".
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '').strip() or None
+
+# Cache (template fragments of public pages). Set REDIS_URL to share it
+# between workers; otherwise each process keeps its own in-memory cache.
+# Fragments are keyed by version stamps, so a per-process cache never
+# serves stale data, it is just warmed separately. The key prefix changes
+# with each deploy so cached markup never points at old static files.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX') or os.getenv('VERCEL_GIT_COMMIT_SHA', '')[:12],
+    }
+}
+if os.getenv('REDIS_URL'):
+    CACHES['default'].update({
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    })
+
+# Seconds a worker keeps its copy of the sports categories and facilities
+# (app.venues.reference) before re-reading them; edits reach other workers
+# at once only through a shared cache
+REFERENCE_DATA_MAX_AGE = int(os.getenv('REFERENCE_DATA_MAX_AGE', '60'))
+
+# Seconds a session's cached principal (id, role, is_verified) is trusted
+# before it is re-read from the user table (app.users.principal). Saving the
+# user expires it at once through the cache above, but only on every worker
+# when that cache is shared; otherwise a demoted or deactivated user keeps
+# their old role elsewhere for up to this long, so the default is short.
+PRINCIPAL_TTL = int(os.getenv('PRINCIPAL_TTL', '300' if os.getenv('REDIS_URL') else '30'))
+
+# Lifetimes (seconds) of the bearer tokens issued to the mobile app by
+# api_login with "auth": "token" (app.users.tokens). Refresh tokens are
+# revoked in the database; access tokens only through the cache, so without
+# a shared one a logged-out access token lives on other workers until it expires
+ACCESS_TOKEN_TTL = int(os.getenv('ACCESS_TOKEN_TTL', '900' if os.getenv('REDIS_URL') else '300'))
+REFRESH_TOKEN_TTL = int(os.getenv('REFRESH_TOKEN_TTL', str(30 * 24 * 3600)))
+
+# Logging: application loggers stay quiet unless LOG_LEVEL is raised,
+# e.g. LOG_LEVEL=DEBUG to trace venue searches
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'app': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'WARNING').upper(),
+        },
+    },
+}
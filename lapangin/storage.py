@@ -0,0 +1,82 @@
+"""
+Static files storage for production builds.
+
+``collectstatic`` with :class:`StaticStorage` writes every asset under a
+content-hashed name (``app.3f2a9c1b.js``), so WhiteNoise serves it with a
+one-year ``immutable`` Cache-Control header, and precompresses text assets
+to ``.gz`` (and ``.br`` when the optional ``brotli`` package is installed).
+With ``STATIC_WEBP`` enabled, dataset photos additionally get a WebP copy
+next to the hashed original (``photo.3f2a9c1b.jpg.webp``) that
+:func:`webp_variant` hands to clients accepting ``image/webp``.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+WEBP_SOURCE_RE = re.compile(r'\.(jpe?g|png)$', re.IGNORECASE)
+
+
+class StaticStorage(CompressedManifestStaticFilesStorage):
+    # Unknown files fall back to their plain URL instead of failing the page
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run or not getattr(settings, 'STATIC_WEBP', False):
+            return
+        for name in sorted(paths):
+            if not self.should_transcode(name):
+                continue
+            hashed_name = self.stored_name(name)
+            try:
+                webp_name = transcode_webp(self.path(hashed_name))
+            except (OSError, ValueError) as e:
+                yield name, None, e
+                continue
+            if webp_name:
+                yield name, f'{hashed_name}.webp', True
+
+    def should_transcode(self, name):
+        prefixes = getattr(settings, 'STATIC_WEBP_PREFIXES', ('img/dataset-photos/',))
+        return name.startswith(tuple(prefixes)) and bool(WEBP_SOURCE_RE.search(name))
+
+
+def transcode_webp(path, quality=None):
+    """Write ``<path>.webp`` unless it would not be smaller; returns its path or None.
+
+    Requires Pillow; raises ValueError if it is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ValueError('STATIC_WEBP requires Pillow')
+
+    quality = quality or getattr(settings, 'STATIC_WEBP_QUALITY', 80)
+    target = f'{path}.webp'
+    with Image.open(path) as image:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        image.save(target, 'WEBP', quality=quality, method=6)
+    if os.path.getsize(target) >= os.path.getsize(path):
+        os.unlink(target)
+        return None
+    return target
+
+
+def webp_variant(name):
+    """Hashed name of the WebP copy of static file ``name``, or None.
+
+    Only meaningful when the manifest storage is active (production builds).
+    """
+    if not isinstance(staticfiles_storage, StaticStorage) or not WEBP_SOURCE_RE.search(name):
+        return None
+    try:
+        hashed_name = staticfiles_storage.stored_name(name)
+    except ValueError:
+        return None
+    webp_name = f'{hashed_name}.webp'
+    return webp_name if staticfiles_storage.exists(webp_name) else None
@@ -0,0 +1,112 @@
+"""
+Set-based synchronisation of child rows (sessions, images, facilities, ...).
+
+Editors submit the complete desired list of children for a parent. Rather
+than fetching, saving and deleting one row at a time, :func:`sync_children`
+diffs the desired list against the current rows in memory and applies the
+result with one ``bulk_create``, one ``bulk_update`` and one ``delete()``.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+
+
+SyncResult = namedtuple('SyncResult', ['created', 'updated', 'deleted'])
+
+
+def sync_children(model, existing, desired, key, fields, build, delete_missing=True):
+    """Make the rows in ``existing`` match ``desired``.
+
+    ``existing`` is an iterable of the parent's current ``model`` instances and
+    ``desired`` an iterable of dicts. Each dict is matched to an existing row
+    through ``key`` (an attribute name such as ``'id'`` or ``'image_url'``);
+    matched rows get ``fields`` copied from the dict and are written only if a
+    value actually changed, unmatched dicts are turned into new instances by
+    ``build(item)``, and rows that no dict matched are deleted unless
+    ``delete_missing`` is False. Dicts whose key is empty are always created.
+
+    Returns a SyncResult with the created instances, the updated instances and
+    the number of deleted rows.
+    """
+    model_fields = {name: model._meta.get_field(name) for name in fields}
+    by_key = {getattr(obj, key): obj for obj in existing}
+    key_field = model._meta.pk if key == 'id' else model._meta.get_field(key)
+
+    to_create, to_update, seen, created_keys = [], [], set(), set()
+    for item in desired:
+        item_key = item.get(key)
+        if item_key not in (None, ''):
+            item_key = key_field.to_python(item_key)
+        obj = by_key.get(item_key) if item_key not in (None, '') else None
+        if obj is None:
+            if item_key in (None, ''):
+                to_create.append(build(item))
+            elif key != 'id' and item_key not in created_keys:
+                created_keys.add(item_key)
+                to_create.append(build(item))
+            # Unknown ids (e.g. rows of another parent) are ignored
+            continue
+        if obj.pk in seen:
+            continue
+        seen.add(obj.pk)
+
+        changed = False
+        for name, field in model_fields.items():
+            if name not in item:
+                continue
+            value = field.to_python(item[name])
+            if getattr(obj, field.attname) != value:
+                setattr(obj, field.attname, value)
+                changed = True
+        if changed:
+            to_update.append(obj)
+
+    stale = [obj.pk for obj in by_key.values() if obj.pk not in seen] if delete_missing else []
+
+    with transaction.atomic():
+        if stale:
+            model.objects.filter(pk__in=stale).delete()
+        if to_update:
+            model.objects.bulk_update(to_update, list(fields))
+        created = model.objects.bulk_create(to_create) if to_create else []
+
+    return SyncResult(created, to_update, len(stale))
+
+
+def sync_image_urls(model, parent_field, parent, image_urls):
+    """Make the images of ``parent`` exactly ``image_urls`` (in order, deduplicated).
+
+    ``model`` is an image model with ``image_url`` and ``is_primary`` fields
+    and a foreign key ``parent_field`` to the parent. Existing rows for kept
+    URLs are left alone; if none of them is primary, the first submitted URL
+    becomes the primary image.
+    """
+    urls = []
+    for url in image_urls or []:
+        url = str(url or '').strip()
+        if url and url not in urls:
+            urls.append(url)
+
+    existing = list(model.objects.filter(**{parent_field: parent}))
+    has_primary = any(img.is_primary and img.image_url in urls for img in existing)
+    primary_url = None if has_primary or not urls else urls[0]
+
+    desired = []
+    for url in urls:
+        item = {'image_url': url}
+        if url == primary_url:
+            item['is_primary'] = True
+        desired.append(item)
+
+    return sync_children(
+        model,
+        existing,
+        desired,
+        key='image_url',
+        fields=['is_primary'],
+        build=lambda item: model(**{
+            parent_field: parent,
+            'image_url': item['image_url'],
+            'is_primary': item.get('is_primary', False),
+        }),
+    )
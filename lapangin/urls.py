@@ -25,6 +25,7 @@ urlpatterns = [
     path('api/login/', users_views.api_login, name='api_login'),
     path('api/register/', users_views.api_register, name='api_register'),
     path('api/logout/', users_views.api_logout, name='api_logout'),
+    path('api/token/refresh/', users_views.api_token_refresh, name='api_token_refresh'),
     path('api/user-status/', users_views.api_user_status, name='api_user_status'),
     path('api/profile/', users_views.api_profile, name='api_profile'),
     path('api/user-dashboard/', users_views.api_user_dashboard, name='api_user_dashboard'),
@@ -43,11 +44,15 @@ urlpatterns = [
     path('api/courts/<int:court_id>/', courts_views.api_court_detail, name='api_court_detail'),
     path('api/courts/<int:court_id>/sessions/', courts_views.api_court_sessions, name='api_court_sessions'),
     path('api/courts/<int:court_id>/sessions/<int:session_id>/', courts_views.api_court_session_detail, name='api_court_session_detail'),
+    path('api/courts/<int:court_id>/exceptions/', courts_views.api_court_schedule_exceptions, name='api_court_schedule_exceptions'),
+    path('api/courts/<int:court_id>/exceptions/<int:exception_id>/', courts_views.api_delete_court_schedule_exception, name='api_delete_court_schedule_exception'),
     path('api/court-images/<int:image_id>/delete/', courts_views.api_delete_court_image, name='api_delete_court_image'),
     
     # Bookings & Payments (from bookings app)
     path('bookings/', include('app.bookings.urls')),
     path('api/bookings/', bookings_views.api_bookings, name='api_bookings'),
+    path('api/bookings/calendar/', bookings_views.api_booking_calendar, name='api_booking_calendar'),
+    path('api/bookings/batch-status/', bookings_views.api_booking_batch_status, name='api_booking_batch_status'),
     path('api/bookings/<uuid:booking_id>/', bookings_views.api_booking_detail, name='api_booking_detail'),
     
     # Reviews (from reviews app)
@@ -58,27 +63,36 @@ urlpatterns = [
     
     # Revenue, Dashboards & Admin (from revenue app)
     path('api/pendapatan/', revenue_views.api_pendapatan, name='api_pendapatan'),
+    path('api/pendapatan/export/', revenue_views.api_export_transactions, name='api_pendapatan_export'),
     path('api/mitra-dashboard/', revenue_views.api_mitra_dashboard, name='api_mitra_dashboard'),
     path('api/admin-dashboard/', revenue_views.api_admin_dashboard, name='api_admin_dashboard'),
     path('api/mitra/', revenue_views.api_mitra_list, name='api_mitra_list'),
     path('api/mitra/earnings/', revenue_views.api_mitra_earnings, name='api_mitra_earnings'),
+    path('api/mitra/earnings/export/', revenue_views.api_export_mitra_earnings, name='api_mitra_earnings_export'),
     path('api/mitra/<uuid:mitra_id>/', revenue_views.api_mitra_update_status, name='api_mitra_update_status'),
     path('api/mitra/<uuid:mitra_id>/venues/', revenue_views.api_mitra_venue_details, name='api_mitra_venue_details'),
     path('api/mitra/<uuid:mitra_id>/earnings/', revenue_views.api_mitra_earnings_detail, name='api_mitra_earnings_detail'),
 
     # Refunds (admin)
     path('api/refunds/', revenue_views.api_refunds, name='api_refunds'),
+    path('api/refunds/batch/', revenue_views.api_batch_refunds, name='api_refunds_batch'),
+    path('api/refunds/export/', revenue_views.api_export_refunds, name='api_refunds_export'),
     path('api/refunds/<uuid:pendapatan_id>/cancel/', revenue_views.api_cancel_refund, name='api_refunds_cancel'),
 
     # Back-compat: revenue-prefixed refund endpoints used by tests
     path('api/revenue/refunds/', revenue_views.api_refunds, name='api_revenue_refunds'),
     path('api/revenue/refunds/list/', revenue_views.api_list_refunds, name='api_revenue_refunds_list'),
+    path('api/revenue/refunds/batch/', revenue_views.api_batch_refunds, name='api_revenue_refunds_batch'),
+    path('api/revenue/refunds/export/', revenue_views.api_export_refunds, name='api_revenue_refunds_export'),
     path('api/revenue/refunds/<uuid:pendapatan_id>/create/', revenue_views.api_create_refund, name='api_revenue_refunds_create'),
     path('api/revenue/refunds/<uuid:pendapatan_id>/cancel/', revenue_views.api_cancel_refund, name='api_revenue_refunds_cancel'),
     
     # Image Proxy (from main app)
     path('api/proxy-image/', main_views.proxy_image, name='api_proxy_image'),
 
+    # Prometheus scrape endpoint
+    path('metrics', main_views.metrics_view, name='metrics'),
+
 ]
 
 # Serve static and media files during development